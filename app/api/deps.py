@@ -1,9 +1,9 @@
 from typing import Annotated
 from fastapi import Depends
 from app.core.interfaces import LLMClient
-from app.services.lm_studio import LMStudioClient
+from app.services.lm_studio import lm_studio_client
 
 def get_llm_client() -> LLMClient:
-    return LMStudioClient()
+    return lm_studio_client
 
 LLMClientDep = Annotated[LLMClient, Depends(get_llm_client)]
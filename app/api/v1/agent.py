@@ -5,20 +5,83 @@ from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import asyncio
+import time
+from contextlib import aclosing
 
 from app.api.deps import LLMClientDep
+from app.core.config import settings
 from app.models.chat import ChatCompletionRequest, Message
+from app.services.chat_stream import ChatCompletionAccumulator
+from app.services.context_compaction import ContextCompactor
 from app.services.mcp_client import data_refinery_mcp
+from app.services.tool_cache import tool_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+compactor = ContextCompactor(
+    budget_tokens=settings.AGENT_CONTEXT_BUDGET_TOKENS,
+    max_tool_result_tokens=settings.AGENT_MAX_TOOL_RESULT_TOKENS,
+    keep_recent=settings.AGENT_KEEP_RECENT_TOOL_RESULTS,
+)
+
 class AgentRunRequest(BaseModel):
     messages: List[Message]
     file_uri: str
     template_id: Optional[str] = None
     template_variables: Optional[Dict[str, Any]] = None
 
+async def run_tool_calls(tool_calls: List[Any], results: List[Optional[str]]):
+    """
+    Runs one LLM message's tool calls concurrently (at most
+    settings.AGENT_TOOL_CONCURRENCY at a time) and yields an 'executing'
+    event as each call starts and a 'success'/'error' event as it finishes.
+
+    `results[i]` receives the output (or error text) of `tool_calls[i]`.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+    limit = asyncio.Semaphore(max(1, settings.AGENT_TOOL_CONCURRENCY))
+
+    async def run(index: int, tool_call: Any):
+        func_name = tool_call.function.name
+        base = {'tool': func_name, 'call_id': tool_call.id, 'index': index}
+        try:
+            func_args = json.loads(tool_call.function.arguments or "{}")
+        except json.JSONDecodeError as e:
+            results[index] = f"Error running {func_name}: invalid arguments ({e})"
+            await events.put({'status': 'error', 'message': results[index], **base})
+            return
+
+        async with limit:
+            await events.put({'status': 'executing', 'message': f'Running tool {func_name}...', 'args': func_args, **base})
+            started = time.perf_counter()
+            try:
+                # Execute tool via MCP, unless a read-only tool already ran on the same source
+                results[index], cached = await tool_cache.call_tool(func_name, func_args)
+                message = f'Tool {func_name} completed (cached).' if cached else f'Tool {func_name} completed.'
+                event = {'status': 'success', 'message': message, 'result': results[index], 'cached': cached}
+            except Exception as e:
+                results[index] = f"Error running {func_name}: {e}"
+                event = {'status': 'error', 'message': results[index]}
+            event['duration_ms'] = round((time.perf_counter() - started) * 1000)
+            await events.put({**event, **base})
+
+    tasks = [asyncio.create_task(run(i, tool_call)) for i, tool_call in enumerate(tool_calls)]
+    finished = asyncio.gather(*tasks)
+    try:
+        while not finished.done() or not events.empty():
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({getter, finished}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+    finally:
+        # The client went away mid-stream: don't leave calls running
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 async def agent_loop(request: AgentRunRequest, llm_client: Any):
     """
     Generator that orchestrates the LLM and the MCP data refinery tools.
@@ -52,59 +115,53 @@ async def agent_loop(request: AgentRunRequest, llm_client: Any):
 
 
         
+        # Every iteration resends the history: keep it within the token budget.
+        # The compacted history is also what history_update hands back.
+        messages = compactor.compact(messages)
+
         chat_req = ChatCompletionRequest(
             messages=[Message(**m) for m in messages],
             tools=tools
         )
         
         try:
-            # Send to LM Studio
-            response = await llm_client.chat_completion(chat_req)
+            # Stream from LM Studio, forwarding text as it is generated;
+            # tool-call deltas are only assembled
+            completion = ChatCompletionAccumulator()
+            async with aclosing(llm_client.stream_chat_completion(chat_req)) as chunks:
+                async for chunk in chunks:
+                    completion.add(chunk)
+                    for choice in chunk.choices[:1]:
+                        if choice.delta.reasoning_content:
+                            yield f"data: {json.dumps({'status': 'reasoning', 'delta': choice.delta.reasoning_content})}\n\n"
+                        if choice.delta.content:
+                            yield f"data: {json.dumps({'status': 'token', 'delta': choice.delta.content})}\n\n"
         except Exception as e:
             yield f"data: {json.dumps({'status': 'error', 'message': f'LLM Error: {e}'})}\n\n"
 
 
             return
             
-        choice = response.choices[0]
-        message = choice.message
+        message = completion.message()
         
         # Append assistant message to history
         messages.append(message.model_dump(exclude_none=True))
         
         # If the LLM wants to call tools
         if message.tool_calls:
-            for tool_call in message.tool_calls:
-                func_name = tool_call.function.name
-                func_args = json.loads(tool_call.function.arguments)
-                
-                yield f"data: {json.dumps({'status': 'executing', 'message': f'Running tool {func_name}...', 'tool': func_name, 'args': func_args})}\n\n"
-
-
-                
-                try:
-                    # Execute tool via MCP
-                    tool_result = await data_refinery_mcp.call_tool(func_name, func_args)
-                    
-                    yield f"data: {json.dumps({'status': 'success', 'message': f'Tool {func_name} completed.', 'tool': func_name, 'result': tool_result})}\n\n"
-
-                    
-                    # Append tool result to history
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": tool_result
-                    })
-                except Exception as e:
-                    error_msg = f"Error running {func_name}: {e}"
-                    yield f"data: {json.dumps({'status': 'error', 'message': error_msg, 'tool': func_name})}\n\n"
-
-
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": error_msg
-                    })
+            # Calls from one message are independent (none can see another's
+            # output), so they run concurrently; results keep the call order
+            results: List[Optional[str]] = [None] * len(message.tool_calls)
+            async for event in run_tool_calls(message.tool_calls, results):
+                yield f"data: {json.dumps(event)}\n\n"
+
+            for tool_call, tool_result in zip(message.tool_calls, results):
+                # Append tool result to history
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": tool_result
+                })
         else:
             # Agent replied with standard text (Final answer)
             yield f"data: {json.dumps({'status': 'complete', 'message': message.content})}\n\n"
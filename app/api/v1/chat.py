@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException
 from app.models.chat import ChatCompletionRequest, ChatCompletionResponse, Message
 from app.api.deps import LLMClientDep
 from app.core.templates import PromptManager
+from app.services.lm_studio import LLMBusyError
 import httpx
 
 router = APIRouter()
@@ -30,6 +31,8 @@ async def chat_completions(
                 raise HTTPException(status_code=400, detail=str(e))
 
         return await client.chat_completion(request)
+    except LLMBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
     except Exception as e:
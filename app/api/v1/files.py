@@ -1,27 +1,121 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from botocore.exceptions import ClientError
+from app.models.upload import (
+    FileUploadResponse, MultipartAbortRequest, MultipartCompleteRequest, MultipartPartsRequest,
+    MultipartStartRequest, MultipartStartResponse, PresignedPart,
+)
 from app.services.storage import storage_service
+import re
 import uuid
 
 router = APIRouter()
 
+# Names generated by _stored_name; direct-upload requests may only touch these
+STORED_NAME = re.compile(r"^[0-9a-f]{32}\.[A-Za-z0-9]{1,16}$")
+
+def _stored_name(filename: str) -> str:
+    # Generate unique filename to prevent overwrites
+    extension = filename.split(".")[-1] if "." in filename else "dat"
+    extension = re.sub(r"[^A-Za-z0-9]", "", extension)[:16] or "dat"
+    return f"{uuid.uuid4().hex}.{extension}"
+
+def _check_stored_name(name: str) -> str:
+    if not STORED_NAME.match(name):
+        raise HTTPException(status_code=400, detail=f"Invalid stored_name: {name}")
+    return name
+
+def _multipart_error(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, ValueError):
+        return HTTPException(status_code=400, detail=str(e))
+    if isinstance(e, ClientError) and e.response.get("Error", {}).get("Code") in ("NoSuchUpload", "NoSuchKey"):
+        return HTTPException(status_code=404, detail="Unknown or expired upload")
+    return HTTPException(status_code=500, detail=str(e))
+
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     """
     Uploads a file to the configured storage (MinIO/S3).
     Returns the 's3://' URI which can be passed to the Agent/MCP tools.
+
+    CSV uploads are also converted to Parquet once at ingest; 'uri' then points
+    at the Parquet copy and 'original_uri' at the raw CSV.
     """
     try:
-        # Generate unique filename to prevent overwrites
-        extension = file.filename.split(".")[-1] if "." in file.filename else "dat"
-        unique_name = f"{uuid.uuid4().hex}.{extension}"
+        unique_name = _stored_name(file.filename)
         
-        file_uri = await storage_service.upload_file(file, unique_name)
+        uris = await storage_service.ingest_file(file, unique_name)
         
         return {
             "filename": file.filename,
             "stored_name": unique_name,
-            "uri": file_uri,
+            "uri": uris["uri"],
+            "original_uri": uris["original_uri"],
+            "upload_metrics": uris["metrics"],
             "message": "File uploaded successfully. Pass the 'uri' to the agent."
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/upload/metrics")
+async def upload_metrics():
+    """Upload totals since startup: count, bytes, seconds spent and mean throughput."""
+    return storage_service.upload_stats()
+
+@router.post("/multipart/start", response_model=MultipartStartResponse)
+async def start_multipart_upload(body: MultipartStartRequest):
+    """
+    Starts a direct-to-S3 upload: the file's bytes never pass through the API.
+
+    The client splits the file into 'part_count' ranges of 'part_size' bytes,
+    PUTs each to its presigned URL, keeps each response's ETag header, then
+    calls /multipart/{upload_id}/complete.
+    """
+    try:
+        started = await storage_service.start_multipart_upload(
+            _stored_name(body.filename), body.size, body.content_type
+        )
+        return started
+    except Exception as e:
+        raise _multipart_error(e)
+
+@router.post("/multipart/{upload_id}/parts", response_model=list[PresignedPart])
+async def presign_multipart_parts(upload_id: str, body: MultipartPartsRequest):
+    """Re-signs part URLs, e.g. to retry parts after the original URLs expired."""
+    try:
+        return storage_service.presign_parts(_check_stored_name(body.stored_name), upload_id, body.part_numbers)
+    except Exception as e:
+        raise _multipart_error(e)
+
+@router.post("/multipart/{upload_id}/complete", response_model=FileUploadResponse)
+async def complete_multipart_upload(upload_id: str, body: MultipartCompleteRequest):
+    """
+    Validates the uploaded parts (count, sizes, ETags), assembles the object
+    and ingests it like /upload: the response has the same shape and 'uri'.
+    If validation fails (400) the upload is aborted and must be restarted.
+    """
+    try:
+        uris = await storage_service.complete_multipart_upload(
+            _check_stored_name(body.stored_name), upload_id,
+            [part.model_dump() for part in body.parts], body.size,
+        )
+    except Exception as e:
+        raise _multipart_error(e)
+
+    return {
+        "filename": body.filename,
+        "stored_name": body.stored_name,
+        "uri": uris["uri"],
+        "original_uri": uris["original_uri"],
+        "upload_metrics": uris["metrics"],
+        "message": "File uploaded successfully. Pass the 'uri' to the agent."
+    }
+
+@router.post("/multipart/{upload_id}/abort", status_code=204)
+async def abort_multipart_upload(upload_id: str, body: MultipartAbortRequest):
+    """Cancels a direct upload and discards its parts."""
+    try:
+        await storage_service.abort_multipart_upload(_check_stored_name(body.stored_name), upload_id)
+    except Exception as e:
+        raise _multipart_error(e)
@@ -0,0 +1,90 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import duckdb
+from app.models.preview import PreviewRequest, PreviewPage, PreviewSeriesRequest, PreviewSeries
+from app.services.preview import preview_service, arrow_ipc_stream, to_jsonable
+
+router = APIRouter()
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+def _wants_arrow(request: Request, body_format: str) -> bool:
+    """Arrow is opt-in: via the body's 'format' or an Accept header naming the Arrow stream type."""
+    return body_format == "arrow" or ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", "")
+
+def _http_error(e: Exception) -> HTTPException:
+    if isinstance(e, ValueError):
+        return HTTPException(status_code=400, detail=str(e))
+    if isinstance(e, PermissionError):
+        return HTTPException(status_code=403, detail=str(e))
+    if isinstance(e, (FileNotFoundError, duckdb.IOException)):
+        return HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, duckdb.Error):
+        # e.g. a filter value that cannot be cast to the column type
+        return HTTPException(status_code=400, detail=str(e))
+    return HTTPException(status_code=500, detail=str(e))
+
+@router.post("/rows", response_model=PreviewPage)
+async def preview_rows(body: PreviewRequest, request: Request):
+    """
+    Returns one page of rows from a Parquet artifact (e.g. a tool's 'result_uri').
+
+    Supports a column subset, ANDed filters, server-side sort, and offset or
+    keyset pagination: pass 'next_cursor' back as 'cursor' for the next page.
+
+    With format='arrow' (or 'Accept: application/vnd.apache.arrow.stream') the
+    rows are streamed as Arrow IPC and the page metadata moves to X-* headers.
+    """
+    try:
+        if not _wants_arrow(request, body.format):
+            return await preview_service.get_page(body)
+
+        page, table = await preview_service.get_page_arrow(body)
+    except Exception as e:
+        raise _http_error(e)
+
+    headers = {"X-Has-More": str(page.has_more).lower()}
+    if page.total_rows is not None:
+        headers["X-Total-Rows"] = str(page.total_rows)
+    if page.offset is not None:
+        headers["X-Offset"] = str(page.offset)
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return StreamingResponse(arrow_ipc_stream(table.to_reader()), media_type=ARROW_STREAM_MEDIA_TYPE, headers=headers)
+
+@router.post("/series", response_model=PreviewSeries)
+async def preview_series(body: PreviewSeriesRequest, request: Request):
+    """
+    Returns an x/y series (ordered by x) from a Parquet artifact for client-side charting.
+
+    JSON responses are column-oriented ({'x': [...], 'y': [...]}). With
+    format='arrow' the series is streamed as Arrow IPC batches straight from
+    DuckDB, and 'X-Total-Rows'/'X-Truncated' headers describe it.
+    """
+    try:
+        total_rows, reader, close = await preview_service.open_series(body)
+    except Exception as e:
+        raise _http_error(e)
+
+    truncated = total_rows > body.limit
+    if _wants_arrow(request, body.format):
+        headers = {"X-Total-Rows": str(total_rows), "X-Truncated": str(truncated).lower()}
+        return StreamingResponse(arrow_ipc_stream(reader, on_close=close), media_type=ARROW_STREAM_MEDIA_TYPE, headers=headers)
+
+    def drain():
+        try:
+            return reader.read_all()
+        finally:
+            close()
+
+    table = await asyncio.to_thread(drain)
+    return PreviewSeries(
+        uri=body.uri,
+        x_column=body.x_column,
+        y_column=body.y_column,
+        x=[to_jsonable(v) for v in table.column(0).to_pylist()],
+        y=[to_jsonable(v) for v in table.column(1).to_pylist()] if body.y_column else None,
+        total_rows=total_rows,
+        truncated=truncated,
+    )
@@ -1,7 +1,8 @@
 from fastapi import APIRouter
-from app.api.v1 import chat, files, agent
+from app.api.v1 import chat, files, agent, preview
 
 api_router = APIRouter()
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
 api_router.include_router(files.router, prefix="/files", tags=["files"])
 api_router.include_router(agent.router, prefix="/agent", tags=["agent"])
+api_router.include_router(preview.router, prefix="/preview", tags=["preview"])
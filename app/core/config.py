@@ -4,6 +4,14 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Entropy"
     LM_STUDIO_BASE_URL: str = "http://127.0.0.1:1234/v1/"
+
+    # LLM client: one pooled keep-alive connection set shared by all requests
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_CONNECTIONS: int = 10
+    LLM_MAX_CONCURRENCY: int = 2  # Requests in flight at the model server at once
+    # Longest wait for a free slot; a queued request may sit behind several full generations
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 300.0
+    LLM_MAX_RETRIES: int = 2  # Retries of transient failures (connection errors, 429/502/503/504)
     
     # Storage (MinIO/S3)
     S3_ENDPOINT_URL: str = "http://localhost:9000"
@@ -11,6 +19,43 @@ class Settings(BaseSettings):
     S3_SECRET_KEY: str = "minioadmin"
     S3_BUCKET_NAME: str = "user-uploads"
 
+    # Ingest: store a columnar Parquet copy next to each uploaded CSV
+    CONVERT_UPLOADS_TO_PARQUET: bool = True
+
+    # Uploads run on a bounded thread pool, off the event loop
+    UPLOAD_MAX_WORKERS: int = 4  # Uploads/conversions at once
+    UPLOAD_PART_SIZE_MB: int = 16  # Multipart part size (S3 minimum: 5)
+    UPLOAD_PART_CONCURRENCY: int = 4  # Parts in flight per upload
+
+    # Direct-to-S3 uploads: the browser PUTs parts to presigned URLs.
+    # The endpoint must be reachable from the browser (and MinIO's CORS must expose 'ETag').
+    S3_PUBLIC_ENDPOINT_URL: str = "http://localhost:9000"
+    UPLOAD_PRESIGN_EXPIRES_SECONDS: int = 3600
+    UPLOAD_MAX_SIZE_MB: int = 10_240
+
+    # Where the data-refinery MCP server writes local query/cleaning artifacts;
+    # the preview API only serves local files from inside this directory
+    LOCAL_ARTIFACT_DIR: str = "/home/vn-78/VN_78/Programming/Personal/Projects/Final-Year-Project/Entropy/test/temp"
+
+    # MCP: data-refinery worker processes shared by all agent runs
+    MCP_POOL_SIZE: int = 2
+    MCP_HEALTH_CHECK_SECONDS: float = 30.0
+    # Spawn the workers and cache the tool schemas at startup, not on the first request
+    MCP_WARM_START: bool = True
+    # Connect to a shared data-refinery tier over streamable HTTP, e.g.
+    # "http://127.0.0.1:8050/mcp", instead of spawning private stdio subprocesses
+    MCP_SERVER_URL: str = ""
+    MCP_HTTP_TIMEOUT_SECONDS: float = 600.0  # Longest tool call over HTTP
+
+    # Agent: tool calls from one LLM message that may run at the same time
+    AGENT_TOOL_CONCURRENCY: int = 4
+    # Agent: prompt size bound; older tool results are summarized to stay within it
+    AGENT_CONTEXT_BUDGET_TOKENS: int = 8000
+    AGENT_MAX_TOOL_RESULT_TOKENS: int = 3000
+    AGENT_KEEP_RECENT_TOOL_RESULTS: int = 2
+    # Agent: results of read-only tools reused while the source is unchanged (0 disables)
+    AGENT_TOOL_CACHE_ENTRIES: int = 256
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 settings = Settings()
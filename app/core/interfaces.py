@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
-from app.models.chat import ChatCompletionRequest, ChatCompletionResponse
+from typing import AsyncIterator
+from app.models.chat import ChatCompletionChunk, ChatCompletionRequest, ChatCompletionResponse
 
 class LLMClient(ABC):
     @abstractmethod
     async def chat_completion(self, request: ChatCompletionRequest) -> ChatCompletionResponse:
         """Send a chat completion request to the LLM."""
         pass
+
+    @abstractmethod
+    def stream_chat_completion(self, request: ChatCompletionRequest) -> AsyncIterator[ChatCompletionChunk]:
+        """Send a chat completion request and yield the response chunks as they arrive."""
+        pass
@@ -1,9 +1,36 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
 from app.api.v1.router import api_router
+from app.services.lm_studio import lm_studio_client
+from app.services.mcp_client import data_refinery_mcp
 
-app = FastAPI(title=settings.PROJECT_NAME)
+logger = logging.getLogger(__name__)
+
+async def _warm_up_mcp():
+    try:
+        await data_refinery_mcp.warm_up()
+    except Exception as e:
+        # Not fatal: the first agent request will try to connect again
+        logger.error(f"MCP warm-up failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so the server (and /health) comes up at once;
+    # /ready reports when the agent can run without a cold start
+    warm_up = asyncio.create_task(_warm_up_mcp()) if settings.MCP_WARM_START else None
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+        await asyncio.gather(warm_up, return_exceptions=True)
+    await data_refinery_mcp.disconnect()
+    await lm_studio_client.aclose()
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -12,6 +39,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Page metadata of Arrow preview responses travels in headers
+    expose_headers=["X-Total-Rows", "X-Has-More", "X-Next-Cursor", "X-Offset", "X-Truncated"],
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -19,3 +48,10 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+@app.get("/ready")
+def readiness_check():
+    """Ready once an MCP worker is connected and the tool schemas were fetched (stays ready across recycles)."""
+    workers = sum(1 for w in data_refinery_mcp.workers if w.alive)
+    body = {"status": "ready" if data_refinery_mcp.ready else "starting", "mcp_workers": workers}
+    return JSONResponse(body, status_code=200 if data_refinery_mcp.ready else 503)
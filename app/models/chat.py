@@ -50,3 +50,33 @@ class ChatCompletionResponse(BaseModel):
     model: str
     choices: List[Choice]
     usage: Optional[dict] = None
+
+# Streaming (OpenAI-compatible 'chat.completion.chunk' events)
+class FunctionDelta(BaseModel):
+    name: Optional[str] = None
+    arguments: Optional[str] = None
+
+class ToolCallDelta(BaseModel):
+    index: int = 0
+    id: Optional[str] = None
+    type: Optional[Literal["function"]] = None
+    function: Optional[FunctionDelta] = None
+
+class Delta(BaseModel):
+    role: Optional[str] = None
+    content: Optional[str] = None
+    reasoning_content: Optional[str] = None
+    tool_calls: Optional[List[ToolCallDelta]] = None
+
+class ChunkChoice(BaseModel):
+    index: int = 0
+    delta: Delta = Field(default_factory=Delta)
+    finish_reason: Optional[str] = None
+
+class ChatCompletionChunk(BaseModel):
+    id: str = ""
+    object: str = "chat.completion.chunk"
+    created: int = 0
+    model: str = ""
+    choices: List[ChunkChoice] = Field(default_factory=list)
+    usage: Optional[dict] = None
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+FilterOp = Literal["==", "!=", "<", "<=", ">", ">=", "in", "not in", "is null", "not null", "contains"]
+
+class PreviewFilter(BaseModel):
+    column: str
+    op: FilterOp = "=="
+    value: Optional[Any] = None  # A list for 'in'/'not in'; ignored for null checks
+
+class PreviewSort(BaseModel):
+    column: str
+    descending: bool = False
+
+class PreviewRequest(BaseModel):
+    uri: str = Field(..., description="A Parquet artifact, e.g. a tool's 'result_uri'")
+    columns: Optional[List[str]] = Field(None, description="Column subset (all columns if omitted)")
+    sort: List[PreviewSort] = Field(default_factory=list)
+    filters: List[PreviewFilter] = Field(default_factory=list, description="ANDed row filters")
+    limit: int = Field(100, ge=1, le=5000)
+    offset: int = Field(0, ge=0, description="Row offset; ignored when 'cursor' is set")
+    cursor: Optional[str] = Field(None, description="'next_cursor' from the previous page (keyset pagination)")
+    include_total: bool = Field(True, description="Count the matching rows")
+    format: Literal["json", "arrow"] = Field("json", description="'arrow' streams an Arrow IPC response")
+
+class PreviewColumn(BaseModel):
+    name: str
+    type: str
+
+class PreviewPage(BaseModel):
+    uri: str
+    columns: List[PreviewColumn]
+    rows: List[Dict[str, Any]]
+    offset: Optional[int] = None  # Absolute offset, when known (offset pagination)
+    total_rows: Optional[int] = None  # Rows matching the filters
+    has_more: bool
+    next_cursor: Optional[str] = None
+
+class PreviewSeriesRequest(BaseModel):
+    uri: str = Field(..., description="A Parquet artifact, e.g. a tool's 'result_uri'")
+    x_column: str
+    y_column: Optional[str] = None
+    filters: List[PreviewFilter] = Field(default_factory=list, description="ANDed row filters")
+    limit: int = Field(100_000, ge=1, le=5_000_000)
+    format: Literal["json", "arrow"] = Field("json", description="'arrow' streams an Arrow IPC response")
+
+class PreviewSeries(BaseModel):
+    uri: str
+    x_column: str
+    y_column: Optional[str] = None
+    x: List[Any]
+    y: Optional[List[Any]] = None
+    total_rows: int
+    truncated: bool
@@ -0,0 +1,44 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+class MultipartStartRequest(BaseModel):
+    filename: str
+    size: int = Field(..., gt=0, description="File size in bytes; sets the part size and count")
+    content_type: Optional[str] = None
+
+class PresignedPart(BaseModel):
+    part_number: int
+    url: str
+
+class MultipartStartResponse(BaseModel):
+    upload_id: str
+    stored_name: str
+    part_size: int
+    part_count: int
+    expires_in: int
+    parts: List[PresignedPart] = Field(..., description="PUT each byte range to its URL; keep the returned ETag header")
+
+class MultipartPartsRequest(BaseModel):
+    stored_name: str
+    part_numbers: List[int] = Field(..., min_length=1, max_length=1000, description="Parts to (re-)sign, e.g. after the URLs expired")
+
+class CompletedPart(BaseModel):
+    part_number: int = Field(..., ge=1, le=10_000)
+    etag: str
+
+class MultipartCompleteRequest(BaseModel):
+    filename: str
+    stored_name: str
+    size: int = Field(..., gt=0, description="Expected total size in bytes")
+    parts: List[CompletedPart]
+
+class MultipartAbortRequest(BaseModel):
+    stored_name: str
+
+class FileUploadResponse(BaseModel):
+    filename: str
+    stored_name: str
+    uri: str
+    original_uri: str
+    upload_metrics: Optional[Dict[str, Any]] = None
+    message: str
@@ -0,0 +1,75 @@
+from typing import Dict, List, Optional
+from app.models.chat import (
+    ChatCompletionChunk, ChatCompletionResponse, Choice, Function, Message, ToolCall
+)
+
+class ChatCompletionAccumulator:
+    """
+    Rebuilds a ChatCompletionResponse from streamed chunks.
+
+    Content and reasoning arrive as text fragments; tool calls arrive as
+    deltas keyed by `index`, with the id and name in the first delta and
+    the JSON arguments spread over the following ones.
+    """
+
+    def __init__(self):
+        self.id = ""
+        self.model = ""
+        self.created = 0
+        self.usage: Optional[dict] = None
+        self.finish_reason: Optional[str] = None
+        self._content: List[str] = []
+        self._reasoning: List[str] = []
+        self._tool_calls: Dict[int, dict] = {}
+
+    def add(self, chunk: ChatCompletionChunk):
+        self.id = chunk.id or self.id
+        self.model = chunk.model or self.model
+        self.created = chunk.created or self.created
+        self.usage = chunk.usage or self.usage
+
+        for choice in chunk.choices:
+            if choice.index != 0:
+                continue
+            delta = choice.delta
+            if delta.content:
+                self._content.append(delta.content)
+            if delta.reasoning_content:
+                self._reasoning.append(delta.reasoning_content)
+            for call in delta.tool_calls or []:
+                entry = self._tool_calls.setdefault(call.index, {"id": None, "name": "", "arguments": []})
+                if call.id:
+                    entry["id"] = call.id
+                if call.function is not None:
+                    if call.function.name:
+                        entry["name"] += call.function.name
+                    if call.function.arguments:
+                        entry["arguments"].append(call.function.arguments)
+            if choice.finish_reason:
+                self.finish_reason = choice.finish_reason
+
+    def message(self) -> Message:
+        tool_calls = [
+            ToolCall(
+                # Some local servers omit ids; the tool message must still reference one
+                id=entry["id"] or f"call_{index}",
+                function=Function(name=entry["name"], arguments="".join(entry["arguments"]) or "{}"),
+            )
+            for index, entry in sorted(self._tool_calls.items())
+        ]
+        return Message(
+            role="assistant",
+            content="".join(self._content) if self._content or not tool_calls else None,
+            reasoning_content="".join(self._reasoning) or None,
+            tool_calls=tool_calls or None,
+        )
+
+    def response(self) -> ChatCompletionResponse:
+        return ChatCompletionResponse(
+            id=self.id,
+            object="chat.completion",
+            created=self.created,
+            model=self.model,
+            choices=[Choice(index=0, message=self.message(), finish_reason=self.finish_reason)],
+            usage=self.usage,
+        )
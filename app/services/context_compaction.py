@@ -0,0 +1,164 @@
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate for a local model's tokenizer; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# Values that point at artifacts the model may still need to reference
+URI_PREFIXES = ("s3://", "/", "file://", "http://", "https://")
+URI_SUFFIXES = (".parquet", ".csv", ".json")
+
+COMPACTED_MARKER = "compacted"
+
+def estimate_tokens(message: Dict[str, Any]) -> int:
+    chars = len(message.get("content") or "") + len(message.get("reasoning_content") or "")
+    for call in message.get("tool_calls") or []:
+        function = call.get("function") or {}
+        chars += len(function.get("name") or "") + len(function.get("arguments") or "")
+    return chars // CHARS_PER_TOKEN + 4  # + per-message framing
+
+def _is_uri(value: str) -> bool:
+    return value.startswith(URI_PREFIXES) and (value.endswith(URI_SUFFIXES) or "://" in value)
+
+def _collect_uris(value: Any, found: List[str], limit: int = 10):
+    if len(found) >= limit:
+        return
+    if isinstance(value, str):
+        if _is_uri(value) and value not in found:
+            found.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_uris(item, found, limit)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_uris(item, found, limit)
+
+def _summarize_list(items: list, max_names: int) -> Any:
+    # Column profiles and similar records: keep their names (and types)
+    if items and all(isinstance(i, dict) and "name" in i for i in items):
+        names = [
+            f"{i['name']}:{i['data_type']}" if "data_type" in i else str(i["name"])
+            for i in items[:max_names]
+        ]
+        if len(items) > max_names:
+            names.append(f"... {len(items) - max_names} more")
+        return names
+    return f"[{len(items)} items omitted]"
+
+def summarize_tool_output(content: str, max_chars: int = 1_200, max_names: int = 40) -> str:
+    """
+    Shrinks a tool result to what later reasoning needs.
+
+    JSON objects keep their short scalar fields (status, row counts, chart
+    type...), the names of listed records such as column profiles, and
+    every artifact URI found anywhere in the payload; bulky lists (sample
+    rows, chart points) are replaced by their length. Other text is cut to
+    `max_chars`.
+    """
+    try:
+        payload = json.loads(content)
+    except (TypeError, ValueError):
+        payload = None
+
+    if not isinstance(payload, dict):
+        if len(content) <= max_chars:
+            return content
+        return f"{content[:max_chars]}... [{COMPACTED_MARKER}: {len(content) - max_chars} more characters]"
+
+    summary: Dict[str, Any] = {COMPACTED_MARKER: True}
+    for key, value in payload.items():
+        if isinstance(value, (bool, int, float)) or value is None:
+            summary[key] = value
+        elif isinstance(value, str):
+            summary[key] = value if len(value) <= 300 else value[:300] + "..."
+        elif isinstance(value, list):
+            summary[key] = _summarize_list(value, max_names)
+        elif isinstance(value, dict):
+            summary[key] = f"{{{len(value)} keys omitted}}"
+
+    uris: List[str] = []
+    _collect_uris(payload, uris)
+    kept = {v for v in summary.values() if isinstance(v, str)}
+    extra = [uri for uri in uris if uri not in kept]
+    if extra:
+        summary["artifact_uris"] = extra
+    return json.dumps(summary, default=str)
+
+def _already_compacted(message: Dict[str, Any]) -> bool:
+    content: str = message.get("content") or ""
+    return content.startswith(f'{{"{COMPACTED_MARKER}"') or f"[{COMPACTED_MARKER}:" in content[-80:]
+
+class ContextCompactor:
+    """
+    Keeps the agent's message history within a token budget.
+
+    Each iteration of the agent loop resends the whole history, so its size
+    drives prompt-processing time on the local model. Compaction, cheapest
+    first:
+      1. Any tool result over `max_tool_result_tokens` is summarized, except
+         those of the latest round, which the model has not read yet.
+      2. While over `budget_tokens`: reasoning text of earlier assistant
+         turns is dropped, then the oldest tool results are summarized,
+         except the latest round and the `keep_recent` most recent results.
+    The system prompt, user messages and tool-call pairing are never
+    touched, so the history stays valid for the chat API.
+    """
+
+    def __init__(self, budget_tokens: int, max_tool_result_tokens: int, keep_recent: int = 2):
+        self.budget_tokens = budget_tokens
+        self.max_tool_result_tokens = max_tool_result_tokens
+        self.keep_recent = keep_recent
+
+    def _summarize(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        content = message.get("content") or ""
+        max_chars = min(1_200, self.max_tool_result_tokens * CHARS_PER_TOKEN)
+        return {**message, "content": summarize_tool_output(content, max_chars=max_chars)}
+
+    def _protected(self, messages: List[Dict[str, Any]]) -> set:
+        """Indices of tool results the model has not reasoned over yet, plus the most recent ones."""
+        tool_indices = [i for i, m in enumerate(messages) if m.get("role") == "tool"]
+        last_assistant = max((i for i, m in enumerate(messages) if m.get("role") == "assistant"), default=-1)
+        protected = {i for i in tool_indices if i > last_assistant}
+        if self.keep_recent > 0:
+            protected.update(tool_indices[-self.keep_recent:])
+        return protected
+
+    def compact(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        compacted = list(messages)
+
+        last_assistant = max((i for i, m in enumerate(compacted) if m.get("role") == "assistant"), default=-1)
+        for i, message in enumerate(compacted):
+            # Results after the last assistant turn are unread: the model needs them whole
+            if i > last_assistant:
+                break
+            if message.get("role") == "tool" and estimate_tokens(message) > self.max_tool_result_tokens:
+                compacted[i] = self._summarize(message)
+
+        total = sum(estimate_tokens(m) for m in compacted)
+        if total <= self.budget_tokens:
+            return compacted
+
+        for i, message in enumerate(compacted):
+            if total <= self.budget_tokens:
+                break
+            if i != last_assistant and message.get("role") == "assistant" and message.get("reasoning_content"):
+                before = estimate_tokens(message)
+                compacted[i] = {k: v for k, v in message.items() if k != "reasoning_content"}
+                total -= before - estimate_tokens(compacted[i])
+
+        protected = self._protected(compacted)
+        for i, message in enumerate(compacted):
+            if total <= self.budget_tokens:
+                break
+            if message.get("role") != "tool" or i in protected or _already_compacted(message):
+                continue
+            before = estimate_tokens(message)
+            compacted[i] = self._summarize(message)
+            total -= before - estimate_tokens(compacted[i])
+
+        if total > self.budget_tokens:
+            logger.info(f"Agent context still ~{total} tokens after compaction (budget {self.budget_tokens}).")
+        return compacted
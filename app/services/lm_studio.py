@@ -1,17 +1,166 @@
+import asyncio
+import json
+import logging
+import random
+from contextlib import aclosing
+from typing import AsyncIterator, Optional
 import httpx
 from app.core.interfaces import LLMClient
 from app.core.config import settings
-from app.models.chat import ChatCompletionRequest, ChatCompletionResponse
+from app.models.chat import ChatCompletionChunk, ChatCompletionRequest, ChatCompletionResponse
+
+logger = logging.getLogger(__name__)
+
+# Worth retrying: the request never reached the model, or the server shed it
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.ReadError, httpx.RemoteProtocolError)
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+class LLMBusyError(Exception):
+    """No concurrency slot freed up within the queue timeout."""
 
 class LMStudioClient(LLMClient):
-    def __init__(self, base_url: str = settings.LM_STUDIO_BASE_URL):
+    """
+    Client for LM Studio's OpenAI-compatible API.
+
+    One instance is shared by the whole app: it keeps a pool of keep-alive
+    connections, lets at most `max_concurrency` requests reach the model
+    server at once (others queue for up to `queue_timeout` seconds, then
+    fail with LLMBusyError), and retries transient failures with jittered
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        base_url: str = settings.LM_STUDIO_BASE_URL,
+        timeout: float = settings.LLM_TIMEOUT_SECONDS,
+        max_connections: int = settings.LLM_MAX_CONNECTIONS,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        queue_timeout: float = settings.LLM_QUEUE_TIMEOUT_SECONDS,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+    ):
         self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Created on first use, inside the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
 
-    async def chat_completion(self, request: ChatCompletionRequest) -> ChatCompletionResponse:
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=60.0) as client:
-            response = await client.post(
-                "chat/completions",
-                json=request.model_dump(exclude_none=True, exclude={"template_id", "template_variables"})
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
             )
-            response.raise_for_status()
-            return ChatCompletionResponse(**response.json())
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _acquire(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise LLMBusyError(
+                f"LLM server busy: no free slot within {self.queue_timeout:.0f}s "
+                f"({self.max_concurrency} concurrent requests allowed)"
+            ) from None
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: concurrent sessions that failed together don't retry together
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _post(self, path: str, payload: dict) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self._acquire()
+            try:
+                response = await self.client.post(path, json=payload)
+                if response.status_code not in RETRYABLE_STATUS or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            finally:
+                self._slots.release()
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            logger.warning(f"LLM request failed ({reason}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _stream_lines(self, path: str, payload: dict) -> AsyncIterator[str]:
+        """
+        POSTs and yields the response body line by line, holding a
+        concurrency slot until the stream ends. Transient failures are
+        retried only before the first line arrives.
+        """
+        attempt = 0
+        while True:
+            started = False
+            await self._acquire()
+            try:
+                async with self.client.stream("POST", path, json=payload) as response:
+                    if response.status_code not in RETRYABLE_STATUS or attempt >= self.max_retries:
+                        if response.is_error:
+                            await response.aread()
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            started = True
+                            yield line
+                        return
+                    reason = f"HTTP {response.status_code}"
+            except RETRYABLE_ERRORS as e:
+                if started or attempt >= self.max_retries:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            finally:
+                self._slots.release()
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            logger.warning(f"LLM stream failed ({reason}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def _payload(self, request: ChatCompletionRequest) -> dict:
+        return request.model_dump(exclude_none=True, exclude={"template_id", "template_variables"})
+
+    async def chat_completion(self, request: ChatCompletionRequest) -> ChatCompletionResponse:
+        response = await self._post("chat/completions", self._payload(request))
+        return ChatCompletionResponse(**response.json())
+
+    async def stream_chat_completion(self, request: ChatCompletionRequest) -> AsyncIterator[ChatCompletionChunk]:
+        payload = self._payload(request)
+        payload["stream"] = True
+        # aclosing: frees the connection and concurrency slot as soon as we stop reading
+        async with aclosing(self._stream_lines("chat/completions", payload)) as lines:
+            async for line in lines:
+                # Server-sent events: 'data: {...}' lines, ended by 'data: [DONE]'
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    return
+                if data:
+                    yield ChatCompletionChunk(**json.loads(data))
+
+# Shared by every request (see app.api.deps); closed by the app lifespan
+lm_studio_client = LMStudioClient()
@@ -1,84 +1,336 @@
 import asyncio
+import copy
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
 from mcp.client.session import ClientSession
 from mcp.client.stdio import stdio_client, StdioServerParameters
+from mcp.client.streamable_http import streamable_http_client
+import httpx
 import json
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-class MCPClientManager:
-    def __init__(self, command: str, args: List[str]):
-        # We'll create server_parameters during connect to ensure we have the latest environment/settings
+# Tool arguments that identify the dataset a call works on
+DATASET_ARGUMENTS = ("file_uri", "uri")
+
+class MCPToolError(RuntimeError):
+    """The tool ran but reported an error (CallToolResult.isError)."""
+
+class MCPWorker:
+    """
+    One MCP session: a private server subprocess over stdio, or, when `url`
+    is set, a connection to a shared server tier over streamable HTTP
+    (its own keep-alive httpx client, so calls reuse warm connections).
+
+    The session lives inside a dedicated background task: the transport
+    and ClientSession contexts are entered and exited by that same task, so
+    a worker can be stopped or recycled from any request without tripping
+    anyio's cancel-scope task checks.
+    """
+
+    def __init__(self, command: str, args: List[str], index: int, url: Optional[str] = None):
         self.command = command
         self.args = args
+        self.index = index
+        self.url = url
         self.session: Optional[ClientSession] = None
-        self._exit_stack = None
-        self._stdio_context = None
+        self.in_flight = 0
+        self.generation = 0  # Bumped on every successful (re)start
+        # False until the first start attempt: unused workers stay lazy, while
+        # ones that failed to start (generation still 0) get retried
+        self.attempted = False
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._error: Optional[BaseException] = None
+        self._lock = asyncio.Lock()
 
-    async def connect(self):
-        """Connects to the MCP server via stdio."""
-        await self.disconnect()
-
-        from contextlib import AsyncExitStack
-        self._exit_stack = AsyncExitStack()
-        
-        # Pass S3 credentials to the MCP server subprocess
-        env = os.environ.copy()
-        env.update({
-            "S3_ENDPOINT_URL": settings.S3_ENDPOINT_URL,
-            "S3_ACCESS_KEY": settings.S3_ACCESS_KEY,
-            "S3_SECRET_KEY": settings.S3_SECRET_KEY,
-        })
-
-        server_parameters = StdioServerParameters(
-            command=self.command,
-            args=self.args,
-            env=env
-        )
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
 
+    @property
+    def busy(self) -> bool:
+        """True while starting, stopping or serving a call."""
+        return self.in_flight > 0 or self._lock.locked()
+
+    async def start(self):
+        """Spawns the server process (or connects) and initializes the session (no-op if already running)."""
+        async with self._lock:
+            if not self.alive:
+                await self._start()
+
+    async def restart(self, generation: int):
+        """
+        Replaces the session (and process), unless it was already replaced since `generation`.
+
+        Several callers can notice the same crash; only the first restarts it.
+        """
+        async with self._lock:
+            if self.generation != generation and self.alive:
+                return
+            await self._shutdown()
+            await self._start()
+
+    async def _start(self):
+        self.attempted = True
+        await self._shutdown()
+        self._ready, self._stop, self._error = asyncio.Event(), asyncio.Event(), None
+        self._task = asyncio.create_task(self._run(), name=f"mcp-worker-{self.index}")
+        await self._ready.wait()
+        if self.session is None:
+            raise self._error or RuntimeError(f"MCP worker {self.index} failed to start")
+        self.generation += 1
+        logger.info(f"MCP worker {self.index} connected.")
+
+    async def _run(self):
         try:
-            # Setup stdio client
-            self._stdio_context = await self._exit_stack.enter_async_context(stdio_client(server_parameters))
-            read_stream, write_stream = self._stdio_context
-            
-            # Start session
-            self.session = await self._exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
-            
-            # Initialize connection
-            await self.session.initialize()
-            logger.info("Connected to MCP Server successfully.")
-            
+            if self.url:
+                async with httpx.AsyncClient(
+                    timeout=httpx.Timeout(30.0, read=settings.MCP_HTTP_TIMEOUT_SECONDS),
+                    limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60.0),
+                ) as http_client:
+                    async with streamable_http_client(self.url, http_client=http_client) as (read_stream, write_stream, _):
+                        await self._serve(read_stream, write_stream)
+            else:
+                # Pass S3 credentials to the MCP server subprocess
+                env = os.environ.copy()
+                env.update({
+                    "S3_ENDPOINT_URL": settings.S3_ENDPOINT_URL,
+                    "S3_ACCESS_KEY": settings.S3_ACCESS_KEY,
+                    "S3_SECRET_KEY": settings.S3_SECRET_KEY,
+                })
+                server_parameters = StdioServerParameters(command=self.command, args=self.args, env=env)
+                async with stdio_client(server_parameters) as (read_stream, write_stream):
+                    await self._serve(read_stream, write_stream)
         except Exception as e:
-            logger.error(f"Failed to connect to MCP Server: {e}")
-            await self.disconnect()
-            raise
+            self._error = e
+            logger.error(f"MCP worker {self.index} stopped: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def _serve(self, read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            self.session = session
+            self._ready.set()
+            await self._stop.wait()
+
+    async def stop(self):
+        async with self._lock:
+            await self._shutdown()
+
+    async def _shutdown(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=10)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+        self._task = None
+        self.session = None
+        logger.info(f"MCP worker {self.index} disconnected.")
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Round-trips a ping through the session."""
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+
+class MCPClientManager:
+    """
+    A pool of MCP server workers shared by all agent runs.
+
+    - Transport: without `url`, each worker spawns a private stdio server;
+      with `url`, workers are HTTP sessions to a shared server tier, so
+      many API processes reuse the same warm data engine.
+    - Size: `size` workers, started lazily on first use.
+    - Checkout: the least busy healthy worker (fewest in-flight calls).
+    - Dataset affinity (stdio only): calls on the same dataset go back to
+      the worker that served it last, so that worker's in-process caches
+      (parsed frames, profiles, schemas) stay warm, unless it is busier than
+      the least busy worker. Over HTTP the server is stateless and any of
+      its processes may serve a request, so affinity is skipped.
+    - Health: a background task pings idle workers; a dead or unresponsive
+      worker is recycled (its process or connection is replaced), and one
+      that failed to start is started again. A call that fails because its
+      worker died is retried once on a healthy worker.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        args: List[str],
+        size: int = settings.MCP_POOL_SIZE,
+        health_check_interval: float = settings.MCP_HEALTH_CHECK_SECONDS,
+        max_affinity_entries: int = 1024,
+        url: Optional[str] = None,
+    ):
+        self.command = command
+        self.args = args
+        self.url = url
+        self.workers = [MCPWorker(command, args, i, url=url) for i in range(max(1, size))]
+        self.health_check_interval = health_check_interval
+        self.max_affinity_entries = max_affinity_entries
+        self._affinity: "OrderedDict[str, int]" = OrderedDict()
+        self._health_task: Optional[asyncio.Task] = None
+        # Tool schemas, valid until any worker (re)starts
+        self._tools: Optional[List[Dict[str, Any]]] = None
+        self._tools_key: Optional[tuple] = None
+        # Tools annotated readOnlyHint: their results only depend on arguments and source data
+        self.read_only_tools: Set[str] = set()
+
+    @property
+    def session(self) -> Optional[ClientSession]:
+        """A live session, if any worker is connected."""
+        return next((w.session for w in self.workers if w.alive), None)
+
+    @property
+    def ready(self) -> bool:
+        """
+        True once a worker is connected and the tool schemas have been fetched.
+
+        A worker restart doesn't clear this: the schemas are refreshed lazily
+        by the next list_tools(), and a probe that went unready until then
+        would take the instance out of rotation with no request to warm it.
+        """
+        return self.session is not None and self._tools is not None
+
+    def _generations(self) -> tuple:
+        return tuple(w.generation for w in self.workers)
+
+    async def warm_up(self):
+        """Spawns the workers and caches the tool schemas ahead of the first request."""
+        await self.connect()
+        tools = await self.list_tools()
+        logger.info(f"MCP warm-up complete: {len(tools)} tools cached.")
+
+    async def connect(self):
+        """Starts every worker; fails only if none of them could start."""
+        results = await asyncio.gather(*(w.start() for w in self.workers), return_exceptions=True)
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if len(failures) == len(self.workers):
+            logger.error(f"Failed to connect to MCP Server: {failures[0]}")
+            raise failures[0]
+        self._ensure_health_task()
+        logger.info(f"Connected to MCP Server ({len(self.workers) - len(failures)}/{len(self.workers)} workers).")
 
     async def disconnect(self):
-        """Disconnects from the MCP server."""
-        if self._exit_stack:
-            try:
-                await self._exit_stack.aclose()
-            except Exception as e:
-                logger.error(f"Error during disconnect: {e}")
-            self._exit_stack = None
-            self.session = None
-            logger.info("Disconnected from MCP Server.")
+        """Stops the health checks and every worker."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        await asyncio.gather(*(w.stop() for w in self.workers), return_exceptions=True)
+        self._affinity.clear()
+        self._tools = self._tools_key = None
+        logger.info("Disconnected from MCP Server.")
 
-    async def list_tools(self) -> List[Dict[str, Any]]:
-        """Lists available tools from the MCP server, mapped to OpenAI format."""
+    def _ensure_health_task(self):
+        if self.health_check_interval > 0 and (self._health_task is None or self._health_task.done()):
+            self._health_task = asyncio.create_task(self._health_loop(), name="mcp-health-check")
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            for worker in self.workers:
+                # Busy workers are handled by their callers; never-started ones stay lazy
+                if not worker.attempted or worker.busy:
+                    continue
+                generation = worker.generation
+                if not worker.alive:
+                    # Died, or never came up (e.g. its first spawn failed): try again
+                    logger.warning(f"MCP worker {worker.index} is down, restarting.")
+                    await self._recycle(worker, generation)
+                elif not await worker.ping():
+                    logger.warning(f"MCP worker {worker.index} failed its health check, recycling.")
+                    await self._recycle(worker, generation)
+
+    async def _recycle(self, worker: MCPWorker, generation: int):
+        for key in [k for k, i in self._affinity.items() if i == worker.index]:
+            del self._affinity[key]
         try:
-            if not self.session:
-                await self.connect()
-            result = await self.session.list_tools()
+            await worker.restart(generation)
         except Exception as e:
-            logger.warning(f"Connection likely closed, reconnecting: {e}")
+            # Left stopped; the health check or the next checkout will retry it
+            logger.error(f"Could not restart MCP worker {worker.index}: {e}")
+
+    def _dataset_key(self, arguments: dict) -> Optional[str]:
+        for name in DATASET_ARGUMENTS:
+            value = arguments.get(name)
+            if isinstance(value, str) and value:
+                return value
+        return None
+
+    async def _checkout(self, dataset: Optional[str] = None) -> MCPWorker:
+        """Picks a worker for a call, starting one if none is running."""
+        alive = [w for w in self.workers if w.alive]
+        if not alive:
             await self.connect()
-            result = await self.session.list_tools()
-            
+            alive = [w for w in self.workers if w.alive]
+        self._ensure_health_task()
+
+        least_busy = min(alive, key=lambda w: w.in_flight)
+        worker = least_busy
+        if dataset is not None and not self.url:
+            preferred = self._affinity.get(dataset)
+            if preferred is not None:
+                candidate = self.workers[preferred]
+                # Keep locality unless it would queue behind extra work
+                if candidate.alive and candidate.in_flight <= least_busy.in_flight:
+                    worker = candidate
+            self._affinity[dataset] = worker.index
+            self._affinity.move_to_end(dataset)
+            while len(self._affinity) > self.max_affinity_entries:
+                self._affinity.popitem(last=False)
+
+        worker.in_flight += 1
+        return worker
+
+    async def _with_worker(self, dataset: Optional[str], call):
+        worker = await self._checkout(dataset)
+        generation = worker.generation
+        try:
+            return await call(worker.session)
+        except Exception as e:
+            if worker.alive and await worker.ping():
+                raise
+            logger.warning(f"MCP worker {worker.index} died, recycling and retrying: {e}")
+        finally:
+            worker.in_flight -= 1
+
+        await self._recycle(worker, generation)
+        worker = await self._checkout(dataset)
+        try:
+            return await call(worker.session)
+        finally:
+            worker.in_flight -= 1
+
+    async def list_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Lists available tools from the MCP server, mapped to OpenAI format.
+
+        The schemas are cached; a worker restart (which may run a newer
+        server) invalidates them.
+        """
+        if not refresh and self._tools is not None and self._tools_key == self._generations():
+            return copy.deepcopy(self._tools)
+
+        result = await self._with_worker(None, lambda session: session.list_tools())
+
         tools = []
+        self.read_only_tools = {
+            tool.name for tool in result.tools if tool.annotations is not None and tool.annotations.readOnlyHint
+        }
         for tool in result.tools:
             tools.append({
                 "type": "function",
@@ -88,20 +340,17 @@ class MCPClientManager:
                     "parameters": tool.inputSchema
                 }
             })
-        return tools
+        self._tools, self._tools_key = tools, self._generations()
+        return copy.deepcopy(tools)
 
     async def call_tool(self, name: str, arguments: dict) -> Any:
         """Calls an MCP tool with the specified arguments."""
-        try:
-            if not self.session:
-                await self.connect()
-            logger.info(f"Calling tool: {name} with args: {arguments}")
-            result = await self.session.call_tool(name, arguments=arguments)
-        except Exception as e:
-            logger.warning(f"Connection likely closed, reconnecting: {e}")
-            await self.connect()
-            result = await self.session.call_tool(name, arguments=arguments)
-        
+        logger.info(f"Calling tool: {name} with args: {arguments}")
+        result = await self._with_worker(
+            self._dataset_key(arguments),
+            lambda session: session.call_tool(name, arguments=arguments),
+        )
+
         # Parse MCP CallToolResult (which contains a list of TextContent / etc.)
         outputs = []
         for content in result.content:
@@ -109,12 +358,16 @@ class MCPClientManager:
                 outputs.append(content.text)
             else:
                 outputs.append(str(content))
-                
+
+        if result.isError:
+            raise MCPToolError("\n".join(outputs) or f"Tool {name} failed")
         return "\n".join(outputs)
 
 # The command to run the data-refinery server
 # We use uv run to execute the server script inside the correct workspace context
+# (unused when MCP_SERVER_URL points at a running HTTP server tier)
 data_refinery_mcp = MCPClientManager(
     command="uv",
-    args=["run", "--project", "mcp-servers/data-refinery", "python", "mcp-servers/data-refinery/src/data_refinery/application/server.py"]
+    args=["run", "--project", "mcp-servers/data-refinery", "python", "mcp-servers/data-refinery/src/data_refinery/application/server.py"],
+    url=settings.MCP_SERVER_URL or None,
 )
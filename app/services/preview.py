@@ -0,0 +1,354 @@
+import asyncio
+import base64
+import datetime
+import decimal
+import io
+import json
+import math
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import duckdb
+import pyarrow as pa
+
+from app.core.config import settings
+from app.models.preview import PreviewColumn, PreviewFilter, PreviewPage, PreviewRequest, PreviewSeriesRequest
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Virtual column DuckDB adds for read_parquet(..., file_row_number = true)
+ROW_NUMBER = "file_row_number"
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _record_batches(result: duckdb.DuckDBPyConnection, batch_rows: int = 64 * 1024) -> pa.RecordBatchReader:
+    """Streams a DuckDB result as Arrow record batches."""
+    to_reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+    return to_reader(batch_rows)
+
+
+def arrow_ipc_stream(reader: pa.RecordBatchReader, on_close: Optional[Callable[[], None]] = None) -> Iterator[bytes]:
+    """
+    Encodes record batches as an Arrow IPC stream, yielding bytes per batch.
+
+    Clients decode the columns straight into typed arrays, with no JSON
+    encoding on the server and no per-value parsing in the browser.
+    """
+    sink = io.BytesIO()
+    try:
+        with pa.ipc.new_stream(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        # End-of-stream marker
+        yield sink.getvalue()
+    finally:
+        if on_close is not None:
+            on_close()
+
+
+def to_jsonable(value: Any) -> Any:
+    """Converts a DuckDB value into something the JSON response can carry."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, list):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    return str(value)
+
+
+class PreviewService:
+    """
+    Serves row pages of Parquet artifacts straight from storage with DuckDB.
+
+    Nothing is loaded up front: each page is one DuckDB query over
+    `read_parquet`, so only the requested columns are fetched and filters
+    and row-number ranges skip row groups using the Parquet statistics.
+
+    Pages and x/y chart series can also be returned as Arrow IPC streams
+    (`get_page_arrow`, `open_series`) for clients that opt in.
+
+    Two pagination modes are supported:
+
+    - offset: convenient for jumping to a page. Without sort or filters the
+      offset becomes a `file_row_number` range, which reads only the row
+      groups that contain the page.
+    - keyset: pass the page's `next_cursor` back. The cursor holds the last
+      row's sort key plus its row number (a unique tiebreaker), so the next
+      page is a range predicate instead of an ever-growing OFFSET scan.
+    """
+
+    def __init__(self):
+        self._root: Optional[duckdb.DuckDBPyConnection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> duckdb.DuckDBPyConnection:
+        """Returns a cursor on a shared, S3-configured in-memory database."""
+        with self._lock:
+            if self._root is None:
+                root = duckdb.connect(database=":memory:")
+                try:
+                    root.execute("INSTALL httpfs; LOAD httpfs;")
+                    root.execute(f"SET s3_endpoint={_quote_literal(urlparse(settings.S3_ENDPOINT_URL).netloc)};")
+                    root.execute(f"SET s3_access_key_id={_quote_literal(settings.S3_ACCESS_KEY)};")
+                    root.execute(f"SET s3_secret_access_key={_quote_literal(settings.S3_SECRET_KEY)};")
+                    root.execute("SET s3_url_style='path';")
+                    root.execute(f"SET s3_use_ssl={'true' if settings.S3_ENDPOINT_URL.startswith('https') else 'false'};")
+                except Exception as e:
+                    logger.warning(f"Failed to configure S3 for DuckDB previews: {e}")
+                self._root = root
+            return self._root.cursor()
+
+    def _validate_uri(self, uri: str) -> str:
+        """Only Parquet artifacts in the upload bucket or the local artifact directory can be previewed."""
+        if not uri.lower().endswith(".parquet"):
+            raise ValueError("Only Parquet artifacts can be previewed")
+
+        if uri.startswith("s3://"):
+            if urlparse(uri).netloc != settings.S3_BUCKET_NAME:
+                raise PermissionError(f"Artifacts must be in bucket '{settings.S3_BUCKET_NAME}'")
+            return uri
+
+        path = os.path.realpath(uri)
+        root = os.path.realpath(settings.LOCAL_ARTIFACT_DIR)
+        if os.path.commonpath([path, root]) != root:
+            raise PermissionError("Local artifacts must be inside the artifact directory")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Artifact not found: {uri}")
+        return path
+
+    async def get_page(self, request: PreviewRequest) -> PreviewPage:
+        """Fetches one page as JSON-ready rows without blocking the event loop."""
+        return await asyncio.to_thread(self._get_page, request)
+
+    async def get_page_arrow(self, request: PreviewRequest) -> Tuple[PreviewPage, pa.Table]:
+        """
+        Fetches one page as an Arrow table.
+
+        The returned PreviewPage carries the pagination metadata only (its
+        'rows' are empty); the rows stay columnar for an IPC response.
+        """
+        return await asyncio.to_thread(self._query_page, request)
+
+    def _get_page(self, request: PreviewRequest) -> PreviewPage:
+        page, table = self._query_page(request)
+        page.rows = [{name: to_jsonable(value) for name, value in row.items()} for row in table.to_pylist()]
+        return page
+
+    def _query_page(self, request: PreviewRequest) -> Tuple[PreviewPage, pa.Table]:
+        uri = self._validate_uri(request.uri)
+        source = f"read_parquet({_quote_literal(uri)}, file_row_number = true)"
+
+        conn = self._connection()
+        try:
+            types = self._schema(conn, source)
+            columns = request.columns or list(types)
+            for name in columns + [s.column for s in request.sort] + [f.column for f in request.filters]:
+                if name not in types:
+                    raise ValueError(f"Unknown column '{name}'")
+
+            where: List[str] = []
+            params: List[Any] = []
+            for item in request.filters:
+                clause, values = self._filter_sql(item, types[item.column])
+                where.append(clause)
+                params.extend(values)
+            filter_clauses, filter_params = list(where), list(params)
+
+            sort_key = [(s.column, s.descending) for s in request.sort]
+            order_by = [
+                f"{_quote_identifier(column)} {'DESC' if descending else 'ASC'} NULLS LAST"
+                for column, descending in sort_key
+            ] + [ROW_NUMBER]
+
+            offset = None
+            if request.cursor:
+                clause, values = self._keyset_sql(request.cursor, sort_key, types)
+                where.append(clause)
+                params.extend(values)
+            elif not request.sort and not request.filters:
+                # Row numbers are contiguous here: the offset becomes a range
+                # predicate, which skips every row group before the page
+                offset = request.offset
+                where.append(f"{ROW_NUMBER} >= ?")
+                params.append(request.offset)
+            else:
+                offset = request.offset
+
+            select = [_quote_identifier(c) for c in columns]
+            select += [_quote_identifier(c) for c, _ in sort_key] + [ROW_NUMBER]
+            query = f"SELECT {', '.join(select)} FROM {source}"
+            if where:
+                query += f" WHERE {' AND '.join(where)}"
+            query += f" ORDER BY {', '.join(order_by)} LIMIT {request.limit + 1}"
+            if offset and (request.sort or request.filters):
+                query += f" OFFSET {offset}"
+
+            table = _record_batches(conn.execute(query, params)).read_all()
+            has_more = table.num_rows > request.limit
+            table = table.slice(0, request.limit)
+
+            next_cursor = None
+            if has_more and table.num_rows:
+                # Trailing key columns: the sort values, then the row number
+                last = [table.column(i)[table.num_rows - 1].as_py() for i in range(len(columns), table.num_columns)]
+                next_cursor = self._encode_cursor(sort_key, last[:-1], last[-1])
+            # Positional select: a sort column may also be a requested column
+            rows = table.select(list(range(len(columns))))
+
+            total_rows = None
+            if request.include_total:
+                count_query = f"SELECT count(*) FROM {source}"
+                if filter_clauses:
+                    count_query += f" WHERE {' AND '.join(filter_clauses)}"
+                total_rows = conn.execute(count_query, filter_params).fetchone()[0]
+        finally:
+            conn.close()
+
+        page = PreviewPage(
+            uri=request.uri,
+            columns=[PreviewColumn(name=c, type=types[c]) for c in columns],
+            rows=[],
+            offset=offset,
+            total_rows=total_rows,
+            has_more=has_more,
+            next_cursor=next_cursor,
+        )
+        return page, rows
+
+    async def open_series(self, request: PreviewSeriesRequest) -> Tuple[int, pa.RecordBatchReader, Callable[[], None]]:
+        """
+        Starts streaming an x/y series ordered by x.
+
+        Returns:
+            (total_rows, reader, close): the number of matching rows, a
+            reader yielding record batches as DuckDB produces them, and a
+            callback that releases the cursor once the reader is drained.
+        """
+        return await asyncio.to_thread(self._open_series, request)
+
+    def _open_series(self, request: PreviewSeriesRequest) -> Tuple[int, pa.RecordBatchReader, Callable[[], None]]:
+        uri = self._validate_uri(request.uri)
+        source = f"read_parquet({_quote_literal(uri)}, file_row_number = true)"
+
+        conn = self._connection()
+        try:
+            types = self._schema(conn, source)
+            columns = [request.x_column] + ([request.y_column] if request.y_column else [])
+            for name in columns + [f.column for f in request.filters]:
+                if name not in types:
+                    raise ValueError(f"Unknown column '{name}'")
+
+            where: List[str] = []
+            params: List[Any] = []
+            for item in request.filters:
+                clause, values = self._filter_sql(item, types[item.column])
+                where.append(clause)
+                params.extend(values)
+            where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+            total_rows = conn.execute(f"SELECT count(*) FROM {source}{where_sql}", params).fetchone()[0]
+            query = (
+                f"SELECT {', '.join(_quote_identifier(c) for c in columns)} FROM {source}{where_sql} "
+                f"ORDER BY {_quote_identifier(request.x_column)} NULLS LAST, {ROW_NUMBER} LIMIT {request.limit}"
+            )
+            reader = _record_batches(conn.execute(query, params))
+        except BaseException:
+            conn.close()
+            raise
+        return total_rows, reader, conn.close
+
+    def _schema(self, conn: duckdb.DuckDBPyConnection, source: str) -> Dict[str, str]:
+        """Column name -> DuckDB type. Footer-only: no data pages are read."""
+        return {
+            name: duck_type
+            for name, duck_type, *_ in conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+            if name != ROW_NUMBER
+        }
+
+    def _filter_sql(self, item: PreviewFilter, duck_type: str) -> Tuple[str, List[Any]]:
+        """Compiles one filter into a SQL predicate with bound parameters."""
+        ident = _quote_identifier(item.column)
+        typed = f"CAST(? AS {duck_type})"
+
+        if item.op == "is null":
+            return f"{ident} IS NULL", []
+        if item.op == "not null":
+            return f"{ident} IS NOT NULL", []
+        if item.op == "contains":
+            return f"CAST({ident} AS VARCHAR) ILIKE ?", [f"%{item.value}%"]
+        if item.op in ("in", "not in"):
+            values = item.value if isinstance(item.value, list) else [item.value]
+            if not values:
+                return ("FALSE" if item.op == "in" else "TRUE"), []
+            placeholders = ", ".join([typed] * len(values))
+            return f"{ident} {item.op.upper()} ({placeholders})", list(values)
+
+        op = "=" if item.op == "==" else item.op
+        return f"{ident} {op} {typed}", [item.value]
+
+    def _encode_cursor(self, sort_key: List[Tuple[str, bool]], values: List[Any], row_number: int) -> str:
+        payload = {"sort": sort_key, "values": [to_jsonable(v) for v in values], "row": row_number}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def _keyset_sql(self, cursor: str, sort_key: List[Tuple[str, bool]], types: Dict[str, str]) -> Tuple[str, List[Any]]:
+        """
+        Builds the "rows after the cursor" predicate for the current ordering.
+
+        For keys (k1, ..., kn, row) this is the usual expansion
+        k1 > v1 OR (k1 = v1 AND k2 > v2) OR ... with NULLS LAST semantics.
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values, row_number = payload["values"], int(payload["row"])
+            cursor_sort = [(c, bool(d)) for c, d in payload["sort"]]
+        except Exception:
+            raise ValueError("Malformed cursor")
+        if cursor_sort != sort_key:
+            raise ValueError("Cursor was issued for a different sort order")
+
+        disjuncts: List[str] = []
+        params: List[Any] = []
+        equal: List[str] = []
+        equal_params: List[Any] = []
+        for (column, descending), value in zip(sort_key, values):
+            ident = _quote_identifier(column)
+            typed = f"CAST(? AS {types[column]})"
+            if value is not None:
+                # Nulls sort last, so they come after every non-null value
+                disjuncts.append("(" + " AND ".join(equal + [f"({ident} {'<' if descending else '>'} {typed} OR {ident} IS NULL)"]) + ")")
+                params.extend(equal_params + [value])
+                equal.append(f"{ident} = {typed}")
+                equal_params.append(value)
+            else:
+                equal.append(f"{ident} IS NULL")
+
+        disjuncts.append("(" + " AND ".join(equal + [f"{ROW_NUMBER} > ?"]) + ")")
+        params.extend(equal_params + [row_number])
+        return "(" + " OR ".join(disjuncts) + ")", params
+
+
+preview_service = PreviewService()
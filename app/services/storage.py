@@ -1,11 +1,49 @@
+import asyncio
 import boto3
+import math
+import threading
+import time
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import tempfile
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ClientError
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import UploadFile
+from typing import Any, Dict, List, Optional
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+MB = 1024 * 1024
+
+class UploadMetrics:
+    """Byte counter for one upload; boto3 calls it from its transfer threads."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, bytes_transferred: int):
+        with self._lock:
+            self.bytes += bytes_transferred
+
+    def finish(self) -> Dict[str, Any]:
+        self.seconds = time.perf_counter() - self.started
+        return self.as_dict()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "mb_per_s": round(self.bytes / MB / self.seconds, 2) if self.seconds > 0 else None,
+        }
+
 class StorageService:
     def __init__(self):
         self.s3 = boto3.client('s3',
@@ -13,6 +51,21 @@ class StorageService:
             aws_access_key_id=settings.S3_ACCESS_KEY,
             aws_secret_access_key=settings.S3_SECRET_KEY
         )
+        # boto3 uploads block: they run here, never on the event loop. The pool
+        # bounds how many uploads (and CSV conversions) run at once; each upload
+        # sends up to UPLOAD_PART_CONCURRENCY parts in parallel.
+        self._executor = ThreadPoolExecutor(max_workers=settings.UPLOAD_MAX_WORKERS, thread_name_prefix="s3-upload")
+        part_size = max(5, settings.UPLOAD_PART_SIZE_MB) * MB
+        self.transfer_config = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=settings.UPLOAD_PART_CONCURRENCY,
+        )
+        # Totals since startup
+        self.upload_count = 0
+        self.upload_bytes = 0
+        self.upload_seconds = 0.0
+        self._public_s3 = None
         self._ensure_bucket_exists()
 
     def _ensure_bucket_exists(self):
@@ -25,18 +78,261 @@ class StorageService:
             except Exception as e:
                 logger.error(f"Failed to create bucket: {e}")
 
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _upload_fileobj(self, source, object_name: str) -> Dict[str, Any]:
+        """Multipart upload straight from a file object, read one part at a time."""
+        metrics = UploadMetrics()
+        self.s3.upload_fileobj(
+            source, settings.S3_BUCKET_NAME, object_name,
+            Config=self.transfer_config, Callback=metrics,
+        )
+        return metrics.finish()
+
+    def _record(self, object_name: str, metrics: Dict[str, Any]):
+        self.upload_count += 1
+        self.upload_bytes += metrics["bytes"]
+        self.upload_seconds += metrics["seconds"]
+        logger.info(
+            f"Uploaded {object_name}: {metrics['bytes'] / MB:.1f} MB in {metrics['seconds']:.2f}s "
+            f"({metrics['mb_per_s'] or 0:.1f} MB/s)"
+        )
+
+    def upload_stats(self) -> Dict[str, Any]:
+        return {
+            "uploads": self.upload_count,
+            "bytes": self.upload_bytes,
+            "seconds": round(self.upload_seconds, 3),
+            "mb_per_s": round(self.upload_bytes / MB / self.upload_seconds, 2) if self.upload_seconds > 0 else None,
+        }
+
     async def upload_file(self, file: UploadFile, object_name: str) -> str:
         """
         Uploads a file to S3/MinIO and returns the s3:// URI.
         """
+        uri, _ = await self.upload_file_with_metrics(file, object_name)
+        return uri
+
+    async def upload_file_with_metrics(self, file: UploadFile, object_name: str):
+        """
+        Uploads a file to S3/MinIO without blocking the event loop.
+
+        The body is read from the UploadFile's own spooled file part by part;
+        nothing is copied into memory first.
+        Returns (s3:// URI, {"bytes", "seconds", "mb_per_s"}).
+        """
         try:
-            self.s3.upload_fileobj(file.file, settings.S3_BUCKET_NAME, object_name)
+            metrics = await self._run(self._upload_fileobj, file.file, object_name)
+            self._record(object_name, metrics)
             # Return standard s3 URI format
-            return f"s3://{settings.S3_BUCKET_NAME}/{object_name}"
+            return f"s3://{settings.S3_BUCKET_NAME}/{object_name}", metrics
         except NoCredentialsError:
             raise Exception("S3 Credentials not available")
         except Exception as e:
             logger.error(f"Upload failed: {e}")
             raise Exception(f"Upload failed: {str(e)}")
 
+    def _convert_csv_to_parquet(self, source, object_name: str):
+        """
+        Streams a CSV file object into a spooled Parquet file.
+
+        Record batches are converted one block at a time, so memory stays
+        bounded by the block size rather than the file size. The source is
+        rewound afterwards so the original can still be uploaded.
+        Returns the open temporary file, or None if the CSV could not be converted.
+        """
+        spool = tempfile.TemporaryFile()
+        try:
+            # Empty strings and 'NULL'/'NA' markers become nulls, as pandas would read them
+            reader = pa_csv.open_csv(source, convert_options=pa_csv.ConvertOptions(strings_can_be_null=True))
+            with pq.ParquetWriter(spool, reader.schema) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+            spool.seek(0)
+            return spool
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            # e.g. types inferred from the first block don't hold later on;
+            # the agent still gets the original CSV.
+            logger.warning(f"Parquet conversion skipped for {object_name}: {e}")
+            spool.close()
+            return None
+        finally:
+            source.seek(0)
+
+    async def ingest_file(self, file: UploadFile, object_name: str) -> Dict[str, Optional[str]]:
+        """
+        Stores an upload and, for CSVs, a columnar Parquet copy of it.
+
+        Converting once at ingest means every later pandas/DuckDB read gets
+        column pruning and cheap decoding instead of re-tokenizing CSV text.
+
+        Returns:
+            {"uri": <URI the agent should use>, "original_uri": <raw upload>,
+             "parquet_uri": <Parquet copy or None>, "metrics": <size/throughput of the raw upload>}
+        """
+        parquet_file = None
+        if settings.CONVERT_UPLOADS_TO_PARQUET and object_name.lower().endswith(".csv"):
+            # CPU-bound conversion runs off the event loop, before the
+            # original upload (which closes the source file object)
+            parquet_file = await self._run(self._convert_csv_to_parquet, file.file, object_name)
+
+        original_uri, metrics = await self.upload_file_with_metrics(file, object_name)
+        return await self._store_parquet_copy(parquet_file, object_name, original_uri, metrics)
+
+    async def _store_parquet_copy(self, parquet_file, object_name: str, original_uri: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Uploads a converted Parquet copy (if any) and builds the ingest result."""
+        parquet_uri = None
+        if parquet_file is not None:
+            parquet_name = object_name.rsplit(".", 1)[0] + ".parquet"
+            with parquet_file:
+                parquet_metrics = await self._run(self._upload_fileobj, parquet_file, parquet_name)
+            self._record(parquet_name, parquet_metrics)
+            metrics = {**metrics, "parquet_bytes": parquet_metrics["bytes"]}
+            parquet_uri = f"s3://{settings.S3_BUCKET_NAME}/{parquet_name}"
+
+        return {
+            "uri": parquet_uri or original_uri,
+            "original_uri": original_uri,
+            "parquet_uri": parquet_uri,
+            "metrics": metrics,
+        }
+
+    # Presigned multipart uploads: the browser PUTs parts straight to S3/MinIO; only small JSON requests
+    # pass through the API. S3 allows at most 10,000 parts of at least 5 MB
+    # (the last part may be smaller).
+    MAX_PARTS = 10_000
+    MIN_PART_SIZE = 5 * MB
+
+    def _presigner(self):
+        """A client for the endpoint browsers reach; presigning is local, no request is made."""
+        if self._public_s3 is None:
+            self._public_s3 = boto3.client('s3',
+                endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL or settings.S3_ENDPOINT_URL,
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET_KEY,
+                config=Config(signature_version="s3v4"),
+            )
+        return self._public_s3
+
+    def part_layout(self, size: int):
+        """(part_size, part_count) for a file of `size` bytes."""
+        part_size = max(self.transfer_config.multipart_chunksize, self.MIN_PART_SIZE, math.ceil(size / self.MAX_PARTS))
+        return part_size, max(1, math.ceil(size / part_size))
+
+    def _presign_parts(self, object_name: str, upload_id: str, part_numbers: List[int]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "part_number": number,
+                "url": self._presigner().generate_presigned_url(
+                    "upload_part",
+                    Params={"Bucket": settings.S3_BUCKET_NAME, "Key": object_name, "UploadId": upload_id, "PartNumber": number},
+                    ExpiresIn=settings.UPLOAD_PRESIGN_EXPIRES_SECONDS,
+                ),
+            }
+            for number in part_numbers
+        ]
+
+    async def start_multipart_upload(self, object_name: str, size: int, content_type: Optional[str] = None) -> Dict[str, Any]:
+        """Creates the multipart upload and presigns a URL for every part."""
+        if size > settings.UPLOAD_MAX_SIZE_MB * MB:
+            raise ValueError(f"File too large: {size} bytes (limit {settings.UPLOAD_MAX_SIZE_MB} MB)")
+        part_size, part_count = self.part_layout(size)
+
+        params = {"Bucket": settings.S3_BUCKET_NAME, "Key": object_name}
+        if content_type:
+            params["ContentType"] = content_type
+        created = await self._run(lambda: self.s3.create_multipart_upload(**params))
+        upload_id = created["UploadId"]
+        parts = self._presign_parts(object_name, upload_id, list(range(1, part_count + 1)))
+        return {
+            "upload_id": upload_id,
+            "stored_name": object_name,
+            "part_size": part_size,
+            "part_count": part_count,
+            "expires_in": settings.UPLOAD_PRESIGN_EXPIRES_SECONDS,
+            "parts": parts,
+        }
+
+    def presign_parts(self, object_name: str, upload_id: str, part_numbers: List[int]) -> List[Dict[str, Any]]:
+        """Fresh URLs for some parts, e.g. to retry a failed PUT after the first URLs expired."""
+        if any(n < 1 or n > self.MAX_PARTS for n in part_numbers):
+            raise ValueError(f"Part numbers must be between 1 and {self.MAX_PARTS}")
+        return self._presign_parts(object_name, upload_id, part_numbers)
+
+    def _list_parts(self, object_name: str, upload_id: str) -> Dict[int, Dict[str, Any]]:
+        parts: Dict[int, Dict[str, Any]] = {}
+        paginator = self.s3.get_paginator("list_parts")
+        for page in paginator.paginate(Bucket=settings.S3_BUCKET_NAME, Key=object_name, UploadId=upload_id):
+            for part in page.get("Parts", []):
+                parts[part["PartNumber"]] = part
+        return parts
+
+    def _check_parts(self, object_name: str, upload_id: str, parts: List[Dict[str, Any]], size: int) -> Dict[int, Dict[str, Any]]:
+        """Checks the stored parts against the client's list and the expected layout; returns the stored parts."""
+        part_size, part_count = self.part_layout(size)
+        numbers = [p["part_number"] for p in parts]
+        if numbers != list(range(1, part_count + 1)):
+            raise ValueError(f"Expected parts 1..{part_count} in order, got {len(numbers)} part numbers")
+
+        stored = self._list_parts(object_name, upload_id)
+        for part in parts:
+            number, etag = part["part_number"], part["etag"].strip('"')
+            found = stored.get(number)
+            if found is None:
+                raise ValueError(f"Part {number} was not uploaded")
+            if found["ETag"].strip('"') != etag:
+                raise ValueError(f"Part {number}: ETag mismatch (uploaded data differs from what the client sent)")
+            expected = part_size if number < part_count else size - part_size * (part_count - 1)
+            if found["Size"] != expected:
+                raise ValueError(f"Part {number}: {found['Size']} bytes, expected {expected}")
+        return stored
+
+    def _complete(self, object_name: str, upload_id: str, parts: List[Dict[str, Any]], size: int):
+        """Validates the parts and assembles them; a rejected upload is aborted."""
+        try:
+            stored = self._check_parts(object_name, upload_id, parts, size)
+        except ValueError:
+            # Free the stored parts now instead of leaving them in the bucket
+            # (and billed) until a lifecycle rule cleans them up
+            self.s3.abort_multipart_upload(Bucket=settings.S3_BUCKET_NAME, Key=object_name, UploadId=upload_id)
+            raise
+
+        self.s3.complete_multipart_upload(
+            Bucket=settings.S3_BUCKET_NAME, Key=object_name, UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": p["part_number"], "ETag": stored[p["part_number"]]["ETag"]} for p in parts]},
+        )
+        head = self.s3.head_object(Bucket=settings.S3_BUCKET_NAME, Key=object_name)
+        if head["ContentLength"] != size:
+            self.s3.delete_object(Bucket=settings.S3_BUCKET_NAME, Key=object_name)
+            raise ValueError(f"Assembled object is {head['ContentLength']} bytes, expected {size}")
+
+    def _download_to_spool(self, object_name: str):
+        spool = tempfile.TemporaryFile()
+        self.s3.download_fileobj(settings.S3_BUCKET_NAME, object_name, spool, Config=self.transfer_config)
+        spool.seek(0)
+        return spool
+
+    async def complete_multipart_upload(self, object_name: str, upload_id: str, parts: List[Dict[str, Any]], size: int) -> Dict[str, Any]:
+        """
+        Validates and assembles a direct upload, then ingests it like a
+        regular upload (Parquet copy for CSVs); returns the same result as
+        ingest_file.
+        """
+        await self._run(self._complete, object_name, upload_id, parts, size)
+        original_uri = f"s3://{settings.S3_BUCKET_NAME}/{object_name}"
+        metrics = {"bytes": size, "parts": len(parts)}
+
+        parquet_file = None
+        if settings.CONVERT_UPLOADS_TO_PARQUET and object_name.lower().endswith(".csv"):
+            with await self._run(self._download_to_spool, object_name) as source:
+                parquet_file = await self._run(self._convert_csv_to_parquet, source, object_name)
+        return await self._store_parquet_copy(parquet_file, object_name, original_uri, metrics)
+
+    async def abort_multipart_upload(self, object_name: str, upload_id: str):
+        """Discards the parts uploaded so far."""
+        await self._run(lambda: self.s3.abort_multipart_upload(
+            Bucket=settings.S3_BUCKET_NAME, Key=object_name, UploadId=upload_id
+        ))
+
 storage_service = StorageService()
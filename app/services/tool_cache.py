@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+import boto3
+from app.core.config import settings
+from app.services.mcp_client import DATASET_ARGUMENTS, MCPClientManager, data_refinery_mcp
+
+logger = logging.getLogger(__name__)
+
+class _CallAbandoned(Exception):
+    """The caller running a shared call was cancelled before it finished."""
+
+class ToolResultCache:
+    """
+    Memoizes results of read-only MCP tools for the agent.
+
+    Small models often repeat `inspect_dataset` on the same file within a
+    run and again on follow-up turns. A result is reused when the tool, its
+    canonicalized arguments and the source's fingerprint all match:
+
+    - Tools: only those the server annotates readOnlyHint.
+    - Fingerprint: ETag for S3 objects, mtime/size for local files; calls
+      whose source can't be fingerprinted are not cached.
+    - Bound: at most `max_entries` results, least recently used evicted.
+
+    Concurrent identical calls share one execution.
+    """
+
+    def __init__(self, manager: MCPClientManager, max_entries: int = settings.AGENT_TOOL_CACHE_ENTRIES):
+        self.manager = manager
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self._s3 = None
+
+    def _s3_client(self):
+        if self._s3 is None:
+            self._s3 = boto3.client(
+                "s3",
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET_KEY,
+            )
+        return self._s3
+
+    def _stat(self, uri: str) -> Optional[str]:
+        try:
+            if uri.startswith("s3://"):
+                parsed = urlparse(uri)
+                head = self._s3_client().head_object(Bucket=parsed.netloc, Key=parsed.path.lstrip("/"))
+                etag = head["ETag"].strip('"')
+                return f"etag:{etag}:{head['ContentLength']}"
+            stat = os.stat(uri)
+            return f"mtime:{stat.st_mtime_ns}:{stat.st_size}"
+        except Exception as e:
+            logger.debug(f"Cannot fingerprint {uri}: {e}")
+            return None
+
+    async def _key(self, name: str, arguments: dict) -> Optional[Tuple[str, str, str]]:
+        if self.max_entries <= 0 or name not in self.manager.read_only_tools:
+            return None
+        uri = next((arguments[a] for a in DATASET_ARGUMENTS if isinstance(arguments.get(a), str)), None)
+        if not uri:
+            return None
+        fingerprint = await asyncio.to_thread(self._stat, uri)
+        if fingerprint is None:
+            return None
+        return name, json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str), fingerprint
+
+    async def call_tool(self, name: str, arguments: dict) -> Tuple[Any, bool]:
+        """Returns (result, cache_hit)."""
+        key = await self._key(name, arguments)
+        if key is None:
+            return await self.manager.call_tool(name, arguments), False
+
+        while True:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key], True
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            try:
+                result = await asyncio.shield(pending)
+            except _CallAbandoned:
+                continue  # The run we joined was cancelled: start (or join) a new one
+            self.hits += 1
+            return result, True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await self.manager.call_tool(name, arguments)
+        except asyncio.CancelledError:
+            # Only this caller was cancelled; callers sharing the run retry instead
+            future.set_exception(_CallAbandoned())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved: nobody else may be waiting
+            raise
+        finally:
+            del self._pending[key]
+
+        future.set_result(result)
+        self._entries[key] = result
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result, False
+
+    def clear(self):
+        self._entries.clear()
+
+tool_cache = ToolResultCache(data_refinery_mcp)
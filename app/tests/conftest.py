@@ -0,0 +1,20 @@
+import os
+import pytest
+from moto import mock_aws
+
+# Set before app.core.config is imported: boto3 must talk to AWS's own
+# endpoint (which moto intercepts), never to a local MinIO.
+os.environ["S3_ENDPOINT_URL"] = "https://s3.us-east-1.amazonaws.com"
+os.environ["S3_PUBLIC_ENDPOINT_URL"] = "https://s3.us-east-1.amazonaws.com"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+os.environ["UPLOAD_PART_SIZE_MB"] = "5"
+
+@pytest.fixture
+def storage():
+    """A StorageService over an in-memory S3 with an empty upload bucket."""
+    with mock_aws():
+        from app.services.storage import StorageService
+
+        service = StorageService()
+        yield service
+        service._executor.shutdown()
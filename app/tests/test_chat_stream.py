@@ -0,0 +1,77 @@
+from app.models.chat import ChatCompletionChunk
+from app.services.chat_stream import ChatCompletionAccumulator
+
+def _chunk(delta=None, finish_reason=None, index=0, **fields):
+    return ChatCompletionChunk(choices=[{"index": index, "delta": delta or {}, "finish_reason": finish_reason}], **fields)
+
+def _accumulate(*chunks):
+    accumulator = ChatCompletionAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+    return accumulator
+
+def test_content_and_reasoning_are_concatenated():
+    accumulator = _accumulate(
+        _chunk({"role": "assistant", "reasoning_content": "Let me "}, id="chatcmpl-1", model="qwen", created=7),
+        _chunk({"reasoning_content": "think."}),
+        _chunk({"content": "Hello"}),
+        _chunk({"content": ", world"}, finish_reason="stop"),
+        ChatCompletionChunk(usage={"total_tokens": 12}),
+    )
+
+    response = accumulator.response()
+
+    assert (response.id, response.model, response.created) == ("chatcmpl-1", "qwen", 7)
+    assert response.usage == {"total_tokens": 12}
+    assert response.choices[0].finish_reason == "stop"
+    message = response.choices[0].message
+    assert message.content == "Hello, world"
+    assert message.reasoning_content == "Let me think."
+    assert message.tool_calls is None
+
+def test_tool_call_deltas_merge_by_index():
+    accumulator = _accumulate(
+        _chunk({"tool_calls": [{"index": 1, "id": "call_b", "function": {"name": "profile_", "arguments": ""}}]}),
+        _chunk({"tool_calls": [{"index": 0, "id": "call_a", "function": {"name": "inspect_dataset"}}]}),
+        _chunk({"tool_calls": [{"index": 1, "function": {"name": "dataset", "arguments": '{"uri": '}}]}),
+        _chunk({"tool_calls": [{"index": 0, "function": {"arguments": '{"uri": "a.csv"}'}}]}),
+        _chunk({"tool_calls": [{"index": 1, "function": {"arguments": '"b.csv"}'}}]}, finish_reason="tool_calls"),
+    )
+
+    message = accumulator.message()
+
+    assert [(c.id, c.function.name, c.function.arguments) for c in message.tool_calls] == [
+        ("call_a", "inspect_dataset", '{"uri": "a.csv"}'),
+        ("call_b", "profile_dataset", '{"uri": "b.csv"}'),
+    ]
+    # Tool-only messages carry no content, not an empty string
+    assert message.content is None
+    assert accumulator.finish_reason == "tool_calls"
+
+def test_missing_tool_call_ids_and_arguments_get_defaults():
+    message = _accumulate(
+        _chunk({"tool_calls": [{"index": 0, "function": {"name": "list_tools"}}]}),
+        _chunk({"tool_calls": [{"index": 2, "function": {"name": "inspect_dataset", "arguments": "{}"}}]}),
+    ).message()
+
+    assert [(c.id, c.function.arguments) for c in message.tool_calls] == [("call_0", "{}"), ("call_2", "{}")]
+
+def test_content_alongside_tool_calls_is_kept():
+    message = _accumulate(
+        _chunk({"content": "Checking."}),
+        _chunk({"tool_calls": [{"index": 0, "id": "call_a", "function": {"name": "inspect_dataset"}}]}),
+    ).message()
+
+    assert message.content == "Checking."
+    assert len(message.tool_calls) == 1
+
+def test_empty_stream_is_an_empty_message():
+    message = _accumulate().message()
+
+    assert message.content == ""
+    assert message.tool_calls is None
+
+def test_other_choices_are_ignored():
+    message = _accumulate(_chunk({"content": "kept"}), _chunk({"content": "dropped"}, index=1)).message()
+
+    assert message.content == "kept"
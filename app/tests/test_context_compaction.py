@@ -0,0 +1,77 @@
+import json
+from app.services.context_compaction import ContextCompactor, estimate_tokens, summarize_tool_output
+
+def _profile(rows=200):
+    return json.dumps({
+        "total_rows": 1000,
+        "columns": [{"name": f"col_{i}", "data_type": "float64", "mean": 1.0} for i in range(3)],
+        "sample_data": [{"col_0": i, "col_1": i, "col_2": i} for i in range(rows)],
+        "result_uri": "s3://user-uploads/result_1.parquet",
+        "nested": {"source": "/data/raw.csv"},
+    })
+
+def _history(n_rounds, reasoning="thinking " * 200):
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "analyze"}]
+    for i in range(n_rounds):
+        messages.append({
+            "role": "assistant", "content": "", "reasoning_content": reasoning,
+            "tool_calls": [{"id": f"call_{i}", "function": {"name": "inspect_dataset", "arguments": "{}"}}],
+        })
+        messages.append({"role": "tool", "tool_call_id": f"call_{i}", "content": _profile()})
+    return messages
+
+def test_summary_keeps_scalars_names_and_uris():
+    summary = json.loads(summarize_tool_output(_profile()))
+
+    assert summary["total_rows"] == 1000
+    assert summary["columns"] == ["col_0:float64", "col_1:float64", "col_2:float64"]
+    assert summary["sample_data"] == "[200 items omitted]"
+    assert summary["result_uri"] == "s3://user-uploads/result_1.parquet"
+    assert summary["artifact_uris"] == ["/data/raw.csv"]
+
+def test_plain_text_is_truncated():
+    summary = summarize_tool_output("x" * 5000, max_chars=100)
+
+    assert summary.startswith("x" * 100)
+    assert "4900 more characters" in summary
+
+def test_history_within_budget_is_untouched():
+    messages = _history(1, reasoning="short")
+    compactor = ContextCompactor(budget_tokens=100_000, max_tool_result_tokens=100_000)
+
+    assert compactor.compact(messages) == messages
+
+def test_oversized_tool_result_is_summarized_once_read():
+    messages = _history(2, reasoning="short")
+    compactor = ContextCompactor(budget_tokens=100_000, max_tool_result_tokens=200)
+
+    compacted = compactor.compact(messages)
+
+    assert json.loads(compacted[3]["content"])["compacted"] is True
+    assert compacted[3]["tool_call_id"] == "call_0"
+    assert messages[3]["content"] == _profile()  # The input history is not mutated
+
+def test_unread_tool_result_is_kept_whole():
+    """The model must see the full result of the call it just made, however large."""
+    messages = _history(1, reasoning="short")
+    compactor = ContextCompactor(budget_tokens=100_000, max_tool_result_tokens=200)
+
+    compacted = compactor.compact(messages)
+
+    assert compacted[-1]["content"] == messages[-1]["content"]
+
+def test_over_budget_compacts_oldest_first():
+    messages = _history(4)
+    # Room for the latest round, which is never compacted, plus a little more
+    budget = estimate_tokens(messages[-1]) + estimate_tokens(messages[-2]) + 1_000
+    compactor = ContextCompactor(budget_tokens=budget, max_tool_result_tokens=100_000, keep_recent=1)
+
+    compacted = compactor.compact(messages)
+
+    assert [m["role"] for m in compacted] == [m["role"] for m in messages]
+    assert [m.get("tool_call_id") for m in compacted] == [m.get("tool_call_id") for m in messages]
+    assert "reasoning_content" not in compacted[2]
+    assert compacted[-2]["reasoning_content"] == messages[-2]["reasoning_content"]
+    assert json.loads(compacted[3]["content"])["compacted"] is True
+    assert compacted[-1]["content"] == messages[-1]["content"]
+    assert sum(estimate_tokens(m) for m in compacted) <= budget
@@ -0,0 +1,33 @@
+import asyncio
+import io
+import pyarrow.parquet as pq
+from fastapi import UploadFile
+from app.core.config import settings
+
+def _get(storage, uri: str) -> bytes:
+    key = uri.removeprefix(f"s3://{settings.S3_BUCKET_NAME}/")
+    return storage.s3.get_object(Bucket=settings.S3_BUCKET_NAME, Key=key)["Body"].read()
+
+def test_csv_upload_stores_original_and_parquet_copy(storage):
+    """The agent gets the Parquet copy; the raw CSV is kept alongside it."""
+    data = b"id,name,score\n1,A,1.5\n2,,NA\n3,C,2.5\n"
+
+    result = asyncio.run(storage.ingest_file(UploadFile(io.BytesIO(data), filename="sales.csv"), "abc_sales.csv"))
+
+    assert result["original_uri"] == f"s3://{settings.S3_BUCKET_NAME}/abc_sales.csv"
+    assert result["uri"] == result["parquet_uri"] == f"s3://{settings.S3_BUCKET_NAME}/abc_sales.parquet"
+    assert _get(storage, result["original_uri"]) == data
+    table = pq.read_table(io.BytesIO(_get(storage, result["uri"])))
+    assert table.column_names == ["id", "name", "score"]
+    assert table.to_pydict() == {"id": [1, 2, 3], "name": ["A", None, "C"], "score": [1.5, None, 2.5]}
+    assert result["metrics"]["bytes"] == len(data)
+
+def test_non_csv_upload_skips_conversion(storage):
+    data = b'{"id": 1}\n'
+
+    result = asyncio.run(storage.ingest_file(UploadFile(io.BytesIO(data), filename="rows.json"), "abc_rows.json"))
+
+    assert result["uri"] == result["original_uri"] == f"s3://{settings.S3_BUCKET_NAME}/abc_rows.json"
+    assert result["parquet_uri"] is None
+    keys = [o["Key"] for o in storage.s3.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)["Contents"]]
+    assert keys == ["abc_rows.json"]
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.models.chat import ChatCompletionRequest, Message
+from app.services.chat_stream import ChatCompletionAccumulator
+from app.services.lm_studio import LLMBusyError, LMStudioClient
+
+REQUEST = ChatCompletionRequest(messages=[Message(role="user", content="hi")])
+
+def _client(handler, **kwargs):
+    """An LMStudioClient whose requests go to `handler` instead of a server."""
+    client = LMStudioClient(base_url="http://llm.test/v1/", backoff_base=0, **kwargs)
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
+
+def _sse(*events):
+    return "".join(f"data: {e if isinstance(e, str) else json.dumps(e)}\n\n" for e in events)
+
+def _collect(client, request=REQUEST):
+    async def run():
+        return [chunk async for chunk in client.stream_chat_completion(request)]
+    return asyncio.run(run())
+
+def test_stream_parses_server_sent_events():
+    seen = []
+
+    def handler(request):
+        seen.append(json.loads(request.content))
+        body = (
+            ": keep-alive comment\n\n"
+            + _sse({"id": "c1", "choices": [{"delta": {"content": "Hel"}}]})
+            + "event: ignored\n\n"
+            + "data:{\"id\": \"c1\", \"choices\": [{\"delta\": {\"content\": \"lo\"}, \"finish_reason\": \"stop\"}]}\n\n"
+            + _sse("[DONE]", {"id": "after-done"})
+        )
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    chunks = _collect(_client(handler))
+
+    assert seen[0]["stream"] is True
+    assert "template_id" not in seen[0]
+    assert [c.id for c in chunks] == ["c1", "c1"]
+    accumulator = ChatCompletionAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+    assert accumulator.message().content == "Hello"
+    assert accumulator.finish_reason == "stop"
+
+def test_stream_without_done_ends_with_the_body():
+    def handler(request):
+        return httpx.Response(200, text=_sse({"choices": [{"delta": {"content": "x"}}]}))
+
+    assert len(_collect(_client(handler))) == 1
+
+class BrokenStream(httpx.AsyncByteStream):
+    """A body that sends some bytes, then loses the connection."""
+
+    def __init__(self, data):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data.encode()
+        raise httpx.ReadError("connection reset")
+
+def _completion(content="ok"):
+    return {"id": "c1", "object": "chat.completion", "created": 0, "model": "m",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]}
+
+def test_post_retries_transient_failures():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url.path)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused")
+        if len(attempts) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json=_completion())
+
+    response = asyncio.run(_client(handler).chat_completion(REQUEST))
+
+    assert attempts == ["/v1/chat/completions"] * 3
+    assert response.choices[0].message.content == "ok"
+
+def test_post_gives_up_after_max_retries():
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        return httpx.Response(503)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(_client(handler, max_retries=2).chat_completion(REQUEST))
+    assert len(attempts) == 3
+
+def test_post_does_not_retry_client_errors():
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        return httpx.Response(400, json={"error": "bad request"})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(_client(handler).chat_completion(REQUEST))
+    assert len(attempts) == 1
+
+def test_stream_retries_before_the_first_line():
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        if len(attempts) == 1:
+            return httpx.Response(503)
+        if len(attempts) == 2:
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200, text=_sse({"choices": [{"delta": {"content": "x"}}]}, "[DONE]"))
+
+    assert len(_collect(_client(handler))) == 1
+    assert len(attempts) == 3
+
+def test_stream_is_not_retried_once_lines_arrived():
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        return httpx.Response(200, stream=BrokenStream(_sse({"choices": [{"delta": {"content": "partial"}}]})))
+
+    client = _client(handler)
+    received = []
+
+    async def run():
+        async for chunk in client.stream_chat_completion(REQUEST):
+            received.append(chunk)
+
+    # A retry would replay text the caller has already shown
+    with pytest.raises(httpx.ReadError):
+        asyncio.run(run())
+    assert len(attempts) == 1
+    assert [c.choices[0].delta.content for c in received] == ["partial"]
+    assert client._slots._value == client.max_concurrency
+
+def test_queue_timeout_raises_busy():
+    async def run():
+        release = asyncio.Event()
+
+        async def handler(request):
+            await release.wait()
+            return httpx.Response(200, json=_completion())
+
+        client = _client(handler, max_concurrency=1, queue_timeout=0.05)
+        holder = asyncio.create_task(client.chat_completion(REQUEST))
+        await asyncio.sleep(0.01)  # Let it take the only slot
+
+        with pytest.raises(LLMBusyError):
+            await client.chat_completion(REQUEST)
+
+        release.set()
+        await holder
+        # The slot is free again once the first request finishes
+        assert (await client.chat_completion(REQUEST)).id == "c1"
+
+    asyncio.run(run())
@@ -0,0 +1,189 @@
+import asyncio
+import pytest
+from mcp.types import CallToolResult, ListToolsResult, TextContent, Tool, ToolAnnotations
+from app.services.mcp_client import MCPClientManager
+
+class FakeSession:
+    def __init__(self, worker):
+        self.worker = worker
+
+    async def call_tool(self, name, arguments):
+        self.worker.calls.append(name)
+        if self.worker.crash:
+            self.worker.session = None  # The process is gone
+            raise ConnectionError("worker died")
+        if self.worker.tool_error:
+            raise ValueError("bad arguments")
+        return CallToolResult(content=[TextContent(type="text", text=f"{name} on worker {self.worker.index}")])
+
+    async def list_tools(self):
+        return ListToolsResult(tools=[
+            Tool(name="inspect_dataset", inputSchema={"type": "object"}, annotations=ToolAnnotations(readOnlyHint=True)),
+        ])
+
+class FakeWorker:
+    """Same surface as MCPWorker, without a server process."""
+
+    def __init__(self, index, fail_starts=0):
+        self.index = index
+        self.in_flight = 0
+        self.generation = 0
+        self.attempted = False
+        self.session = None
+        self.fail_starts = fail_starts
+        self.calls = []
+        self.crash = False
+        self.tool_error = False
+
+    @property
+    def alive(self):
+        return self.session is not None
+
+    @property
+    def busy(self):
+        return self.in_flight > 0
+
+    async def start(self):
+        if not self.alive:
+            await self._start()
+
+    async def _start(self):
+        self.attempted = True
+        if self.fail_starts:
+            self.fail_starts -= 1
+            raise RuntimeError("spawn failed")
+        self.session, self.crash = FakeSession(self), False
+        self.generation += 1
+
+    async def restart(self, generation):
+        if self.generation != generation and self.alive:
+            return
+        self.session = None
+        await self._start()
+
+    async def stop(self):
+        self.session = None
+
+    async def ping(self, timeout=5.0):
+        return self.alive and not self.crash
+
+def _manager(*workers, **kwargs):
+    manager = MCPClientManager("unused", [], size=len(workers), health_check_interval=0, **kwargs)
+    manager.workers = list(workers)
+    return manager
+
+def test_checkout_prefers_least_busy_worker():
+    manager = _manager(FakeWorker(0), FakeWorker(1))
+
+    async def run():
+        await manager.connect()
+        manager.workers[0].in_flight = 3
+        return await manager.call_tool("inspect_dataset", {})
+
+    assert asyncio.run(run()) == "inspect_dataset on worker 1"
+
+def test_dataset_affinity_unless_busier():
+    manager = _manager(FakeWorker(0), FakeWorker(1))
+
+    async def run():
+        await manager.connect()
+        manager.workers[0].in_flight = 1  # The first call lands on worker 1
+        first = await manager.call_tool("inspect_dataset", {"file_uri": "s3://b/a.csv"})
+        manager.workers[0].in_flight = 0
+        again = await manager.call_tool("inspect_dataset", {"file_uri": "s3://b/a.csv"})
+        manager.workers[1].in_flight = 2
+        moved = await manager.call_tool("inspect_dataset", {"file_uri": "s3://b/a.csv"})
+        return first, again, moved
+
+    first, again, moved = asyncio.run(run())
+
+    assert first == again == "inspect_dataset on worker 1"
+    assert moved == "inspect_dataset on worker 0"
+
+def test_dead_worker_is_recycled_and_call_retried_once():
+    crashing, healthy = FakeWorker(0), FakeWorker(1)
+    manager = _manager(crashing, healthy)
+
+    async def run():
+        await manager.connect()
+        crashing.crash = True
+        healthy.in_flight = 1  # Make the first attempt land on the crashing worker
+        return await manager.call_tool("inspect_dataset", {})
+
+    result = asyncio.run(run())
+
+    assert result == "inspect_dataset on worker 0"  # Restarted, then served the retry
+    assert crashing.generation == 2
+    assert crashing.calls == ["inspect_dataset", "inspect_dataset"]
+
+def test_tool_errors_on_live_worker_are_not_retried():
+    worker = FakeWorker(0)
+    worker.tool_error = True
+    manager = _manager(worker)
+
+    async def run():
+        await manager.connect()
+        with pytest.raises(ValueError):
+            await manager.call_tool("inspect_dataset", {})
+
+    asyncio.run(run())
+
+    assert worker.calls == ["inspect_dataset"]
+    assert worker.generation == 1
+
+def test_health_loop_restarts_worker_that_failed_to_start():
+    flaky = FakeWorker(1, fail_starts=1)
+    manager = _manager(FakeWorker(0), flaky)
+    manager.health_check_interval = 0.01
+
+    async def run():
+        await manager.connect()
+        assert not flaky.alive and flaky.attempted
+        await asyncio.sleep(0.1)
+        alive = flaky.alive
+        await manager.disconnect()
+        return alive
+
+    assert asyncio.run(run()) is True
+
+def test_health_loop_leaves_unstarted_workers_lazy():
+    worker = FakeWorker(0)
+    manager = _manager(worker)
+    manager.health_check_interval = 0.01
+
+    async def run():
+        manager._ensure_health_task()
+        await asyncio.sleep(0.05)
+        await manager.disconnect()
+
+    asyncio.run(run())
+
+    assert not worker.attempted
+
+def test_stays_ready_after_a_recycle():
+    """A restart bumps a generation; readiness must not wait for the next list_tools()."""
+    worker = FakeWorker(0)
+    manager = _manager(worker)
+
+    async def run():
+        await manager.warm_up()
+        assert manager.ready and manager.read_only_tools == {"inspect_dataset"}
+        await manager._recycle(worker, worker.generation)
+        return manager.ready
+
+    assert asyncio.run(run()) is True
+    assert worker.generation == 2
+
+def test_no_dataset_affinity_over_http():
+    """A stateless HTTP server tier has no per-worker cache to keep warm."""
+    manager = _manager(FakeWorker(0), FakeWorker(1), url="http://refinery:8050/mcp")
+
+    async def run():
+        await manager.connect()
+        manager.workers[0].in_flight = 1
+        await manager.call_tool("inspect_dataset", {"file_uri": "s3://b/a.csv"})
+        manager.workers[0].in_flight = 0
+        return await manager.call_tool("inspect_dataset", {"file_uri": "s3://b/a.csv"})
+
+    assert asyncio.run(run()) == "inspect_dataset on worker 0"
+    assert manager._affinity == {}
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+import requests
+from app.core.config import settings
+
+def _csv(min_bytes: int) -> bytes:
+    rows, size, i = ["id,value\n"], 9, 0
+    while size < min_bytes:
+        row = f"{i},{i * 2}\n"
+        rows.append(row)
+        size += len(row)
+        i += 1
+    return "".join(rows).encode()
+
+def _put_parts(started, data, part_numbers=None):
+    """Uploads parts to their presigned URLs, as the browser would; returns [{part_number, etag}]."""
+    size = started["part_size"]
+    uploaded = []
+    for part in started["parts"]:
+        number = part["part_number"]
+        if part_numbers is not None and number not in part_numbers:
+            continue
+        response = requests.put(part["url"], data=data[(number - 1) * size:number * size])
+        response.raise_for_status()
+        uploaded.append({"part_number": number, "etag": response.headers["ETag"]})
+    return uploaded
+
+def _open_uploads(storage):
+    return storage.s3.list_multipart_uploads(Bucket=settings.S3_BUCKET_NAME).get("Uploads", [])
+
+@pytest.fixture
+def data():
+    # Two parts: one full 5 MB part and a short last one
+    return _csv(5 * 1024 * 1024 + 1000)
+
+def test_direct_upload_is_assembled_and_ingested(storage, data):
+    started = asyncio.run(storage.start_multipart_upload("abc_big.csv", len(data), "text/csv"))
+    assert started["part_count"] == 2
+
+    parts = _put_parts(started, data)
+    result = asyncio.run(storage.complete_multipart_upload("abc_big.csv", started["upload_id"], parts, len(data)))
+
+    assert result["original_uri"] == f"s3://{settings.S3_BUCKET_NAME}/abc_big.csv"
+    assert result["uri"] == f"s3://{settings.S3_BUCKET_NAME}/abc_big.parquet"
+    body = storage.s3.get_object(Bucket=settings.S3_BUCKET_NAME, Key="abc_big.csv")["Body"].read()
+    assert body == data
+    assert _open_uploads(storage) == []
+
+def test_tampered_etag_is_rejected_and_aborted(storage, data):
+    started = asyncio.run(storage.start_multipart_upload("abc_big.csv", len(data)))
+    parts = _put_parts(started, data)
+    parts[0]["etag"] = '"' + "0" * 32 + '"'
+
+    with pytest.raises(ValueError, match="ETag mismatch"):
+        asyncio.run(storage.complete_multipart_upload("abc_big.csv", started["upload_id"], parts, len(data)))
+
+    assert _open_uploads(storage) == []
+    assert storage.s3.list_objects_v2(Bucket=settings.S3_BUCKET_NAME).get("KeyCount") == 0
+
+def test_missing_part_is_rejected_and_aborted(storage, data):
+    started = asyncio.run(storage.start_multipart_upload("abc_big.csv", len(data)))
+    parts = _put_parts(started, data, part_numbers={1})
+    parts.append({"part_number": 2, "etag": parts[0]["etag"]})
+
+    with pytest.raises(ValueError, match="Part 2 was not uploaded"):
+        asyncio.run(storage.complete_multipart_upload("abc_big.csv", started["upload_id"], parts, len(data)))
+
+    assert _open_uploads(storage) == []
@@ -0,0 +1,144 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.api.v1.preview import router
+from app.models.preview import PreviewFilter, PreviewRequest, PreviewSort
+from app.services.preview import PreviewService
+
+ROWS = 53
+
+@pytest.fixture
+def artifact(tmp_path, monkeypatch):
+    """A Parquet file with ties, nulls and several small row groups."""
+    monkeypatch.setattr(settings, "LOCAL_ARTIFACT_DIR", str(tmp_path))
+    df = pd.DataFrame({
+        "id": range(ROWS),
+        "group": [i % 3 for i in range(ROWS)],
+        "score": [None if i % 7 == 0 else float(i % 5) for i in range(ROWS)],
+        "name": [f"n{i % 11:02d}" for i in range(ROWS)],
+    })
+    path = tmp_path / "result.parquet"
+    df.to_parquet(path, row_group_size=10)
+    return str(path), df
+
+@pytest.fixture(scope="module")
+def service():
+    return PreviewService()
+
+def _expected(df, sort, filters=None):
+    """Row order the preview must produce: the sort keys with nulls last, then file order."""
+    if filters is not None:
+        df = df[filters(df)]
+    if sort:
+        df = df.sort_values(
+            [s.column for s in sort], ascending=[not s.descending for s in sort],
+            na_position="last", kind="stable",
+        )
+    return df["id"].tolist()
+
+def _page_keyset(service, request):
+    ids, pages = [], 0
+    while True:
+        page = service._get_page(request)
+        pages += 1
+        ids += [row["id"] for row in page.rows]
+        assert page.has_more == (page.next_cursor is not None)
+        if not page.has_more:
+            assert len(page.rows) <= request.limit
+            return ids, pages
+        assert len(page.rows) == request.limit
+        request = request.model_copy(update={"cursor": page.next_cursor})
+
+def _page_offset(service, request):
+    ids, offset = [], 0
+    while True:
+        page = service._get_page(request.model_copy(update={"offset": offset}))
+        assert page.offset == offset
+        ids += [row["id"] for row in page.rows]
+        if not page.has_more:
+            return ids
+        offset += request.limit
+
+SORTS = [
+    [],
+    [PreviewSort(column="group")],
+    [PreviewSort(column="score", descending=True)],
+    [PreviewSort(column="score"), PreviewSort(column="name", descending=True)],
+    [PreviewSort(column="group", descending=True), PreviewSort(column="score")],
+]
+
+@pytest.mark.parametrize("sort", SORTS, ids=lambda s: ",".join(f"{x.column}{'-' if x.descending else '+'}" for x in s) or "file")
+@pytest.mark.parametrize("limit", [1, 7, 10, 60])
+def test_pages_cover_every_row_once(service, artifact, sort, limit):
+    path, df = artifact
+    request = PreviewRequest(uri=path, columns=["id", "score"], sort=sort, limit=limit)
+
+    keyset, pages = _page_keyset(service, request)
+    offset = _page_offset(service, request)
+
+    expected = _expected(df, sort)
+    assert keyset == offset == expected
+    assert pages == max(1, -(-ROWS // limit))
+
+def test_filters_apply_across_pages(service, artifact):
+    path, df = artifact
+    request = PreviewRequest(
+        uri=path, columns=["id"], limit=4,
+        sort=[PreviewSort(column="score", descending=True)],
+        filters=[PreviewFilter(column="group", op="in", value=[0, 2]), PreviewFilter(column="name", op="!=", value="n03")],
+    )
+
+    keyset, _ = _page_keyset(service, request)
+
+    expected = _expected(df, request.sort, lambda d: d["group"].isin([0, 2]) & (d["name"] != "n03"))
+    assert keyset == _page_offset(service, request) == expected
+    assert service._get_page(request).total_rows == len(expected)
+
+def test_cursor_from_another_sort_is_rejected(service, artifact):
+    path, _ = artifact
+    first = service._get_page(PreviewRequest(uri=path, sort=[PreviewSort(column="group")], limit=5))
+
+    with pytest.raises(ValueError, match="different sort"):
+        service._get_page(PreviewRequest(uri=path, sort=[PreviewSort(column="score")], cursor=first.next_cursor))
+    with pytest.raises(ValueError, match="Malformed"):
+        service._get_page(PreviewRequest(uri=path, cursor="not-a-cursor"))
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix="/preview")
+    return TestClient(app)
+
+def test_arrow_rows_round_trip(client, artifact):
+    path, df = artifact
+    body = {"uri": path, "columns": ["id", "score"], "sort": [{"column": "score", "descending": True}], "limit": 20, "format": "arrow"}
+
+    response = client.post("/preview/rows", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["id", "score"]
+    assert table.column("id").to_pylist() == _expected(df, [PreviewSort(column="score", descending=True)])[:20]
+    assert response.headers["X-Has-More"] == "true"
+    assert response.headers["X-Total-Rows"] == str(ROWS)
+
+    # The cursor header pages exactly like the JSON response's next_cursor
+    page = client.post("/preview/rows", json={**body, "format": "json"}).json()
+    assert response.headers["X-Next-Cursor"] == page["next_cursor"]
+    assert [row["id"] for row in page["rows"]] == table.column("id").to_pylist()
+
+def test_arrow_is_negotiated_by_accept_header(client, artifact):
+    path, _ = artifact
+
+    response = client.post(
+        "/preview/rows", json={"uri": path, "columns": ["id"], "limit": ROWS},
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+
+    assert pa.ipc.open_stream(response.content).read_all().num_rows == ROWS
+    assert response.headers["X-Has-More"] == "false"
+    assert "X-Next-Cursor" not in response.headers
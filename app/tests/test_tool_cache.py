@@ -0,0 +1,138 @@
+import asyncio
+import os
+import pytest
+from app.services.tool_cache import ToolResultCache
+
+class FakeManager:
+    """Stands in for MCPClientManager: counts calls, optionally blocks until released."""
+
+    read_only_tools = {"inspect_dataset"}
+
+    def __init__(self):
+        self.calls = []
+        self.gate = None
+        self.error = None
+
+    async def call_tool(self, name, arguments):
+        self.calls.append((name, arguments))
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return f"{name} result #{len(self.calls)}"
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a\n1\n")
+    return str(path)
+
+async def _wait_for_calls(manager, n):
+    async with asyncio.timeout(5):
+        while len(manager.calls) < n:
+            await asyncio.sleep(0.01)
+
+def test_repeated_call_is_a_hit(source):
+    manager = FakeManager()
+    cache = ToolResultCache(manager, max_entries=8)
+
+    async def run():
+        return [await cache.call_tool("inspect_dataset", {"file_uri": source}) for _ in range(2)]
+
+    first, second = asyncio.run(run())
+
+    assert first == ("inspect_dataset result #1", False)
+    assert second == ("inspect_dataset result #1", True)
+    assert len(manager.calls) == 1
+
+def test_other_arguments_and_tools_miss(source):
+    manager = FakeManager()
+    cache = ToolResultCache(manager, max_entries=8)
+
+    async def run():
+        await cache.call_tool("inspect_dataset", {"file_uri": source})
+        await cache.call_tool("inspect_dataset", {"file_uri": source, "sample": 10})
+        # Not annotated read-only: never cached
+        await cache.call_tool("clean_dataset", {"file_uri": source})
+        await cache.call_tool("clean_dataset", {"file_uri": source})
+
+    asyncio.run(run())
+
+    assert len(manager.calls) == 4
+    assert cache.hits == 0
+
+def test_changed_source_is_recomputed(source):
+    manager = FakeManager()
+    cache = ToolResultCache(manager, max_entries=8)
+
+    async def run():
+        first, _ = await cache.call_tool("inspect_dataset", {"file_uri": source})
+        with open(source, "a") as f:
+            f.write("2\n")
+        stat = os.stat(source)
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second, hit = await cache.call_tool("inspect_dataset", {"file_uri": source})
+        return first, second, hit
+
+    first, second, hit = asyncio.run(run())
+
+    assert first != second
+    assert hit is False
+
+def test_errors_are_not_cached(source):
+    manager = FakeManager()
+    manager.error = RuntimeError("server down")
+    cache = ToolResultCache(manager, max_entries=8)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.call_tool("inspect_dataset", {"file_uri": source})
+        manager.error = None
+        return await cache.call_tool("inspect_dataset", {"file_uri": source})
+
+    result, hit = asyncio.run(run())
+
+    assert hit is False
+    assert len(manager.calls) == 2
+
+def test_concurrent_identical_calls_share_one_run(source):
+    manager = FakeManager()
+    cache = ToolResultCache(manager, max_entries=8)
+
+    async def run():
+        manager.gate = asyncio.Event()
+        tasks = [asyncio.create_task(cache.call_tool("inspect_dataset", {"file_uri": source})) for _ in range(3)]
+        await _wait_for_calls(manager, 1)
+        await asyncio.sleep(0.05)
+        manager.gate.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+
+    assert len(manager.calls) == 1
+    assert {r for r, _ in results} == {"inspect_dataset result #1"}
+    assert sorted(hit for _, hit in results) == [False, True, True]
+
+def test_cancelled_first_caller_does_not_cancel_waiters(source):
+    """Callers that joined a shared run get a result even if its owner is cancelled."""
+    manager = FakeManager()
+    cache = ToolResultCache(manager, max_entries=8)
+
+    async def run():
+        manager.gate = asyncio.Event()
+        owner = asyncio.create_task(cache.call_tool("inspect_dataset", {"file_uri": source}))
+        await _wait_for_calls(manager, 1)
+        waiters = [asyncio.create_task(cache.call_tool("inspect_dataset", {"file_uri": source})) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        await _wait_for_calls(manager, 2)
+        manager.gate.set()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(run())
+
+    assert len(manager.calls) == 2
+    assert [r for r, _ in results] == ["inspect_dataset result #2"] * 2
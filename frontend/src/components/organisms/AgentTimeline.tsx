@@ -84,6 +84,30 @@ export function AgentTimeline({ events }: AgentTimelineProps) {
           );
         }
 
+        // Text the model is generating right now
+        if (event.status === 'streaming') {
+          const { thinkContent, cleanMessage } = parseMessage(event.message || '');
+          const reasoning = [event.reasoning, thinkContent].filter(Boolean).join('\n');
+          // An unclosed <think> block is still reasoning
+          const openThink = cleanMessage.startsWith('<think>') ? cleanMessage.replace('<think>', '').trim() : null;
+
+          return (
+            <div key={index} className="flex flex-col space-y-2">
+              {(reasoning || openThink) && <CollapsibleThought content={reasoning || openThink || ''} />}
+              {!openThink && cleanMessage && (
+                <div className="flex items-start space-x-4 p-4 rounded-xl bg-white border border-gray-200 shadow-sm">
+                  <div className="mt-1 bg-primary-100 p-1.5 rounded-lg">
+                    <Loader2 className="h-5 w-5 text-primary-600 animate-spin" />
+                  </div>
+                  <div className="flex-1 text-gray-800 text-sm leading-relaxed whitespace-pre-wrap">
+                    {cleanMessage}
+                  </div>
+                </div>
+              )}
+            </div>
+          );
+        }
+
         // Special handling for completion events which might contain <think> blocks
         if (event.status === 'complete') {
           const { thinkContent, cleanMessage } = parseMessage(event.message || '');
@@ -39,8 +39,20 @@ export function ArtifactFlow({ events, initialFileName }: ArtifactFlowProps) {
     let currentParentId = 'input';
     let xOffset = 300;
 
-    // Track the current tool ID being executed to update it upon success
+    // Track the tool nodes being executed to update them upon success;
+    // tool calls can run concurrently, so they are keyed by call_id
     let pendingToolNodeId: string | null = null;
+    const pendingByCallId: Record<string, string> = {};
+    const takePending = (callId?: string): string | null => {
+      if (callId && pendingByCallId[callId]) {
+        const nodeId = pendingByCallId[callId];
+        delete pendingByCallId[callId];
+        return nodeId;
+      }
+      const nodeId = pendingToolNodeId;
+      pendingToolNodeId = null;
+      return nodeId;
+    };
 
     events.forEach((event, index) => {
       if (event.status === 'executing') {
@@ -58,20 +70,24 @@ export function ArtifactFlow({ events, initialFileName }: ArtifactFlowProps) {
           animated: true,
           markerEnd: { type: MarkerType.ArrowClosed }
         });
-        pendingToolNodeId = toolId;
+        if (event.call_id) {
+          pendingByCallId[event.call_id] = toolId;
+        } else {
+          pendingToolNodeId = toolId;
+        }
         currentParentId = toolId;
         xOffset += 300;
       } else if (event.status === 'success') {
           // Mark the pending tool node as success
-          if (pendingToolNodeId) {
-             const toolNode = newNodes.find(n => n.id === pendingToolNodeId);
+          const toolNodeId = takePending(event.call_id);
+          if (toolNodeId) {
+             const toolNode = newNodes.find(n => n.id === toolNodeId);
              if (toolNode) {
                  toolNode.data = { ...toolNode.data, status: 'success' };
                  // remove animated from edge
-                 const incomingEdge = newEdges.find(e => e.target === pendingToolNodeId);
+                 const incomingEdge = newEdges.find(e => e.target === toolNodeId);
                  if (incomingEdge) incomingEdge.animated = false;
              }
-             pendingToolNodeId = null;
           }
 
           if (event.result) {
@@ -112,15 +128,15 @@ export function ArtifactFlow({ events, initialFileName }: ArtifactFlowProps) {
               }
           }
       } else if (event.status === 'error') {
-           if (pendingToolNodeId) {
-               const toolNode = newNodes.find(n => n.id === pendingToolNodeId);
+           const toolNodeId = takePending(event.call_id);
+           if (toolNodeId) {
+               const toolNode = newNodes.find(n => n.id === toolNodeId);
                if (toolNode) {
                    toolNode.data = { ...toolNode.data, status: 'error' };
                    toolNode.style = { ...toolNode.style, borderColor: '#f87171' }; // red border
-                   const incomingEdge = newEdges.find(e => e.target === pendingToolNodeId);
+                   const incomingEdge = newEdges.find(e => e.target === toolNodeId);
                    if (incomingEdge) incomingEdge.animated = false;
                }
-               pendingToolNodeId = null;
            }
       }
     });
@@ -51,7 +51,20 @@ export function useAgent({ onEvent, onComplete, onError }: UseAgentProps = {}) {
             const dataStr = part.replace('data: ', '');
             try {
               const event: AgentEvent = JSON.parse(dataStr);
-              setEvents(prev => [...prev, event]);
+              if (event.status === 'token' || event.status === 'reasoning') {
+                // Fold generated text into one live 'streaming' entry instead of an event per token
+                setEvents(prev => {
+                  const last = prev[prev.length - 1];
+                  const current: AgentEvent = last?.status === 'streaming' ? last : { status: 'streaming', message: '', reasoning: '' };
+                  const updated: AgentEvent = event.status === 'token'
+                    ? { ...current, message: (current.message || '') + (event.delta || '') }
+                    : { ...current, reasoning: (current.reasoning || '') + (event.delta || '') };
+                  return last?.status === 'streaming' ? [...prev.slice(0, -1), updated] : [...prev, updated];
+                });
+                continue;
+              }
+              // Any other event ends the generation step; its outcome replaces the live text
+              setEvents(prev => [...prev.filter(e => e.status !== 'streaming'), event]);
               if (onEvent) onEvent(event);
 
               if (event.status === 'complete') {
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { FileUploadResponse } from '../types';
+import type { FileUploadResponse, MultipartUploadStart, PreviewPage, PreviewRequest } from '../types';
 
 const API_BASE_URL = 'http://localhost:8000/api/v1';
 
@@ -20,5 +20,50 @@ export const uploadFile = async (file: File): Promise<FileUploadResponse> => {
   return response.data;
 };
 
+// Uploads a file straight to S3/MinIO in parts via presigned URLs; only small
+// JSON requests go through the API. Resolves to the same response as uploadFile.
+// The storage endpoint's CORS config must expose the 'ETag' header.
+export const uploadFileDirect = async (file: File, concurrency = 4): Promise<FileUploadResponse> => {
+  const start = await axios.post<MultipartUploadStart>(`${API_BASE_URL}/files/multipart/start`, {
+    filename: file.name,
+    size: file.size,
+    content_type: file.type || undefined,
+  });
+  const { upload_id, stored_name, part_size, parts } = start.data;
+
+  try {
+    const etags: string[] = new Array(parts.length);
+    let next = 0;
+    const worker = async () => {
+      while (next < parts.length) {
+        const { part_number, url } = parts[next++];
+        const body = file.slice((part_number - 1) * part_size, part_number * part_size);
+        const response = await fetch(url, { method: 'PUT', body });
+        if (!response.ok) throw new Error(`Part ${part_number} failed: HTTP ${response.status}`);
+        etags[part_number - 1] = response.headers.get('ETag') || '';
+      }
+    };
+    await Promise.all(Array.from({ length: Math.min(concurrency, parts.length) }, worker));
+
+    const response = await axios.post<FileUploadResponse>(`${API_BASE_URL}/files/multipart/${upload_id}/complete`, {
+      filename: file.name,
+      stored_name,
+      size: file.size,
+      parts: etags.map((etag, i) => ({ part_number: i + 1, etag })),
+    });
+    return response.data;
+  } catch (error) {
+    await axios.post(`${API_BASE_URL}/files/multipart/${upload_id}/abort`, { stored_name }).catch(() => {});
+    throw error;
+  }
+};
+
+// Fetches one page of rows from a Parquet artifact (e.g. a tool's result_uri).
+// Pass the previous page's next_cursor as `cursor` to scroll forward cheaply.
+export const fetchPreviewRows = async (request: PreviewRequest): Promise<PreviewPage> => {
+  const response = await axios.post<PreviewPage>(`${API_BASE_URL}/preview/rows`, request);
+  return response.data;
+};
+
 // Note: For SSE (the /agent/run endpoint), we will use the native fetch API
 // inside a custom hook or directly in the component so we can read the stream.
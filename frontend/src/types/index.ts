@@ -2,16 +2,34 @@ export interface FileUploadResponse {
   filename: string;
   stored_name: string;
   uri: string;
+  original_uri?: string;
+  upload_metrics?: Record<string, number | null>;
   message: string;
 }
 
+export interface MultipartUploadStart {
+  upload_id: string;
+  stored_name: string;
+  part_size: number;
+  part_count: number;
+  expires_in: number;
+  parts: { part_number: number; url: string }[];
+}
+
 export interface AgentEvent {
-  status: 'info' | 'thinking' | 'executing' | 'success' | 'error' | 'complete' | 'user_message' | 'history_update';
+  status: 'info' | 'thinking' | 'executing' | 'success' | 'error' | 'complete' | 'user_message' | 'history_update'
+    | 'token' | 'reasoning' | 'streaming';
   message?: string;
+  delta?: string;  // 'token'/'reasoning': the newly generated text
+  reasoning?: string;  // 'streaming': reasoning text generated so far
   tool?: string;
   args?: Record<string, any>;
   result?: any;
   messages?: Message[];
+  call_id?: string;  // pairs a tool call's 'executing' event with its 'success'/'error' event
+  index?: number;
+  duration_ms?: number;
+  cached?: boolean;  // 'success': result reused from an identical earlier call
 }
 
 export interface Message {
@@ -27,3 +45,30 @@ export interface ArtifactNodeData {
   type?: string;
   uri?: string;
 }
+
+export interface PreviewFilter {
+  column: string;
+  op: '==' | '!=' | '<' | '<=' | '>' | '>=' | 'in' | 'not in' | 'is null' | 'not null' | 'contains';
+  value?: any;
+}
+
+export interface PreviewRequest {
+  uri: string;
+  columns?: string[];
+  sort?: { column: string; descending?: boolean }[];
+  filters?: PreviewFilter[];
+  limit?: number;
+  offset?: number;
+  cursor?: string | null;
+  include_total?: boolean;
+}
+
+export interface PreviewPage {
+  uri: string;
+  columns: { name: string; type: string }[];
+  rows: Record<string, any>[];
+  offset?: number | null;
+  total_rows?: number | null;
+  has_more: boolean;
+  next_cursor?: string | null;
+}
@@ -1,5 +1,8 @@
 # region imports 
 from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+import duckdb
+import logging
 import uuid
 from pathlib import Path
 from typing import Dict, List, Any
@@ -10,20 +13,87 @@ from data_refinery.domain.models.sql import SQLQueryResponse
 from data_refinery.domain.models.cleaning import CleaningOptions, CleaningResponse
 from data_refinery.infrastructure.pandas_client import PandasDatasetClient
 from data_refinery.infrastructure.duckdb_client import DuckDBClient
+from data_refinery.infrastructure.duckdb_profiler import DuckDBProfiler
+from data_refinery.infrastructure.streaming_profiler import StreamingProfiler
+from data_refinery.infrastructure.fingerprint import source_size
+from data_refinery.infrastructure.duckdb_cleaner import DuckDBCleaningEngine
+from data_refinery.infrastructure.profile_catalog import ProfileCatalog
+from data_refinery.infrastructure.chart_aggregator import ChartAggregator
+from data_refinery.infrastructure.tool_executor import ToolExecutor
+from data_refinery.infrastructure.config import (
+    PROFILE_ENGINE, STREAMING_PROFILE_MIN_MB, STREAMING_CHUNK_ROWS, CLEAN_ENGINE, CLEAN_SQL_MIN_MB,
+    TOOL_EXECUTOR, TOOL_WORKERS, TOOL_CONCURRENCY, MCP_TRANSPORT, MCP_HOST, MCP_PORT, MCP_HTTP_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+# Tools that only read their source: clients may reuse results while the source is unchanged
+READ_ONLY = ToolAnnotations(readOnlyHint=True)
 
 # region initialize mcp server
 mcp = FastMCP(
     name = "data-refinery",
-    # host = "localhost", provide host and port in the run command instead
-    # port = 8050,
+    host = MCP_HOST,
+    port = MCP_PORT,
+    # HTTP mode: every request stands alone (no server-side session state) and
+    # gets a plain JSON reply, so any of the MCP_HTTP_WORKERS processes behind
+    # the port can serve it
+    stateless_http = True,
+    json_response = True,
     )
 
 client = PandasDatasetClient()
 db_client = DuckDBClient()
+profiler = DuckDBProfiler(db_client)
+streaming_profiler = StreamingProfiler()
+cleaner = DuckDBCleaningEngine(db_client, profiler)
+catalog = ProfileCatalog(artifact_dir=str(db_client.artifact_path))
+charts = ChartAggregator(db_client)
+
+# The MCP tools are async and only await their blocking bodies (`_inspect_dataset`,
+# `_run_sql_query`, ...) in the executor, so one server answers concurrent requests.
+executor = ToolExecutor(TOOL_EXECUTOR, TOOL_WORKERS, TOOL_CONCURRENCY)
+
+
+def _profile_dataset(file_uri: str) -> DatasetOverview:
+    """Computes a fresh profile with the configured engine."""
+    # profile directly on the file with a single DuckDB aggregate query
+    if PROFILE_ENGINE == "duckdb":
+        try:
+            return profiler.profile(file_uri)
+        except Exception as e:
+            # Files DuckDB cannot sniff (odd encodings/dialects) still go through pandas
+            logger.warning(f"DuckDB profiling failed for {file_uri}, falling back to pandas: {e}")
+
+    # stream larger-than-RAM files through mergeable accumulators (approximate outliers)
+    size = source_size(file_uri)
+    if PROFILE_ENGINE == "streaming" or (size is not None and size > STREAMING_PROFILE_MIN_MB * 1024 * 1024):
+        return streaming_profiler.profile(client.iter_chunks(file_uri, STREAMING_CHUNK_ROWS))
+
+    # load the data 
+    df = client.load_data(file_uri)
+
+    # analyze the data 
+    return client.analyze(df)
 
 # region Inspect-data tool  
-@mcp.tool()
-def inspect_dataset(file_uri: str) -> DatasetOverview:
+def _inspect_dataset(file_uri: str) -> DatasetOverview:
+
+    # answer from the persisted profile if the data hasn't changed since
+    cached = catalog.lookup(file_uri)
+    if cached is not None:
+        return cached
+
+    status = _profile_dataset(file_uri)
+
+    # persist it so the next inspection (even after a restart) is instant
+    catalog.record(file_uri, status)
+
+    return status
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def inspect_dataset(file_uri: str) -> DatasetOverview:
     """
     Inspects a CSV dataset to understand its structure, schema, and data quality.
     
@@ -36,42 +106,19 @@ def inspect_dataset(file_uri: str) -> DatasetOverview:
     - Data types for every column
     - Basic statistics for numeric columns (mean, std, min, max, outlier counts)
     - A sample of 5 rows to understand context
+
+    Very large files are profiled in streaming mode; 'approximate_stats' then
+    lists the fields that are estimates (e.g. 'outlier_count').
     
     Args:
         file_uri: The absolute path to the file. 
             - Local: '/home/user/data/file.csv'
             - S3: 's3://my-bucket/data.csv'
     """
-
-    # load the data 
-    df = client.load_data(file_uri)
-
-    # analyze the data 
-    status = client.analyze(df)
-
-    return status
+    return await executor.run("inspect_dataset", _inspect_dataset, file_uri)
 
 # region run_sql_query tool
-@mcp.tool()
-def run_sql_query(file_uri: str, sql_query: str) -> SQLQueryResponse:
-    """
-    Executes a SQL query against a file and saves the result to a new file.
-
-    Use this tool to filter, sort, or aggregate data.
-    
-    CRITICAL SYNTAX RULES:
-    1. The query MUST reference the 'file_uri' directly in the FROM clause.
-    2. DO NOT use generic table names like 'users' or 'data'.
-    3. The tool returns a 'result_uri' (path to the new file), NOT the full data.
-
-    Args:
-        file_uri: The absolute path to the source file (e.g., '/app/data.csv').
-        sql_query: The DuckDB SQL query string.
-        
-    Examples:
-        Correct: "SELECT name, age FROM '/app/data.csv' WHERE age > 25"
-        Incorrect: "SELECT name, age FROM users WHERE age > 25"
-    """
+def _run_sql_query(file_uri: str, sql_query: str) -> SQLQueryResponse:
     # 1. Input Integrity Check
     if file_uri not in sql_query:
         # Fail fast if the agent forgot to include the file path
@@ -83,48 +130,43 @@ def run_sql_query(file_uri: str, sql_query: str) -> SQLQueryResponse:
     # 2. Execution Delegation
     try:
         response = db_client.execute_and_write(sql_query)
-        return response
     except Exception as e:
         # In MCP, raising an exception usually returns a clear error to the client.
         # This is better than returning a partial "success=False" object.
         raise RuntimeError(f"Tool Execution Error: {str(e)}")
 
+    # The result is profiled lazily: the first inspect_dataset on it records
+    # the profile, so the query itself still scans its sources only once.
+    return response
+
 
-# region clean_data_tool
 @mcp.tool()
-def clean_dataset(file_uri: str, options: CleaningOptions) -> CleaningResponse:
+async def run_sql_query(file_uri: str, sql_query: str) -> SQLQueryResponse:
     """
-    Apply data cleaning operations (imputation, normalization) to a dataset.
+    Executes a SQL query against a file and saves the result to a new file.
 
-    This tool loads a file, applies the specified 'CleaningOptions', and saves 
-    the result to a new Parquet file. It is the PRIMARY way to handle missing 
-    values (NaNs) and inconsistent headers.
+    Use this tool to filter, sort, or aggregate data.
+    
+    CRITICAL SYNTAX RULES:
+    1. The query MUST reference the 'file_uri' directly in the FROM clause.
+    2. DO NOT use generic table names like 'users' or 'data'.
+    3. The tool returns a 'result_uri' (path to the new file), NOT the full data.
+    4. Send exactly ONE SELECT statement; CREATE, SET, INSTALL etc. are rejected.
 
     Args:
-        file_uri: The absolute path to the input file (e.g., 's3://bucket/raw.csv').
-        options: A CleaningOptions object containing the specific rules.
-            The 'strategies' dictionary maps column names to actions:
-            - "drop": Remove rows.
-            - "mean": Fill with average (numeric only).
-            - "mode": Fill with most frequent (text/numeric).
-            - "zero": Fill with 0 (numeric only).
-            - "unknown": Fill with 'Unknown' (text only).
-            
-            The 'date_columns' list allows standardizing date formats:
-            - "column_name": Name of the date column.
-            - "output_format": Target format (e.g., "%Y-%m-%d").
-
-    Returns:
-        CleaningResponse: Metadata about the cleaned file (row count, new path, and column stats).
+        file_uri: The absolute path to the source file (e.g., '/app/data.csv').
+        sql_query: The DuckDB SQL query string.
+        
+    Examples:
+        Correct: "SELECT name, age FROM '/app/data.csv' WHERE age > 25"
+        Incorrect: "SELECT name, age FROM users WHERE age > 25"
     """
+    return await executor.run("run_sql_query", _run_sql_query, file_uri, sql_query)
+
+# region clean_data_tool
+def _clean_dataset(file_uri: str, options: CleaningOptions) -> CleaningResponse:
     try:
-        # 1. Load the data
-        df = client.load_data(file_uri)
-        
-        # 2. Apply the cleaning logic (The function you just wrote)
-        cleaned_df, quality_report = client.clean_dataset(df, options)
-        
-        # 3. Save Artifact (Pass-by-Reference)
+        # 1. Choose the Artifact Location (Pass-by-Reference)
         # We generate a unique ID so we don't overwrite previous work
         file_id = uuid.uuid4().hex[:8]
         output_filename = f"cleaned_{file_id}.parquet"
@@ -146,8 +188,26 @@ def clean_dataset(file_uri: str, options: CleaningOptions) -> CleaningResponse:
             # Ensure the directory exists (using your configured temp path)
             output_path = str(Path("/home/vn-78/VN_78/Programming/Personal/Projects/Final-Year-Project/Entropy/test/temp") / output_filename)
         
-        # Save using the smart client
-        client.save_dataframe(cleaned_df, output_path)
+        # 2. Apply the cleaning logic
+        # Large sources are compiled into a single DuckDB query that streams
+        # from the source to Parquet; small ones use the in-memory pandas engine.
+        size = source_size(file_uri)
+        use_sql = CLEAN_ENGINE == "duckdb" or (
+            CLEAN_ENGINE == "auto" and size is not None and size > CLEAN_SQL_MIN_MB * 1024 * 1024
+        )
+
+        if use_sql:
+            quality_report = cleaner.clean(file_uri, options, output_path)
+        else:
+            # 3. Load, clean and save with pandas
+            df = client.load_data(file_uri)
+            cleaned_df, quality_report = client.clean_dataset(df, options)
+
+            # Save using the smart client
+            client.save_dataframe(cleaned_df, output_path)
+
+        # The quality report describes the artifact we just wrote: keep it in the catalog
+        catalog.record(output_path, quality_report)
         
         # 4. Return the DISTINCT CleaningResponse
         return CleaningResponse(
@@ -159,15 +219,68 @@ def clean_dataset(file_uri: str, options: CleaningOptions) -> CleaningResponse:
     except Exception as e:
         raise RuntimeError(f"Cleaning Failed: {str(e)}")
 
+
+@mcp.tool()
+async def clean_dataset(file_uri: str, options: CleaningOptions) -> CleaningResponse:
+    """
+    Apply data cleaning operations (imputation, normalization) to a dataset.
+
+    This tool loads a file, applies the specified 'CleaningOptions', and saves 
+    the result to a new Parquet file. It is the PRIMARY way to handle missing 
+    values (NaNs) and inconsistent headers.
+
+    Args:
+        file_uri: The absolute path to the input file (e.g., 's3://bucket/raw.csv').
+        options: A CleaningOptions object containing the specific rules.
+            The 'strategies' dictionary maps column names to actions:
+            - "drop": Remove rows.
+            - "mean": Fill with average (numeric only).
+            - "mode": Fill with most frequent (text/numeric).
+            - "zero": Fill with 0 (numeric only).
+            - "unknown": Fill with 'Unknown' (text only).
+            
+            The 'date_columns' list allows standardizing date formats:
+            - "column_name": Name of the date column.
+            - "output_format": Target format (e.g., "%Y-%m-%d").
+
+    Returns:
+        CleaningResponse: Metadata about the cleaned file (row count, new path, and column stats).
+    """
+    return await executor.run("clean_dataset", _clean_dataset, file_uri, options)
+
 import json
 
 # region generate_visualization
-@mcp.tool()
-def generate_visualization(file_uri: str, chart_type: str, x_column: str, y_column: str = "") -> str:
+def _generate_visualization(file_uri: str, chart_type: str, x_column: str, y_column: str = "") -> str:
+    try:
+        try:
+            chart_spec = charts.build(file_uri, chart_type, x_column, y_column)
+        except duckdb.Error as e:
+            # DuckDB could not scan the file directly: load just the plotted
+            # columns with pandas and aggregate the in-memory frame instead
+            logger.warning(f"DuckDB chart scan failed for {file_uri}, using pandas loader: {e}")
+            cols_to_keep = [x_column]
+            if y_column and y_column != x_column and y_column in client.list_columns(file_uri):
+                cols_to_keep.append(y_column)
+            df = client.load_data(file_uri, columns=cols_to_keep)
+            chart_spec = charts.build_from_frame(df, chart_type, x_column, y_column)
+
+        return json.dumps(chart_spec)
+        
+    except Exception as e:
+        raise RuntimeError(f"Visualization Generation Failed: {str(e)}")
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def generate_visualization(file_uri: str, chart_type: str, x_column: str, y_column: str = "") -> str:
     """
     Generates an interactive chart specification from a dataset for the frontend to render.
     Call this tool when the user asks for a chart, plot, or graph.
 
+    The chart summarizes the whole dataset: bar/pie charts aggregate y per x
+    category (or count rows when y_column is empty), line charts are
+    downsampled preserving peaks, and scatter plots use a stratified sample.
+
     Args:
         file_uri: The absolute path to the input file (e.g., 's3://bucket/data.csv' or local path).
         chart_type: MUST be one of: 'bar', 'line', 'scatter', 'pie'.
@@ -175,49 +288,25 @@ def generate_visualization(file_uri: str, chart_type: str, x_column: str, y_colu
         y_column: The column name to use for the Y-axis (or values for pie charts). Can be empty if counting.
         
     Returns:
-        A JSON string containing the chart configuration and data points (up to 100 rows).
+        A JSON string containing the chart configuration and data points.
     """
-    try:
-        import numpy as np
-        
-        df = client.load_data(file_uri)
-        
-        # Drop NaNs in relevant columns to avoid JSON serialization errors
-        cols_to_keep = [x_column]
-        if y_column and y_column in df.columns:
-            cols_to_keep.append(y_column)
-            
-        df_subset = df[cols_to_keep].dropna().head(100)
-        
-        def safe_cast(val):
-            if isinstance(val, (np.integer, int)):
-                return int(val)
-            if isinstance(val, (np.floating, float)):
-                return float(val)
-            return str(val)
-
-        data = []
-        for _, row in df_subset.iterrows():
-            point = {x_column: safe_cast(row[x_column])}
-            if y_column and y_column in df.columns:
-                point[y_column] = safe_cast(row[y_column])
-            data.append(point)
-            
-        chart_spec = {
-            "type": "visualization",
-            "chart_type": chart_type,
-            "x_column": x_column,
-            "y_column": y_column,
-            "data": data
-        }
-        
-        return json.dumps(chart_spec)
-        
-    except Exception as e:
-        raise RuntimeError(f"Visualization Generation Failed: {str(e)}")
-
+    return await executor.run("generate_visualization", _generate_visualization, file_uri, chart_type, x_column, y_column)
 
 # region main
+def create_http_app():
+    """ASGI app for the streamable HTTP transport; each server worker process builds its own."""
+    return mcp.streamable_http_app()
+
+
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    if MCP_TRANSPORT == "streamable-http":
+        import uvicorn
+
+        # Workers share one port; each keeps its own warm caches and DuckDB pool
+        uvicorn.run(
+            "data_refinery.application.server:create_http_app",
+            factory=True, host=MCP_HOST, port=MCP_PORT, workers=MCP_HTTP_WORKERS,
+        )
+    else:
+        mcp.run(transport="stdio")
 
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Sequence, Tuple
 import pandas as pd
 
+# A row filter: (column, op, value), e.g. ("sales", ">", 100). A list of filters is ANDed.
+RowFilter = Tuple[str, str, Any]
+
 class IDatasetRepository(ABC):
     """
     Interface for dataset data access. 
@@ -10,12 +14,20 @@ class IDatasetRepository(ABC):
     """
 
     @abstractmethod
-    def load_data(self, file_uri: str) -> pd.DataFrame:
+    def load_data(
+        self,
+        file_uri: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[RowFilter]] = None,
+    ) -> pd.DataFrame:
         """
         Loads data from a given URI into a Pandas DataFrame.
         
         Args:
             file_uri: The source path (e.g., 's3://bucket/file.csv' or 'local/path.csv')
+            columns: Only load these columns (all columns if None).
+            filters: Only load rows matching every (column, op, value) filter.
+                Ops: '==', '!=', '<', '<=', '>', '>=', 'in', 'not in', 'is null', 'not null'.
             
         Returns:
             pd.DataFrame: The loaded data.
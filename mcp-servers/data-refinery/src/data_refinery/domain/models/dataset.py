@@ -51,4 +51,8 @@ class DatasetOverview(BaseDatasetInfo):
     filtering, or visualization).
     """
     columns: List[ColumnProfile] = Field(..., description="Detailed stats for each column")
+    approximate_stats: Optional[List[str]] = Field(
+        None,
+        description="Names of ColumnProfile fields that are estimates (e.g. ['outlier_count'] from streaming profiling)"
+    )
     
\ No newline at end of file
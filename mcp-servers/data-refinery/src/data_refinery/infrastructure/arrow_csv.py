@@ -0,0 +1,142 @@
+# region imports
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+logger = logging.getLogger(__name__)
+
+
+def _as_read_csv_schema(schema: pa.Schema) -> pa.Schema:
+    """Reads temporal columns as text, since `pd.read_csv` does not parse dates."""
+    return pa.schema([
+        field.with_type(pa.string()) if pa.types.is_temporal(field.type) else field
+        for field in schema
+    ])
+
+
+# region Arrow CSV reader
+class ArrowCSVReader:
+    """
+    Multithreaded CSV ingestion through the pyarrow CSV reader.
+
+    Compared with the default pandas parser this tokenizes in parallel and
+    keeps peak memory close to the size of the final frame. The result uses
+    the same dtypes `pd.read_csv` would produce (int64, float64 when an int
+    column has nulls, str, object for nullable booleans; dates left as text),
+    so cleaning and profiling behave identically under either engine.
+
+    The schema is inferred once from a sample (the first block of the file),
+    cached per source fingerprint, and passed as explicit column types to the
+    full parse, so later reads skip inference entirely.
+    """
+
+    def __init__(self, sample_bytes: int = 1 << 20, max_cached_schemas: int = 256):
+        """
+        Args:
+            sample_bytes: Size of the leading block used for schema inference.
+            max_cached_schemas: How many per-source schemas to remember (LRU).
+        """
+        self.sample_bytes = sample_bytes
+        self.max_cached_schemas = max_cached_schemas
+        self._schemas: "OrderedDict[str, pa.Schema]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _open(self, file_uri: str, storage_options: Optional[dict]):
+        if file_uri.startswith("s3://"):
+            import fsspec
+
+            return fsspec.open(file_uri, "rb", **(storage_options or {})).open()
+        return open(file_uri, "rb")
+
+    def infer_schema(self, file_uri: str, storage_options: Optional[dict] = None) -> pa.Schema:
+        """Infers column types from the first `sample_bytes` of the file."""
+        with self._open(file_uri, storage_options) as f:
+            reader = pa_csv.open_csv(
+                f,
+                read_options=pa_csv.ReadOptions(block_size=self.sample_bytes),
+                convert_options=pa_csv.ConvertOptions(strings_can_be_null=True),
+            )
+            return _as_read_csv_schema(reader.schema)
+
+    def _cached_schema(self, cache_key: str, file_uri: str, storage_options: Optional[dict]) -> pa.Schema:
+        with self._lock:
+            schema = self._schemas.get(cache_key)
+            if schema is not None:
+                self._schemas.move_to_end(cache_key)
+                return schema
+
+        schema = self.infer_schema(file_uri, storage_options)
+        with self._lock:
+            self._schemas[cache_key] = schema
+            while len(self._schemas) > self.max_cached_schemas:
+                self._schemas.popitem(last=False)
+        return schema
+
+    def read(
+        self,
+        file_uri: str,
+        storage_options: Optional[dict] = None,
+        fingerprint: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        row_filter: Optional[pc.Expression] = None,
+    ) -> pd.DataFrame:
+        """
+        Parses a CSV into an Arrow-backed DataFrame.
+
+        Args:
+            file_uri: Local path or 's3://' URI.
+            storage_options: s3fs options for S3 sources.
+            fingerprint: Source freshness token; keys the schema cache.
+                If None, the schema is inferred on every call.
+            columns: Only convert these columns; the others are tokenized
+                but never materialized.
+            row_filter: Expression applied to the Arrow table, so rejected
+                rows are never converted to pandas.
+
+        Returns:
+            pd.DataFrame: NumPy-backed columns, as `pd.read_csv` returns.
+        """
+        cache_key = f"{file_uri}@{fingerprint}"
+        if fingerprint is not None:
+            schema = self._cached_schema(cache_key, file_uri, storage_options)
+        else:
+            # Without a fingerprint a cached schema could be stale
+            schema = self.infer_schema(file_uri, storage_options)
+
+        try:
+            with self._open(file_uri, storage_options) as f:
+                table = pa_csv.read_csv(
+                    f,
+                    # Empty strings and 'NULL'/'NA' markers become nulls, as with pandas
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types=schema,
+                        strings_can_be_null=True,
+                        include_columns=columns,
+                    ),
+                )
+        except pa.ArrowInvalid as e:
+            # The sample was not representative (e.g. ints early, floats later):
+            # forget the schema and let pandas infer over the whole file.
+            with self._lock:
+                self._schemas.pop(cache_key, None)
+            logger.warning(f"Arrow CSV parse failed for {file_uri}, falling back to pandas: {e}")
+            df = pd.read_csv(file_uri, storage_options=storage_options, usecols=columns)
+            if row_filter is None:
+                return df
+            table = pa.Table.from_pandas(df, preserve_index=False)
+
+        if row_filter is not None:
+            table = table.filter(row_filter)
+        df = table.to_pandas()
+        # Arrow marks nulls in object columns (nullable booleans) with None; read_csv uses NaN
+        object_columns = df.columns[df.dtypes == object]
+        if len(object_columns):
+            df[object_columns] = df[object_columns].fillna(np.nan)
+        return df
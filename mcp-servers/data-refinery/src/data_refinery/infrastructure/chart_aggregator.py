@@ -0,0 +1,369 @@
+# region imports
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Infrastructure Imports
+from data_refinery.infrastructure.duckdb_client import DuckDBClient, read_source_sql, quote_identifier
+from data_refinery.infrastructure.duckdb_profiler import NUMERIC_TYPES
+from data_refinery.infrastructure.config import CHART_MAX_POINTS, CHART_MAX_CATEGORIES
+
+CHART_TYPES = ("bar", "line", "scatter", "pie")
+
+# Slices shown in a pie chart; the remainder is folded into 'Other'
+PIE_MAX_SLICES = 12
+
+# Grid resolution (per axis) of the strata used for scatter sampling
+SCATTER_GRID = 20
+
+# Modulus applied to row hashes when sampling
+_HASH_RANGE = 1 << 20
+
+
+def _is_numeric(duck_type: str) -> bool:
+    return duck_type in NUMERIC_TYPES or duck_type.startswith("DECIMAL")
+
+
+def _is_temporal(duck_type: str) -> bool:
+    return duck_type in ("DATE", "TIME") or duck_type.startswith("TIMESTAMP")
+
+
+def _output_expr(ident: str, duck_type: str) -> str:
+    """JSON-friendly projection: temporals as text, DECIMAL/HUGEINT as DOUBLE."""
+    if _is_temporal(duck_type):
+        return f"CAST({ident} AS VARCHAR)"
+    if _is_numeric(duck_type) and duck_type not in ("TINYINT", "SMALLINT", "INTEGER", "BIGINT"):
+        return f"CAST({ident} AS DOUBLE)"
+    if _is_numeric(duck_type):
+        return ident
+    return f"CAST({ident} AS VARCHAR)"
+
+
+def _valid_expr(ident: str, duck_type: str) -> str:
+    """Null check that also rejects NaN/inf, which are not valid JSON."""
+    if duck_type in ("FLOAT", "DOUBLE"):
+        return f"isfinite({ident})"
+    return f"{ident} IS NOT NULL"
+
+
+def _columns(result) -> List[list]:
+    """Fetches a result column by column as lists of JSON-friendly Python values."""
+    return [column.tolist() for column in result.fetchnumpy().values()]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, per bucket, the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average, which preserves the visual shape of the series.
+
+    Returns:
+        np.ndarray: Indices of the kept points, in order.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        next_end = max(next_end, next_start + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+    return kept
+
+
+# region chart aggregator
+class ChartAggregator:
+    """
+    Builds chart series from the full dataset inside DuckDB.
+
+    Only a chart's worth of rows ever leaves the database:
+
+    - bar/pie: `GROUP BY` the x column (sum of y, or row counts) over every
+      row, keeping the largest categories.
+    - line: min/max bucketing along x in SQL, then LTTB down to the target
+      point count.
+    - scatter: stratified sampling over an x/y grid, so sparse regions and
+      outliers stay visible instead of being drowned out by dense clusters.
+    """
+
+    def __init__(
+        self,
+        db_client: DuckDBClient,
+        max_points: int = CHART_MAX_POINTS,
+        max_categories: int = CHART_MAX_CATEGORIES,
+    ):
+        """
+        Args:
+            db_client: Supplies pooled, S3-configured DuckDB connections.
+            max_points: Target points for line and scatter charts.
+            max_categories: Maximum categories for bar charts.
+        """
+        self.db_client = db_client
+        self.max_points = max_points
+        self.max_categories = max_categories
+
+    def build(self, file_uri: str, chart_type: str, x_column: str, y_column: str = "") -> Dict[str, Any]:
+        """
+        Builds a chart spec by scanning `file_uri` in place.
+
+        Returns:
+            dict: The visualization spec ('type', 'chart_type', 'x_column',
+                'y_column', 'data') plus 'total_rows' and 'downsampling'.
+        """
+        return self._build(read_source_sql(file_uri), chart_type, x_column, y_column)
+
+    def build_from_frame(self, df: pd.DataFrame, chart_type: str, x_column: str, y_column: str = "") -> Dict[str, Any]:
+        """Same as `build`, for a DataFrame that is already in memory."""
+        return self._build(None, chart_type, x_column, y_column, frame=df)
+
+    def _build(
+        self,
+        source: Optional[str],
+        chart_type: str,
+        x_column: str,
+        y_column: str,
+        frame: Optional[pd.DataFrame] = None,
+    ) -> Dict[str, Any]:
+        if chart_type not in CHART_TYPES:
+            raise ValueError(f"Unsupported chart_type '{chart_type}'. Use one of: {', '.join(CHART_TYPES)}")
+
+        with self.db_client.connection() as conn:
+            if frame is not None:
+                conn.register("chart_frame", frame)
+                source = "chart_frame"
+            try:
+                types = {row[0]: row[1] for row in conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()}
+                if x_column not in types:
+                    raise ValueError(f"Column '{x_column}' not found. Available columns: {list(types)}")
+                if y_column not in types or y_column == x_column:
+                    # Unknown y columns are ignored, as before: the chart counts rows instead
+                    y_column = ""
+
+                if chart_type in ("bar", "pie"):
+                    spec = self._categories(conn, source, types, chart_type, x_column, y_column)
+                elif chart_type == "line":
+                    spec = self._line(conn, source, types, x_column, y_column)
+                else:
+                    spec = self._scatter(conn, source, types, x_column, y_column)
+            finally:
+                if frame is not None:
+                    conn.unregister("chart_frame")
+
+        return {"type": "visualization", "chart_type": chart_type, "x_column": x_column, **spec}
+
+    # region bar / pie
+    def _categories(self, conn, source, types, chart_type, x_column, y_column) -> Dict[str, Any]:
+        x = quote_identifier(x_column)
+        x_type = types[x_column]
+
+        if y_column and _is_numeric(types[y_column]):
+            aggregation, value = "sum", f"sum({quote_identifier(y_column)})"
+        else:
+            # Nothing to add up: chart the number of rows per category
+            y_column, aggregation, value = "count", "count", "count(*)"
+
+        limit = min(self.max_categories, PIE_MAX_SLICES) if chart_type == "pie" else self.max_categories
+        query = f"""
+            WITH groups AS (
+                SELECT {x} AS x, CAST({value} AS DOUBLE) AS y, count(*) AS n_rows
+                FROM {source} WHERE {x} IS NOT NULL GROUP BY {x}
+            ),
+            ranked AS (
+                SELECT x, y, n_rows,
+                       row_number() OVER (ORDER BY y DESC NULLS LAST, x) AS rank,
+                       count(*) OVER () AS n_groups,
+                       sum(y) OVER () AS total,
+                       sum(n_rows) OVER () AS total_rows
+                FROM groups
+            )
+            SELECT {_output_expr('x', x_type)}, y, n_groups, total, total_rows,
+                   sum(y) OVER () AS shown
+            FROM ranked WHERE rank <= {limit}
+            ORDER BY CASE WHEN n_groups <= {limit} THEN x END, rank
+        """
+        labels, values, n_groups, total, total_rows, shown = _columns(conn.execute(query))
+        if aggregation == "count":
+            values = [int(v) for v in values]
+
+        n_groups = n_groups[0] if labels else 0
+        total_rows = int(total_rows[0]) if labels else 0
+        if chart_type == "pie" and n_groups > limit:
+            other = total[0] - shown[0]
+            labels.append("Other")
+            values.append(int(other) if aggregation == "count" else other)
+
+        return {
+            "y_column": y_column,
+            "data": [{x_column: label, y_column: v} for label, v in zip(labels, values)],
+            "total_rows": total_rows,
+            "downsampling": {"method": "group_by", "aggregation": aggregation, "groups": n_groups},
+        }
+
+    # region line
+    def _line(self, conn, source, types, x_column, y_column) -> Dict[str, Any]:
+        x = quote_identifier(x_column)
+        x_type = types[x_column]
+
+        if y_column:
+            if not _is_numeric(types[y_column]):
+                raise ValueError(f"Line charts need a numeric y column; '{y_column}' is {types[y_column]}")
+            y = quote_identifier(y_column)
+            rows = f"SELECT {x} AS x, CAST({y} AS DOUBLE) AS y FROM {source} WHERE {x} IS NOT NULL AND {_valid_expr(y, types[y_column])}"
+        else:
+            y_column = "count"
+            rows = f"SELECT {x} AS x, CAST(count(*) AS DOUBLE) AS y FROM {source} WHERE {x} IS NOT NULL GROUP BY {x}"
+
+        # Numeric position along the x axis used for bucketing and LTTB.
+        # The mapping is monotonic, so the bounds come from min(x)/max(x).
+        if x_type == "TIME":
+            position = "epoch({})"
+        elif _is_temporal(x_type):
+            position = "epoch_ms({})"
+        elif _is_numeric(x_type):
+            position = "CAST({} AS DOUBLE)"
+        else:
+            position = None
+        if position:
+            base = f"WITH base AS (SELECT {position.format('x')} AS xv, x, y FROM ({rows}))"
+            stats = f"SELECT count(*), {position.format('min(x)')}, {position.format('max(x)')} FROM ({rows})"
+        else:
+            base = f"WITH base AS (SELECT CAST(dense_rank() OVER (ORDER BY x) AS DOUBLE) AS xv, x, y FROM ({rows}))"
+            stats = f"SELECT count(*), 1, count(DISTINCT x) FROM ({rows})"
+
+        n, lo, hi = conn.execute(stats).fetchone()
+
+        if n <= self.max_points:
+            _, xo, ys = _columns(conn.execute(
+                f"{base} SELECT xv, {_output_expr('x', x_type)}, y FROM base ORDER BY xv"
+            ))
+            method = "none"
+        else:
+            # Min/max bucketing: the lowest and highest point of each bucket,
+            # so peaks survive. Aggregates run on native values; only the
+            # kept x values are converted for output.
+            buckets = self.max_points
+            scale = buckets / ((hi - lo) or 1.0)
+            aggregates, outputs = [], []
+            for i, fn in enumerate(("arg_min", "arg_max")):
+                aggregates.append(f"{fn}(xv, y) AS xv{i}, {fn}(x, y) AS x{i}, {'min' if i == 0 else 'max'}(y) AS y{i}")
+                outputs.append(f"xv{i}, {_output_expr(f'x{i}', x_type)}, y{i}")
+            query = f"""
+                {base}, bucketed AS (
+                    SELECT least(CAST(floor((xv - {lo!r}) * {scale!r}) AS INTEGER), {buckets - 1}) AS b, xv, x, y
+                    FROM base
+                ),
+                extremes AS (SELECT {', '.join(aggregates)} FROM bucketed GROUP BY b)
+                SELECT {', '.join(outputs)} FROM extremes
+            """
+            points = {}
+            for row in conn.execute(query).fetchall():
+                for i in range(0, len(row), 3):
+                    points[(row[i], row[i + 2])] = row[i:i + 3]
+            ordered = sorted(points.values(), key=lambda p: p[0])
+
+            xv = np.array([p[0] for p in ordered], dtype=float)
+            yv = np.array([p[2] for p in ordered], dtype=float)
+            kept = lttb(xv, yv, self.max_points)
+            xo = [ordered[i][1] for i in kept]
+            ys = [ordered[i][2] for i in kept]
+            method = "minmax+lttb"
+
+        return {
+            "y_column": y_column,
+            "data": [{x_column: a, y_column: b} for a, b in zip(xo, ys)],
+            "total_rows": int(n),
+            "downsampling": {"method": method, "points": len(xo)},
+        }
+
+    # region scatter
+    def _scatter(self, conn, source, types, x_column, y_column) -> Dict[str, Any]:
+        if not y_column:
+            raise ValueError("Scatter charts need a y_column")
+        for column in (x_column, y_column):
+            if not _is_numeric(types[column]):
+                raise ValueError(f"Scatter charts need numeric columns; '{column}' is {types[column]}")
+
+        x, y = quote_identifier(x_column), quote_identifier(y_column)
+        base = (
+            f"WITH base AS (SELECT CAST({x} AS DOUBLE) AS x, CAST({y} AS DOUBLE) AS y FROM {source} "
+            f"WHERE {_valid_expr(x, types[x_column])} AND {_valid_expr(y, types[y_column])})"
+        )
+        n, x_lo, x_hi, y_lo, y_hi = conn.execute(
+            f"{base} SELECT count(*), min(x), max(x), min(y), max(y) FROM base"
+        ).fetchone()
+
+        if n <= self.max_points:
+            xs, ys = _columns(conn.execute(f"{base} SELECT x, y FROM base"))
+            method = "none"
+        else:
+            g = SCATTER_GRID
+            x_scale = g / ((x_hi - x_lo) or 1.0)
+            y_scale = g / ((y_hi - y_lo) or 1.0)
+            cell = (
+                f"least(CAST(floor((x - {x_lo!r}) * {x_scale!r}) AS INTEGER), {g - 1}) * {g} + "
+                f"least(CAST(floor((y - {y_lo!r}) * {y_scale!r}) AS INTEGER), {g - 1})"
+            )
+            cells = f"{base}, cells AS (SELECT {cell} AS cell, x, y FROM base)"
+            counts = conn.execute(f"{cells} SELECT cell, count(*) FROM cells GROUP BY cell").fetchall()
+
+            # Keep about 2x each cell's quota in one scan by comparing a row
+            # hash against a per-cell threshold (a constant list indexed by
+            # cell, which is much cheaper than joining a quota table), then
+            # trim each cell to exactly its quota on the small result.
+            thresholds = [0] * (g * g)
+            quotas = [0] * (g * g)
+            for c, cnt, quota in self._allocate(counts):
+                thresholds[c] = math.ceil(min(1.0, 2 * quota / cnt) * _HASH_RANGE)
+                quotas[c] = quota
+            query = f"""
+                {cells}
+                SELECT x, y FROM (
+                    SELECT x, y, cell, hash(x, y) % {_HASH_RANGE} AS h FROM cells
+                ) WHERE h < {thresholds}[cell + 1]
+                QUALIFY row_number() OVER (PARTITION BY cell ORDER BY h) <= {quotas}[cell + 1]
+            """
+            xs, ys = _columns(conn.execute(query))
+            method = "stratified_sample"
+
+        return {
+            "y_column": y_column,
+            "data": [{x_column: a, y_column: b} for a, b in zip(xs, ys)],
+            "total_rows": int(n),
+            "downsampling": {"method": method, "points": len(xs)},
+        }
+
+    def _allocate(self, counts: List[Tuple[int, int]]) -> List[Tuple[int, int, int]]:
+        """
+        Splits `max_points` across grid cells.
+
+        Every non-empty cell gets at least one point (so outliers survive);
+        the rest is shared in proportion to each cell's row count.
+        """
+        counts = sorted(counts, key=lambda c: c[1], reverse=True)[: self.max_points]
+        total = sum(cnt for _, cnt in counts)
+        spare = self.max_points - len(counts)
+
+        quotas = []
+        for cell, cnt in counts:
+            share = math.floor(spare * cnt / total) if total else 0
+            quotas.append((int(cell), int(cnt), min(cnt, 1 + share)))
+        return quotas
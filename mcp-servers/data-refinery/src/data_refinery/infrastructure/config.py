@@ -0,0 +1,101 @@
+# region imports
+import os
+from typing import Dict
+
+
+def env_int(name: str, default: int) -> int:
+    """Reads an integer setting from the environment, falling back to `default`."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def env_str(name: str, default: str) -> str:
+    """Reads a string setting from the environment, falling back to `default`."""
+    value = os.environ.get(name)
+    return value.strip() if value and value.strip() else default
+
+
+def env_limits(name: str, default: Dict[str, int]) -> Dict[str, int]:
+    """Reads 'key=n,key=n' pairs from the environment, falling back to `default`."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return dict(default)
+    limits = {}
+    for pair in value.split(","):
+        if pair.strip():
+            key, _, number = pair.partition("=")
+            limits[key.strip()] = int(number)
+    return limits
+
+
+# region dataset cache
+# Memory budget for the process-wide DataFrame cache used by `load_data`.
+# Set to 0 to disable caching entirely.
+DATASET_CACHE_MAX_MB = env_int("DATASET_CACHE_MAX_MB", 512)
+
+# region profiling
+# Engine used by `inspect_dataset`: "duckdb" (single aggregate query over the
+# file) or "pandas" (load into a DataFrame and analyze column by column).
+PROFILE_ENGINE = env_str("PROFILE_ENGINE", "duckdb")
+
+# Files larger than this are profiled by the chunked streaming engine instead
+# of being loaded whole into pandas (used by the "pandas" engine and as the
+# DuckDB fallback). Set PROFILE_ENGINE=streaming to always stream.
+STREAMING_PROFILE_MIN_MB = env_int("STREAMING_PROFILE_MIN_MB", 512)
+
+# Rows per chunk for streaming profiling; bounds peak memory.
+STREAMING_CHUNK_ROWS = env_int("STREAMING_CHUNK_ROWS", 100_000)
+
+# region cleaning
+# Engine used by `clean_dataset`: "pandas", "duckdb" (SQL-compiled, out-of-core)
+# or "auto" (DuckDB for sources larger than CLEAN_SQL_MIN_MB).
+CLEAN_ENGINE = env_str("CLEAN_ENGINE", "auto")
+CLEAN_SQL_MIN_MB = env_int("CLEAN_SQL_MIN_MB", 256)
+
+# region duckdb
+# Cursors available concurrently from the shared DuckDB connection pool.
+DUCKDB_POOL_SIZE = env_int("DUCKDB_POOL_SIZE", 4)
+
+# DuckDB worker threads (0 = DuckDB default, i.e. all cores).
+DUCKDB_THREADS = env_int("DUCKDB_THREADS", 0)
+
+# DuckDB memory limit, e.g. "4GB" (empty = DuckDB default, 80% of RAM).
+DUCKDB_MEMORY_LIMIT = env_str("DUCKDB_MEMORY_LIMIT", "")
+
+# Maximum entries in the persistent SQL result index (0 disables the cache).
+SQL_RESULT_CACHE_MAX_ENTRIES = env_int("SQL_RESULT_CACHE_MAX_ENTRIES", 1000)
+
+# region ingestion
+# CSV parser used by `load_data`: "pandas" (default C parser, NumPy dtypes) or
+# "pyarrow" (multithreaded Arrow reader, cached schemas). Both yield the same dtypes.
+CSV_ENGINE = env_str("CSV_ENGINE", "pandas")
+
+# region visualization
+# Target number of points returned for line and scatter charts.
+CHART_MAX_POINTS = env_int("CHART_MAX_POINTS", 500)
+
+# Maximum categories returned for bar charts (pie charts use at most 12 slices).
+CHART_MAX_CATEGORIES = env_int("CHART_MAX_CATEGORIES", 50)
+
+# region tool execution
+# Where tool bodies run, off the MCP event loop: "thread" (shared in-process
+# caches; DuckDB and Arrow release the GIL) or "process" (pandas-heavy work
+# runs in parallel, each worker process keeps its own caches).
+TOOL_EXECUTOR = env_str("TOOL_EXECUTOR", "thread")
+
+# Worker threads/processes shared by all tools.
+TOOL_WORKERS = env_int("TOOL_WORKERS", 4)
+
+# Per-tool concurrency limits as "tool=n,tool=n"; unlisted tools are only
+# bounded by TOOL_WORKERS.
+TOOL_CONCURRENCY = env_limits("TOOL_CONCURRENCY", {"clean_dataset": 1, "run_sql_query": 2})
+
+# region transport
+# "stdio" (spawned per client) or "streamable-http" (a shared server tier:
+# MCP_HTTP_WORKERS processes behind MCP_HOST:MCP_PORT, path /mcp).
+MCP_TRANSPORT = env_str("MCP_TRANSPORT", "stdio")
+MCP_HOST = env_str("MCP_HOST", "127.0.0.1")
+MCP_PORT = env_int("MCP_PORT", 8050)
+MCP_HTTP_WORKERS = env_int("MCP_HTTP_WORKERS", 1)
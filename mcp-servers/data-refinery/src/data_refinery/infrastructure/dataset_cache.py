@@ -0,0 +1,112 @@
+# region imports
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from data_refinery.infrastructure.config import DATASET_CACHE_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+
+# region DatasetCache
+class DatasetCache:
+    """
+    Process-wide, memory-budgeted LRU cache of parsed DataFrames.
+
+    Entries are keyed by a read key (usually the URI) and validated against a
+    freshness fingerprint (local mtime/size or S3 ETag). A fingerprint mismatch
+    is treated as a miss and the stale entry is replaced.
+
+    Callers receive shallow copies. With pandas Copy-on-Write (the default
+    since pandas 3.0) a shallow copy shares buffers with the cached frame
+    until it is modified, so a cache hit costs no parsing and no data copy,
+    while in-place edits by tools (e.g. renaming headers) never leak back
+    into the cache.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Total memory budget for cached frames. 0 disables caching.
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, pd.DataFrame, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, fingerprint: str) -> Optional[pd.DataFrame]:
+        """Returns a shallow copy of the cached frame, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1].copy(deep=False)
+
+    def put(self, key: str, fingerprint: str, df: pd.DataFrame) -> None:
+        """Stores a frame, evicting least-recently-used entries to stay within budget."""
+        if self.max_bytes <= 0:
+            return
+
+        size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            self._remove(key)
+
+            # A single frame larger than the whole budget is never cached
+            if size > self.max_bytes:
+                logger.debug(f"Not caching {key}: {size} bytes exceeds budget of {self.max_bytes}")
+                return
+
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted[2]
+                self.evictions += 1
+                logger.debug(f"Evicted {evicted_key} from dataset cache")
+
+            self._entries[key] = (fingerprint, df.copy(deep=False), size)
+            self.current_bytes += size
+
+    def invalidate(self, key: str) -> None:
+        """Drops a single entry, if present."""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drops every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and current memory usage."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[2]
+
+
+# Shared by every PandasDatasetClient in the process, so repeated tool calls
+# on the same URI within an agent run skip re-parsing.
+dataset_cache = DatasetCache(max_bytes=DATASET_CACHE_MAX_MB * 1024 * 1024)
@@ -0,0 +1,227 @@
+# region imports
+import re
+import warnings
+from typing import Dict, List, Optional, Tuple
+
+from pandas.tseries.api import guess_datetime_format
+
+# Domain Imports
+from data_refinery.domain.models.cleaning import CleaningOptions
+from data_refinery.domain.models.dataset import DatasetOverview
+
+# Infrastructure Imports
+from data_refinery.infrastructure.duckdb_client import DuckDBClient, read_source_sql, quote_identifier, quote_literal
+from data_refinery.infrastructure.duckdb_profiler import DuckDBProfiler, NUMERIC_TYPES
+
+# Input formats tried (after ISO casting) when no format can be guessed for a date column
+DATE_INPUT_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%d-%m-%Y", "%Y/%m/%d", "%d.%m.%Y", "%b %d %Y", "%d %b %Y"]
+
+
+def normalize_header(name: str) -> str:
+    """Same rules as the pandas engine: strip, lowercase, spaces -> '_', drop non-word chars."""
+    name = name.strip().lower()
+    name = re.sub(r"\s+", "_", name)
+    return re.sub(r"[^\w]", "", name)
+
+
+# region SQL cleaning engine
+class DuckDBCleaningEngine:
+    """
+    Out-of-core cleaning engine that compiles `CleaningOptions` into one SQL statement.
+
+    Mirrors `PandasDatasetClient.clean_dataset` step for step, but instead of
+    copying a DataFrame per operation it builds a single DuckDB pipeline that
+    streams from the source URI straight into a Parquet file:
+
+    - Header normalization becomes column aliases.
+    - Date normalization becomes `strftime` over `try_strptime`, using the
+      format pandas would guess from the column's first value (values in any
+      other format become NULL, as pandas coerces them to NaT).
+    - Imputation becomes `COALESCE` against aggregates computed in a CTE.
+    - Every 'drop' strategy folds into one combined `WHERE`.
+
+    DuckDB spills to disk when needed, so files larger than RAM can be cleaned.
+    """
+
+    def __init__(self, db_client: DuckDBClient, profiler: DuckDBProfiler):
+        """
+        Args:
+            db_client: Supplies pooled, S3-configured DuckDB connections.
+            profiler: Produces the quality report for the written artifact.
+        """
+        self.db_client = db_client
+        self.profiler = profiler
+
+    def clean(self, file_uri: str, options: CleaningOptions, output_path: str) -> DatasetOverview:
+        """
+        Cleans `file_uri` into a Parquet file at `output_path`.
+
+        Args:
+            file_uri: Local path or 's3://' URI of the source dataset.
+            options: The cleaning rules.
+            output_path: Destination Parquet path (local or 's3://').
+
+        Returns:
+            DatasetOverview: Quality report of the cleaned artifact.
+        """
+        source = read_source_sql(file_uri)
+
+        with self.db_client.connection() as conn:
+            schema = [(row[0], row[1]) for row in conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()]
+            date_formats = self._guess_date_formats(conn, source, schema, options)
+            query = self.compile(source, schema, options, date_formats)
+            conn.execute(f"COPY ({query}) TO {quote_literal(output_path)} (FORMAT PARQUET)")
+
+        return self.profiler.profile(output_path)
+
+    def _guess_date_formats(
+        self, conn, source: str, schema: List[Tuple[str, str]], options: CleaningOptions
+    ) -> Dict[str, Optional[str]]:
+        """
+        Guesses each text date column's format from its first non-null value.
+
+        This is what `pd.to_datetime` does: the whole column is then parsed
+        with that one format. Keys are column names after header normalization.
+        """
+        originals = {
+            (normalize_header(name) if options.normalize_headers else name): (name, duck_type)
+            for name, duck_type in schema
+        }
+        formats: Dict[str, Optional[str]] = {}
+        for date_cfg in options.date_columns or []:
+            original, duck_type = originals.get(date_cfg.column_name, (None, None))
+            if duck_type != "VARCHAR":
+                continue
+            ident = quote_identifier(original)
+            row = conn.execute(f"SELECT {ident} FROM {source} WHERE {ident} IS NOT NULL LIMIT 1").fetchone()
+            if row is None:
+                continue
+            with warnings.catch_warnings():
+                # e.g. "Parsing dates in %d/%m/%Y format when dayfirst=False"
+                warnings.simplefilter("ignore")
+                formats[date_cfg.column_name] = guess_datetime_format(row[0], dayfirst=False)
+        return formats
+
+    def compile(
+        self,
+        source: str,
+        schema: List[Tuple[str, str]],
+        options: CleaningOptions,
+        date_formats: Optional[Dict[str, Optional[str]]] = None,
+    ) -> str:
+        """
+        Builds the cleaning query for a source with the given (name, DuckDB type) schema.
+
+        Strategies are applied in their dict order, like the pandas engine:
+        an aggregate (mean/mode) only sees rows that survive the 'drop'
+        strategies listed before it.
+
+        `date_formats` maps text date columns to the format guessed from their
+        first value (see `_guess_date_formats`); without one, ISO casting and
+        DATE_INPUT_FORMATS are tried in turn.
+        """
+        # 1. Normalize Headers -> aliases
+        types: Dict[str, str] = {}
+        select_renamed = []
+        for original, duck_type in schema:
+            name = normalize_header(original) if options.normalize_headers else original
+            types[name] = duck_type
+            select_renamed.append(f"{quote_identifier(original)} AS {quote_identifier(name)}")
+
+        # 2. Date Normalization -> strftime(parsed, format)
+        date_replacements = []
+        for date_cfg in options.date_columns or []:
+            col = date_cfg.column_name
+            if col not in types:
+                continue
+            ident = quote_identifier(col)
+            duck_type = types[col]
+
+            if duck_type == "DATE" or duck_type.startswith("TIMESTAMP"):
+                parsed = f"{ident}::TIMESTAMP"
+            elif duck_type == "VARCHAR" and (date_formats or {}).get(col):
+                parsed = f"try_strptime({ident}, {quote_literal(date_formats[col])})"
+            elif duck_type == "VARCHAR":
+                formats = ", ".join(quote_literal(f) for f in DATE_INPUT_FORMATS)
+                parsed = f"COALESCE(TRY_CAST({ident} AS TIMESTAMP), try_strptime({ident}, [{formats}]))"
+            else:
+                # Incompatible column: skip it, as the pandas engine does
+                continue
+
+            if date_cfg.output_format:
+                date_replacements.append(f"strftime({parsed}, {quote_literal(date_cfg.output_format)}) AS {ident}")
+                types[col] = "VARCHAR"
+            else:
+                date_replacements.append(f"{parsed} AS {ident}")
+                types[col] = "TIMESTAMP"
+
+        # 3. Column Strategies -> aggregates, COALESCE fills and one WHERE
+        aggregates: List[str] = []
+        # Uncorrelated scalar subqueries (mode fills): one value each, no FROM needed
+        scalars: List[str] = []
+        fills: Dict[str, str] = {}
+        drops: List[str] = []
+
+        for column, strategy in options.strategies.items():
+            if column not in types:
+                continue  # Skip columns that don't exist (safety check)
+
+            ident = quote_identifier(column)
+            duck_type = types[column]
+            is_numeric = duck_type in NUMERIC_TYPES or duck_type.startswith("DECIMAL")
+            # Aggregates only see rows kept by the drops that precede them
+            row_filter = f" FILTER (WHERE {' AND '.join(drops)})" if drops else ""
+
+            if strategy == "drop":
+                drops.append(f"d.{ident} IS NOT NULL")
+
+            elif strategy == "zero":
+                if is_numeric:
+                    fills[column] = f"COALESCE(d.{ident}, 0)"
+
+            elif strategy == "mean":
+                if is_numeric:
+                    alias = f"agg_{len(aggregates) + len(scalars)}"
+                    aggregates.append(f"avg(d.{ident}){row_filter} AS {alias}")
+                    fills[column] = f"COALESCE(d.{ident}, a.{alias})"
+
+            elif strategy == "mode":
+                # mode() breaks ties arbitrarily; pandas' mode()[0] takes the
+                # smallest of the most frequent values, so rank the counts.
+                alias = f"agg_{len(aggregates) + len(scalars)}"
+                kept = " AND ".join([f"d.{ident} IS NOT NULL"] + drops)
+                scalars.append(
+                    f"(SELECT v FROM (SELECT d.{ident} AS v, count(*) AS n FROM staged AS d "
+                    f"WHERE {kept} GROUP BY v) ORDER BY n DESC, v ASC LIMIT 1) AS {alias}"
+                )
+                fills[column] = f"COALESCE(d.{ident}, a.{alias})"
+
+            elif strategy == "unknown":
+                text = f"d.{ident}" if duck_type == "VARCHAR" else f"d.{ident}::VARCHAR"
+                fills[column] = f"COALESCE({text}, 'Unknown')"
+                types[column] = "VARCHAR"
+
+        # 4. Assemble the pipeline
+        ctes = [f"renamed AS (SELECT {', '.join(select_renamed)} FROM {source})"]
+        if date_replacements:
+            ctes.append(f"staged AS (SELECT * REPLACE ({', '.join(date_replacements)}) FROM renamed)")
+        else:
+            ctes.append("staged AS (SELECT * FROM renamed)")
+        # `aggs` must be exactly one row: it is cross-joined with every output row
+        if aggregates:
+            items = ", ".join(scalars + ["s.*"])
+            ctes.append(f"aggs AS (SELECT {items} FROM (SELECT {', '.join(aggregates)} FROM staged AS d) AS s)")
+        elif scalars:
+            ctes.append(f"aggs AS (SELECT {', '.join(scalars)})")
+
+        projection = "d.*"
+        if fills:
+            replacements = ", ".join(f"{expr} AS {quote_identifier(col)}" for col, expr in fills.items())
+            projection = f"d.* REPLACE ({replacements})"
+
+        query = f"WITH {', '.join(ctes)} SELECT {projection} FROM staged AS d"
+        if aggregates or scalars:
+            query += " CROSS JOIN aggs AS a"
+        if drops:
+            query += f" WHERE {' AND '.join(drops)}"
+        return query
@@ -1,13 +1,84 @@
 # region imports 
 import duckdb
+import pyarrow.parquet as pq
 import uuid
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
 # model imports 
 from data_refinery.domain.models.sql import SQLQueryResponse
 
+# infrastructure imports
+from data_refinery.infrastructure.duckdb_pool import DuckDBConnectionPool
+from data_refinery.infrastructure.sql_result_cache import SQLResultCache
+from data_refinery.infrastructure.config import (
+    DUCKDB_POOL_SIZE, DUCKDB_THREADS, DUCKDB_MEMORY_LIMIT, SQL_RESULT_CACHE_MAX_ENTRIES
+)
+
+# region source helpers
+# Strings pandas.read_csv treats as missing by default (its `na_values`), so
+# DuckDB and pandas agree on which CSV cells are null
+PANDAS_NA_VALUES = (
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+)
+
+
+def read_source_sql(file_uri: str) -> str:
+    """
+    Builds a DuckDB table function that scans a dataset file in place.
+
+    CSV cells matching pandas' default NA markers are read as NULL.
+
+    Args:
+        file_uri: Local path or 's3://' URI of a CSV or Parquet file.
+
+    Returns:
+        A SQL fragment usable in a FROM clause, e.g. "read_parquet('s3://b/f.parquet')".
+    """
+    if file_uri.endswith(".parquet"):
+        return f"read_parquet({quote_literal(file_uri)})"
+    nullstr = ", ".join(quote_literal(v) for v in PANDAS_NA_VALUES)
+    return f"read_csv_auto({quote_literal(file_uri)}, nullstr=[{nullstr}])"
+
+
+def quote_literal(value: str) -> str:
+    """Quotes a string as a SQL literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes a column name for safe use in generated SQL."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def check_read_only(sql_query: str) -> None:
+    """
+    Ensures a query is a single SELECT before it runs on a pooled cursor.
+
+    Pooled cursors share one database, so a CREATE, SET, ATTACH or INSTALL
+    from one call would stay visible to every later call.
+
+    Raises:
+        ValueError: If the query is malformed, has several statements, or is
+        not a SELECT.
+    """
+    try:
+        statements = duckdb.extract_statements(sql_query)
+    except duckdb.ParserException as e:
+        raise ValueError(f"SQL Syntax Error: {str(e)}")
+
+    if len(statements) != 1:
+        raise ValueError(f"Expected exactly one SQL statement, got {len(statements)}.")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError(
+            f"Only SELECT queries are allowed, got {statements[0].type.name}. "
+            "Tables, settings and extensions cannot be changed."
+        )
+
+
 # region DuckDB client
 class DuckDBClient:
     """
@@ -19,13 +90,29 @@ class DuckDBClient:
     3. Map raw database results to Domain Models.
     """
 
-    def __init__(self, artifact_dir: str = "/home/vn-78/VN_78/Programming/Personal/Projects/Final-Year-Project/Entropy/test/temp"):
+    def __init__(
+        self,
+        artifact_dir: str = "/home/vn-78/VN_78/Programming/Personal/Projects/Final-Year-Project/Entropy/test/temp",
+        pool: Optional[DuckDBConnectionPool] = None,
+        result_cache: Optional[SQLResultCache] = None
+    ):
         """
         Ensures that an folder is availabe to store the Generated file
         
         Args:
             artifact_dir: Where we save the results of queries.
+            pool: Connection pool to run queries on. Defaults to a pool sized
+                from DUCKDB_POOL_SIZE/DUCKDB_THREADS/DUCKDB_MEMORY_LIMIT whose
+                root connection is configured for S3 once.
+            result_cache: Persistent index of previous results. Defaults to a
+                SQLite index inside `artifact_dir`.
         """
+        self.pool = pool or DuckDBConnectionPool(
+            size=DUCKDB_POOL_SIZE,
+            threads=DUCKDB_THREADS,
+            memory_limit=DUCKDB_MEMORY_LIMIT,
+            configure=self._configure_s3
+        )
         self.artifact_path = Path(artifact_dir)
         # Ensure the directory exists; fail loudly if we don't have permissions
         try:
@@ -33,6 +120,11 @@ class DuckDBClient:
         except PermissionError:
             raise RuntimeError(f"Critical: Cannot write to artifact directory: {artifact_dir}")
 
+        self.result_cache = result_cache or SQLResultCache(
+            self.artifact_path / "sql_result_cache.sqlite",
+            max_entries=SQL_RESULT_CACHE_MAX_ENTRIES
+        )
+
     def _configure_s3(self, conn: duckdb.DuckDBPyConnection):
         """Configures the DuckDB connection for S3 access if credentials exist."""
         endpoint = os.environ.get("S3_ENDPOINT_URL")
@@ -54,13 +146,46 @@ class DuckDBClient:
                 # Log or ignore if extension fails? Better to warn.
                 print(f"Warning: Failed to configure S3 for DuckDB: {e}")
 
+    @contextmanager
+    def connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Checks out an isolated, S3-configured cursor from the pool.
+
+        The cursor is returned to the pool when the block exits.
+        """
+        with self.pool.acquire() as cursor:
+            yield cursor
+
+    def _describe_parquet(self, path: Path, sample_size: int = 5) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """
+        Reads row count, column count and a sample from a written Parquet file.
+
+        Counts come from the footer metadata; the sample decodes at most the
+        first row group, so this is cheap regardless of the file size.
+        """
+        parquet_file = pq.ParquetFile(path)
+        metadata = parquet_file.metadata
+
+        sample_data: List[Dict[str, Any]] = []
+        if metadata.num_rows > 0:
+            first_batch = next(parquet_file.iter_batches(batch_size=sample_size, row_groups=[0]))
+            # to_pylist yields [{'col': 'Value', ...}], as Pydantic expects List[Dict]
+            sample_data = first_batch.slice(0, sample_size).to_pylist()
+
+        return metadata.num_rows, len(parquet_file.schema_arrow), sample_data
+
     def execute_and_write(self, sql_query: str) -> SQLQueryResponse:
         """
         Executes a SQL query and materializes the result to a Parquet file.
 
-        This method creates an ephemeral DuckDB connection to run the provided
-        SQL query. It calculates metadata (row/column counts), samples the data,
-        and saves the full result set to the configured artifact directory.
+        This method checks out a pooled DuckDB cursor to run the provided
+        SQL query. The query is executed exactly once, streaming the full result
+        set to a Parquet file in the configured artifact directory; metadata
+        (row/column counts) and the sample are then read back from that file.
+
+        Results are cached by normalized SQL plus the fingerprints of every
+        referenced file; an identical query over unchanged sources returns the
+        existing artifact without recomputing.
 
         Args:
             sql_query: A raw SQL query string. Must use valid DuckDB syntax
@@ -72,70 +197,71 @@ class DuckDBClient:
             Parquet file.
 
         Raises:
-            ValueError: If the SQL syntax is malformed.
+            ValueError: If the SQL syntax is malformed, or the query is not a
+            single SELECT statement.
             FileNotFoundError: If the query references a file or table that
             does not exist.
             RuntimeError: If an unexpected error occurs during execution or
             file writing.
         """
-        # 1. Ephemeral Connection
-        # We create a new connection per request to ensure isolation.
-        # DuckDB handles this very cheaply.
-        conn = duckdb.connect(database=':memory:')
-        
-        # Configure S3 if needed
-        self._configure_s3(conn)
+        # 0. Read-Only Guard
+        # Cursors share one database; a CREATE or SET here would leak into
+        # later calls, so only a single SELECT is accepted.
+        check_read_only(sql_query)
 
-        try:
-            # 2. Lazy Execution
-            # conn.sql() creates a "Relation" - it validates syntax but 
-            # doesn't load all data into Python memory yet.
-            relation = conn.sql(sql_query)
-
-            # 3. Validation (The "Peek" Phase)
-            # We fetch basic stats immediately. 
-            # Note: For massive data, count() is expensive, but necessary here.
-            row_count = relation.shape[0]
-            col_count = relation.shape[1]
-            columns = relation.columns
-
-            # 4. Sampling
-            # limit(5) ensures we only fetch 5 rows into Python memory
-            sample_rows = relation.limit(5).fetchall()
-            
-            # Convert tuples [('Value', 10), ...] to Dicts [{'col': 'Value', ...}]
-            # This is required because Pydantic expects List[Dict]
-            sample_data: List[Dict[str, Any]] = [
-                dict(zip(columns, row)) for row in sample_rows
-            ]
-
-            # 5. Materialization (The "Write" Phase)
-            # Generate a unique ID for this result artifact
-            file_id = uuid.uuid4().hex[:8]
-            output_filename = f"result_{file_id}.parquet"
-            output_uri = self.artifact_path / output_filename
-
-            # Write to Parquet (High performance, type-safe)
-            relation.write_parquet(str(output_uri))
-
-            # 6. Return the Contract
-            return SQLQueryResponse(
-                status=True,
-                total_rows=row_count,
-                total_columns=col_count,
-                sample_data=sample_data,
-                result_uri=str(output_uri)
-            )
-
-        except duckdb.ParserException as e:
-            # Malformed SQL
-            raise ValueError(f"SQL Syntax Error: {str(e)}")
-        except duckdb.CatalogException as e:
-            # Missing file or table
-            raise FileNotFoundError(f"Data Access Error: {str(e)}")
-        except Exception as e:
-            # Catch-all for unexpected system failures
-            raise RuntimeError(f"Execution Failed: {str(e)}")
-        finally:
-            # Clean up the connection to free memory
-            conn.close()
+        # 1. Result Cache
+        # Identical (or whitespace-different) SQL over unchanged files reuses
+        # the artifact written last time.
+        cache_key = self.result_cache.key_for(sql_query)
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # 2. Pooled Connection
+        # We check out an isolated cursor from the shared, pre-configured pool,
+        # so extension loading and S3 setup are not paid per request.
+        with self.connection() as conn:
+            try:
+                # 3. Lazy Execution
+                # conn.sql() creates a "Relation" - it validates syntax but 
+                # doesn't load all data into Python memory yet.
+                relation = conn.sql(sql_query)
+
+                # 4. Materialization (The "Write" Phase)
+                # Generate a unique ID for this result artifact
+                file_id = uuid.uuid4().hex[:8]
+                output_filename = f"result_{file_id}.parquet"
+                output_uri = self.artifact_path / output_filename
+
+                # Write to Parquet (High performance, type-safe)
+                # This is the only time the query is executed.
+                relation.write_parquet(str(output_uri))
+
+                # 5. Validation (The "Peek" Phase)
+                # Shape and sample come from the written file rather than
+                # re-running the query: counts from the Parquet footer, rows
+                # from the first row group only.
+                row_count, col_count, sample_data = self._describe_parquet(output_uri)
+
+                # 6. Return the Contract
+                response = SQLQueryResponse(
+                    status=True,
+                    total_rows=row_count,
+                    total_columns=col_count,
+                    sample_data=sample_data,
+                    result_uri=str(output_uri)
+                )
+                if cache_key is not None:
+                    self.result_cache.put(cache_key, response)
+                return response
+
+            except duckdb.ParserException as e:
+                # Malformed SQL
+                raise ValueError(f"SQL Syntax Error: {str(e)}")
+            except duckdb.CatalogException as e:
+                # Missing file or table
+                raise FileNotFoundError(f"Data Access Error: {str(e)}")
+            except Exception as e:
+                # Catch-all for unexpected system failures
+                raise RuntimeError(f"Execution Failed: {str(e)}")
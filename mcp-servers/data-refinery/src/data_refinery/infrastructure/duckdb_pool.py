@@ -0,0 +1,120 @@
+# region imports
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import duckdb
+
+
+# region DuckDB connection pool
+class DuckDBConnectionPool:
+    """
+    A bounded pool of cursors over one pre-configured in-memory DuckDB database.
+
+    The root connection is created once: extensions are loaded, S3 settings
+    applied, and `threads`/`memory_limit` fixed. Settings and loaded extensions
+    are database-wide in DuckDB, so every cursor handed out inherits them and
+    queries skip the per-call `INSTALL/LOAD httpfs` and `SET` round-trips.
+
+    Each checkout gets its own cursor (a separate DuckDB connection with its
+    own transaction and temp objects), so concurrent calls stay isolated.
+    Tables and settings, however, belong to the shared database: callers must
+    not change them (see `check_read_only` in duckdb_client).
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        threads: int = 0,
+        memory_limit: str = "",
+        configure: Optional[Callable[[duckdb.DuckDBPyConnection], None]] = None,
+        checkout_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            size: Maximum number of cursors in use at once.
+            threads: DuckDB worker threads (0 keeps DuckDB's default).
+            memory_limit: DuckDB memory limit, e.g. '4GB' ('' keeps the default).
+            configure: One-time setup applied to the root connection (e.g. S3).
+            checkout_timeout: Seconds to wait for a free cursor before failing.
+        """
+        self.size = size
+        self.threads = threads
+        self.memory_limit = memory_limit
+        self.configure = configure
+        self.checkout_timeout = checkout_timeout
+
+        self._root: Optional[duckdb.DuckDBPyConnection] = None
+        self._idle: "queue.LifoQueue[duckdb.DuckDBPyConnection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _ensure_root(self) -> duckdb.DuckDBPyConnection:
+        with self._lock:
+            if self._root is None:
+                config = {}
+                if self.threads > 0:
+                    config["threads"] = self.threads
+                if self.memory_limit:
+                    config["memory_limit"] = self.memory_limit
+
+                root = duckdb.connect(database=':memory:', config=config)
+                if self.configure:
+                    self.configure(root)
+                self._root = root
+            return self._root
+
+    def _checkout(self) -> duckdb.DuckDBPyConnection:
+        root = self._ensure_root()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return root.cursor()
+
+        try:
+            return self._idle.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise RuntimeError(f"Timed out waiting for a DuckDB connection (pool size {self.size})")
+
+    def _discard(self, cursor: duckdb.DuckDBPyConnection) -> None:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def acquire(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Checks out a cursor for the duration of the block.
+
+        Cursors that raised are closed and replaced rather than reused, so a
+        failed or interrupted query never leaves state behind for the next caller.
+        """
+        cursor = self._checkout()
+        try:
+            yield cursor
+        except BaseException:
+            self._discard(cursor)
+            raise
+        else:
+            self._idle.put(cursor)
+
+    def close(self) -> None:
+        """Closes every idle cursor and the root connection."""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            if self._root is not None:
+                self._root.close()
+                self._root = None
@@ -0,0 +1,207 @@
+# region imports
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# Domain Imports
+from data_refinery.domain.models.dataset import DatasetOverview, ColumnProfile
+
+# Infrastructure Imports
+from data_refinery.infrastructure.duckdb_client import DuckDBClient, read_source_sql, quote_identifier
+
+# DuckDB types that receive numeric statistics (mirrors pandas' is_numeric_dtype)
+NUMERIC_TYPES = {
+    "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+    "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT",
+    "FLOAT", "DOUBLE",
+}
+
+# DuckDB -> pandas dtype names, so both engines report the same 'data_type'.
+# These are the names pandas gives a column without nulls; see _pandas_dtype_name.
+PANDAS_DTYPE_NAMES = {
+    "TINYINT": "int8",
+    "SMALLINT": "int16",
+    "INTEGER": "int32",
+    "BIGINT": "int64",
+    # 128-bit integers have no numpy dtype; they reach pandas as doubles
+    "HUGEINT": "float64",
+    "UHUGEINT": "float64",
+    "UTINYINT": "uint8",
+    "USMALLINT": "uint16",
+    "UINTEGER": "uint32",
+    "UBIGINT": "uint64",
+    "FLOAT": "float32",
+    "DOUBLE": "float64",
+    "BOOLEAN": "bool",
+    "VARCHAR": "str",
+    "DATE": "object",
+    "TIME": "object",
+    "TIMESTAMP_S": "datetime64[s]",
+    "TIMESTAMP_MS": "datetime64[ms]",
+    "TIMESTAMP": "datetime64[us]",
+    "TIMESTAMP_NS": "datetime64[ns]",
+    "TIMESTAMP WITH TIME ZONE": "datetime64[us, UTC]",
+}
+
+# Types DuckDB's CSV sniffer infers that pandas.read_csv leaves as text
+CSV_TEXT_TYPES = {"DATE", "TIME", "TIMESTAMP", "TIMESTAMP WITH TIME ZONE"}
+
+
+def _is_numeric(duck_type: str) -> bool:
+    return duck_type in NUMERIC_TYPES or duck_type.startswith("DECIMAL")
+
+
+def _pandas_dtype_name(duck_type: str, has_nulls: bool, from_csv: bool) -> str:
+    """
+    Names a DuckDB column type the way pandas would after loading the same file.
+
+    pandas stores integers with nulls as float64 and booleans with nulls as
+    object, and `read_csv` does not parse dates, so the name depends on the
+    column's nulls and on the source format as well as on the DuckDB type.
+    """
+    if from_csv and duck_type in CSV_TEXT_TYPES:
+        return "str"
+    if duck_type.startswith("DECIMAL"):
+        return "object"
+    name = PANDAS_DTYPE_NAMES.get(duck_type)
+    if name is None:
+        return "object"
+    if has_nulls and name.startswith(("int", "uint")):
+        return "float64"
+    if has_nulls and name == "bool":
+        return "object"
+    return name
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Converts a DuckDB scalar to a JSON-safe float (NaN/None -> None)."""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+# region DuckDB profiler
+class DuckDBProfiler:
+    """
+    Single-pass dataset profiler backed by DuckDB.
+
+    Produces the same `DatasetOverview` as `PandasDatasetClient.analyze`, but
+    computes every column's statistics in one generated aggregate query that
+    scans the file in place. Nothing is materialized in pandas, so wide or
+    large files are profiled with DuckDB's vectorized, multi-threaded engine.
+    """
+
+    def __init__(self, db_client: DuckDBClient):
+        """
+        Args:
+            db_client: Supplies S3-configured DuckDB connections.
+        """
+        self.db_client = db_client
+
+    def profile(self, file_uri: str) -> DatasetOverview:
+        """
+        Profiles a CSV or Parquet file.
+
+        Args:
+            file_uri: Local path or 's3://' URI of the dataset.
+
+        Returns:
+            DatasetOverview: Row/column counts, per-column stats and a 5-row sample.
+        """
+        source = read_source_sql(file_uri)
+        from_csv = not file_uri.endswith(".parquet")
+
+        with self.db_client.connection() as conn:
+            schema = conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+            columns: List[Tuple[str, str]] = [(row[0], row[1]) for row in schema]
+
+            stats = self._aggregate(conn, source, columns)
+
+            # pandas leaves CSV dates as text: sample them as strings, not date objects
+            as_text = [
+                f"{quote_identifier(name)}::VARCHAR AS {quote_identifier(name)}"
+                for name, duck_type in columns if from_csv and duck_type in CSV_TEXT_TYPES
+            ]
+            projection = f"* REPLACE ({', '.join(as_text)})" if as_text else "*"
+            sample_rel = conn.sql(f"SELECT {projection} FROM {source} LIMIT 5")
+            sample_names = sample_rel.columns
+            sample_data = [
+                {name: _json_safe(value) for name, value in zip(sample_names, row)}
+                for row in sample_rel.fetchall()
+            ]
+
+        total_rows = int(stats["__rows"])
+        profiles = []
+        for i, (name, duck_type) in enumerate(columns):
+            missing_count = total_rows - int(stats[f"nn_{i}"])
+            missing_pct = (missing_count / total_rows) * 100 if total_rows > 0 else 0.0
+
+            profile = ColumnProfile(
+                name=name,
+                data_type=_pandas_dtype_name(duck_type, missing_count > 0, from_csv),
+                missing_percentage=round(missing_pct, 2),
+            )
+            if _is_numeric(duck_type):
+                profile.mean = _to_float(stats[f"mean_{i}"])
+                profile.std = _to_float(stats[f"std_{i}"])
+                profile.min = _to_float(stats[f"min_{i}"])
+                profile.max = _to_float(stats[f"max_{i}"])
+                # Matches pandas: no outlier count when there is no valid data
+                if stats[f"nn_{i}"]:
+                    profile.outlier_count = int(stats[f"out_{i}"])
+            profiles.append(profile)
+
+        return DatasetOverview(
+            total_rows=total_rows,
+            total_columns=len(columns),
+            columns=profiles,
+            sample_data=sample_data
+        )
+
+    def _aggregate(self, conn, source: str, columns: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """
+        Builds and runs the aggregate query for every column at once.
+
+        The first CTE computes null counts, moments, min/max and quartiles.
+        The outer query reuses those quartiles to count IQR outliers, so the
+        whole profile is a single statement.
+        """
+        stat_exprs = ["count(*) AS __rows"]
+        outlier_exprs = []
+
+        for i, (name, duck_type) in enumerate(columns):
+            col = quote_identifier(name)
+            stat_exprs.append(f"count({col}) AS nn_{i}")
+
+            if _is_numeric(duck_type):
+                val = f"{col}::DOUBLE"
+                stat_exprs += [
+                    f"avg({val}) AS mean_{i}",
+                    f"stddev_samp({val}) AS std_{i}",
+                    f"min({val}) AS min_{i}",
+                    f"max({val}) AS max_{i}",
+                    f"quantile_cont({val}, 0.25) AS q1_{i}",
+                    f"quantile_cont({val}, 0.75) AS q3_{i}",
+                ]
+                lower = f"s.q1_{i} - 1.5 * (s.q3_{i} - s.q1_{i})"
+                upper = f"s.q3_{i} + 1.5 * (s.q3_{i} - s.q1_{i})"
+                outlier_exprs.append(f"count_if({val} < {lower} OR {val} > {upper}) AS out_{i}")
+
+        query = f"WITH src AS (SELECT * FROM {source}), stats AS (SELECT {', '.join(stat_exprs)} FROM src) "
+        if outlier_exprs:
+            query += (
+                f"SELECT stats.*, o.* FROM stats, "
+                f"(SELECT {', '.join(outlier_exprs)} FROM src, stats AS s) AS o"
+            )
+        else:
+            query += "SELECT * FROM stats"
+
+        rel = conn.sql(query)
+        row = rel.fetchone()
+        return dict(zip(rel.columns, row))
@@ -0,0 +1,67 @@
+# region imports
+import os
+import logging
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+_s3_client = None
+
+
+def get_s3_client():
+    """Lazily builds a boto3 S3 client from the same env config the readers use."""
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+
+        _s3_client = boto3.client(
+            "s3",
+            endpoint_url=os.environ.get("S3_ENDPOINT_URL"),
+            aws_access_key_id=os.environ.get("S3_ACCESS_KEY"),
+            aws_secret_access_key=os.environ.get("S3_SECRET_KEY"),
+        )
+    return _s3_client
+
+
+# region source stat
+def stat_source(file_uri: str) -> Optional[Tuple[str, int]]:
+    """
+    Returns a cheap freshness token and the size in bytes of a dataset source.
+
+    - Local files: modification time (ns) and size from `os.stat`.
+    - S3 objects: the ETag and size from a HEAD request.
+
+    Returns None if the source cannot be stat'ed.
+    """
+    try:
+        if file_uri.startswith("s3://"):
+            parsed = urlparse(file_uri)
+            head = get_s3_client().head_object(Bucket=parsed.netloc, Key=parsed.path.lstrip("/"))
+            etag = head["ETag"].strip('"')
+            return f"{etag}-{head['ContentLength']}", int(head["ContentLength"])
+
+        stat = os.stat(file_uri)
+        return f"{stat.st_mtime_ns}-{stat.st_size}", stat.st_size
+    except Exception as e:
+        logger.debug(f"Could not stat {file_uri}: {e}")
+        return None
+
+
+# region source fingerprint
+def source_fingerprint(file_uri: str) -> Optional[str]:
+    """
+    Returns a cheap freshness token for a dataset source.
+
+    The token changes whenever the underlying bytes change, so it can be used
+    to key caches without re-reading the file. Returns None if the source
+    cannot be stat'ed; callers should treat that as "do not cache".
+    """
+    stat = stat_source(file_uri)
+    return stat[0] if stat else None
+
+
+def source_size(file_uri: str) -> Optional[int]:
+    """Returns the size of a dataset source in bytes, or None if unknown."""
+    stat = stat_source(file_uri)
+    return stat[1] if stat else None
@@ -1,20 +1,40 @@
 # region imports
 import pandas as pd
 import io
+import json
 import os
-from typing import Any, Tuple, Optional
+from typing import Any, Iterator, List, Sequence, Tuple, Optional
 from urllib.parse import urlparse
 
 # Domain Imports
-from data_refinery.domain.interfaces.repository import IDatasetRepository
+from data_refinery.domain.interfaces.repository import IDatasetRepository, RowFilter
 from data_refinery.domain.models.dataset import DatasetOverview, ColumnProfile
 from data_refinery.domain.models.cleaning import CleaningOptions
 
+# Infrastructure Imports
+from data_refinery.infrastructure.dataset_cache import DatasetCache, dataset_cache
+from data_refinery.infrastructure.fingerprint import source_fingerprint
+from data_refinery.infrastructure.arrow_csv import ArrowCSVReader
+from data_refinery.infrastructure.config import CSV_ENGINE
+from data_refinery.infrastructure.row_filters import apply_filters, filter_columns, to_arrow_expression, validate_filters
+
 # region load_data  
 class PandasDatasetClient(IDatasetRepository):
     """
     Implementation to load Data from both local files and S3 URLs using pandas as the engine
     """
+
+    def __init__(self, cache: Optional[DatasetCache] = None, csv_engine: str = CSV_ENGINE):
+        """
+        Args:
+            cache: The DataFrame cache used by `load_data`. Defaults to the
+                process-wide cache so every tool shares parsed datasets.
+            csv_engine: "pandas" for the default parser, or "pyarrow" for
+                multithreaded Arrow-backed ingestion.
+        """
+        self.cache = cache if cache is not None else dataset_cache
+        self.csv_engine = csv_engine
+        self.arrow_reader = ArrowCSVReader()
     
     def _get_storage_options(self) -> Optional[dict]:
         """Returns storage options for s3fs/boto3 if S3 config is present in env."""
@@ -30,17 +50,134 @@ class PandasDatasetClient(IDatasetRepository):
             }
         return None
 
-    def load_data(self, file_uri) -> pd.DataFrame:
+    def load_data(
+        self,
+        file_uri: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[RowFilter]] = None,
+    ) -> pd.DataFrame:
         """
         Smart loader: checks if URI is S3 or Local, and handles CSV or Parquet.
+
+        Parsed frames are cached per URI and validated against the source's
+        fingerprint (mtime/size or S3 ETag), so repeated loads of an unchanged
+        file within an agent run skip parsing entirely.
+
+        `columns` and `filters` are pushed down to the reader: Parquet reads
+        only the requested column chunks and skips row groups whose statistics
+        rule the filters out; CSV skips converting unused columns. If the full
+        frame is already cached, the projection is served from it instead.
+
+        Args:
+            file_uri: Local path or 's3://' URI.
+            columns: Only load these columns (all columns if None).
+            filters: (column, op, value) filters, combined with AND.
         """
+        filters = validate_filters(filters)
+        read_key = file_uri
+        if columns is not None or filters:
+            read_key = f"{file_uri}#" + json.dumps({"columns": columns, "filters": filters}, default=str)
+
+        fingerprint = source_fingerprint(file_uri)
+        if fingerprint is not None:
+            if read_key != file_uri:
+                full = self.cache.get(file_uri, fingerprint)
+                if full is not None:
+                    return self._project(full, columns, filters)
+            cached = self.cache.get(read_key, fingerprint)
+            if cached is not None:
+                return cached
+
+        df = self._read(file_uri, fingerprint, columns, filters)
+
+        if fingerprint is not None:
+            self.cache.put(read_key, fingerprint, df)
+        return df
+
+    def list_columns(self, file_uri: str) -> List[str]:
+        """
+        Returns the dataset's column names without loading its rows.
+
+        Reads only the Parquet footer or the CSV header line.
+        """
+        fingerprint = source_fingerprint(file_uri)
+        if fingerprint is not None:
+            cached = self.cache.get(file_uri, fingerprint)
+            if cached is not None:
+                return list(cached.columns)
+
         storage_opts = self._get_storage_options() if file_uri.startswith("s3://") else None
-        
         if file_uri.endswith(".parquet"):
-            return pd.read_parquet(file_uri, storage_options=storage_opts)
+            import pyarrow.parquet as pq
+
+            if not file_uri.startswith("s3://"):
+                return list(pq.read_schema(file_uri).names)
+
+            import fsspec
+
+            with fsspec.open(file_uri, "rb", **(storage_opts or {})) as f:
+                return list(pq.read_schema(f).names)
+        return list(pd.read_csv(file_uri, nrows=0, storage_options=storage_opts).columns)
+
+    def _project(self, df: pd.DataFrame, columns: Optional[List[str]], filters: List[RowFilter]) -> pd.DataFrame:
+        """Applies a projection and filters to an in-memory frame."""
+        df = apply_filters(df, filters)
+        return df[columns] if columns is not None else df
+
+    def _read(
+        self,
+        file_uri: str,
+        fingerprint: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[RowFilter]] = None,
+    ) -> pd.DataFrame:
+        """Parses the source file into a DataFrame, bypassing the cache."""
+        storage_opts = self._get_storage_options() if file_uri.startswith("s3://") else None
+        filters = filters or []
+        # Filter columns must be read even when they are not projected
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys(columns + filter_columns(filters)))
+
+        if file_uri.endswith(".parquet"):
+            return pd.read_parquet(
+                file_uri,
+                columns=columns,
+                filters=to_arrow_expression(filters),
+                storage_options=storage_opts,
+            )
+        elif self.csv_engine == "pyarrow":
+            df = self.arrow_reader.read(
+                file_uri, storage_opts, fingerprint,
+                columns=read_columns,
+                row_filter=to_arrow_expression(filters),
+            )
         else:
             # Default to CSV
-            return pd.read_csv(file_uri, storage_options=storage_opts)
+            df = pd.read_csv(file_uri, storage_options=storage_opts, usecols=read_columns)
+            df = apply_filters(df, filters)
+
+        return df[columns] if columns is not None else df
+
+    def iter_chunks(self, file_uri: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Streams a dataset as DataFrame chunks of at most `chunk_rows` rows.
+
+        Only one chunk is held in memory at a time, which lets callers process
+        files larger than RAM. Bypasses the dataset cache.
+        """
+        storage_opts = self._get_storage_options() if file_uri.startswith("s3://") else None
+
+        if file_uri.endswith(".parquet"):
+            import fsspec
+            import pyarrow.parquet as pq
+
+            with fsspec.open(file_uri, "rb", **(storage_opts or {})) as f:
+                for batch in pq.ParquetFile(f).iter_batches(batch_size=chunk_rows):
+                    yield batch.to_pandas()
+        else:
+            with pd.read_csv(file_uri, chunksize=chunk_rows, storage_options=storage_opts) as reader:
+                yield from reader
 
     def save_dataframe(self, df: pd.DataFrame, file_uri: str):
         """
@@ -118,8 +255,10 @@ class PandasDatasetClient(IDatasetRepository):
             ))
 
         # 4. Create Sample Rows (handle NaN values for JSON safety)
-        # replace(float('nan'), None) ensures JSON compatibility
-        sample = df.head(5).replace({float('nan'): None}).to_dict(orient='records')
+        # Masking nulls to None on an object copy ensures JSON compatibility
+        # for both NumPy NaN and Arrow-backed pd.NA
+        head = df.head(5)
+        sample = head.astype(object).where(head.notna(), None).to_dict(orient='records')
 
         return DatasetOverview(
             total_rows=len(df),
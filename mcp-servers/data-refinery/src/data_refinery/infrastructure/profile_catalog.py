@@ -0,0 +1,131 @@
+# region imports
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Domain Imports
+from data_refinery.domain.models.dataset import DatasetOverview
+
+# Infrastructure Imports
+from data_refinery.infrastructure.fingerprint import source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = ".profile.json"
+# Subdirectory of the artifact dir holding profiles of sources the server did not write
+CATALOG_DIR = "profiles"
+
+
+# region profile catalog
+class ProfileCatalog:
+    """
+    Catalog of persisted dataset profiles.
+
+    Each entry holds a dataset's `DatasetOverview` and the source fingerprint
+    it was computed from (local mtime/size or the S3 ETag, which is a content
+    hash). Artifacts written by `clean_dataset` get their entry at write
+    time, and any other dataset on its first inspection, so later
+    `inspect_dataset` calls answer from the catalog instead of re-scanning
+    the data.
+
+    Entries live only under `artifact_dir`, the directory this server writes
+    its results to. A file inside it gets a JSON sidecar
+    (`<path>.profile.json`); any other source (user files, S3 uploads) is
+    never written next to and gets an entry in `<artifact_dir>/profiles/`,
+    keyed by its URI.
+
+    A small in-memory LRU index sits in front of the entries so repeated
+    lookups in one process skip the JSON read as well.
+    """
+
+    def __init__(self, artifact_dir: Optional[str] = None, max_indexed: int = 512):
+        """
+        Args:
+            artifact_dir: The server's artifact directory. Without it, profiles
+                are kept in the in-memory index only.
+            max_indexed: Number of profiles kept in the in-memory index.
+        """
+        self.artifact_dir = Path(artifact_dir).resolve() if artifact_dir else None
+        self.max_indexed = max_indexed
+        self._index: "OrderedDict[str, Tuple[str, DatasetOverview]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry_path(self, file_uri: str) -> Optional[Path]:
+        """Where the profile of `file_uri` is persisted, or None if it is not."""
+        if self.artifact_dir is None:
+            return None
+        if not file_uri.startswith("s3://"):
+            path = Path(file_uri).resolve()
+            if path.is_relative_to(self.artifact_dir):
+                return path.with_name(path.name + SIDECAR_SUFFIX)
+        digest = hashlib.sha256(file_uri.encode("utf-8")).hexdigest()[:32]
+        return self.artifact_dir / CATALOG_DIR / f"{digest}{SIDECAR_SUFFIX}"
+
+    def lookup(self, file_uri: str) -> Optional[DatasetOverview]:
+        """
+        Returns the stored profile if it matches the source's current fingerprint.
+
+        Returns None when there is no entry or the data changed since it was written.
+        """
+        fingerprint = source_fingerprint(file_uri)
+        if fingerprint is None:
+            return None
+
+        with self._lock:
+            entry = self._index.get(file_uri)
+            if entry is not None and entry[0] == fingerprint:
+                self._index.move_to_end(file_uri)
+                return entry[1].model_copy(deep=True)
+
+        path = self._entry_path(file_uri)
+        if path is None:
+            return None
+        try:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+        if stored.get("source_uri") != file_uri or stored.get("fingerprint") != fingerprint:
+            return None
+
+        overview = DatasetOverview.model_validate(stored["overview"])
+        self._remember(file_uri, fingerprint, overview)
+        return overview.model_copy(deep=True)
+
+    def record(self, file_uri: str, overview: DatasetOverview) -> None:
+        """
+        Persists a profile for `file_uri` as computed from its current contents.
+
+        Failures are logged and swallowed: the catalog is an accelerator, never
+        a reason for a tool call to fail.
+        """
+        fingerprint = source_fingerprint(file_uri)
+        if fingerprint is None:
+            return
+
+        # Drop subclass fields (e.g. CleaningResponse.result_uri): only the overview is stored
+        plain = DatasetOverview.model_validate(overview.model_dump())
+        path = self._entry_path(file_uri)
+        if path is not None:
+            payload = json.dumps({
+                "source_uri": file_uri,
+                "fingerprint": fingerprint,
+                "overview": plain.model_dump(mode="json"),
+            })
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(payload, encoding="utf-8")
+            except Exception as e:
+                logger.warning(f"Could not persist profile for {file_uri}: {e}")
+        self._remember(file_uri, fingerprint, plain)
+
+    def _remember(self, file_uri: str, fingerprint: str, overview: DatasetOverview) -> None:
+        with self._lock:
+            self._index[file_uri] = (fingerprint, overview)
+            self._index.move_to_end(file_uri)
+            while len(self._index) > self.max_indexed:
+                self._index.popitem(last=False)
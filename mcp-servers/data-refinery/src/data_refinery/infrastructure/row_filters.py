@@ -0,0 +1,112 @@
+# region imports
+from typing import List, Optional, Sequence
+
+import pandas as pd
+import pyarrow.compute as pc
+
+# Domain Imports
+from data_refinery.domain.interfaces.repository import RowFilter
+
+# Comparison operators accepted in a `(column, op, value)` filter
+COMPARISON_OPS = {"==", "=", "!=", "<", "<=", ">", ">="}
+# Membership operators; the value is a list
+MEMBERSHIP_OPS = {"in", "not in"}
+# Null checks; the value is ignored
+NULL_OPS = {"is null", "not null"}
+FILTER_OPS = COMPARISON_OPS | MEMBERSHIP_OPS | NULL_OPS
+
+
+# region filter helpers
+def validate_filters(filters: Optional[Sequence[RowFilter]]) -> List[RowFilter]:
+    """
+    Normalizes a filter list, raising ValueError on unknown operators.
+
+    Filters are `(column, op, value)` tuples combined with AND.
+    """
+    normalized = []
+    for item in filters or []:
+        if len(item) != 3:
+            raise ValueError(f"Filter must be a (column, op, value) tuple, got: {item!r}")
+        column, op, value = item
+        op = op.strip().lower()
+        if op not in FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator '{op}'. Use one of: {sorted(FILTER_OPS)}")
+        if op in MEMBERSHIP_OPS:
+            value = list(value)
+        normalized.append((column, op, value))
+    return normalized
+
+
+def filter_columns(filters: Sequence[RowFilter]) -> List[str]:
+    """Returns the columns referenced by the filters, in first-use order."""
+    return list(dict.fromkeys(column for column, _, _ in filters))
+
+
+def to_arrow_expression(filters: Sequence[RowFilter]) -> Optional[pc.Expression]:
+    """
+    Compiles filters into a pyarrow expression.
+
+    Passed to the Parquet reader it prunes row groups by their min/max
+    statistics before any data pages are decoded.
+    """
+    expression = None
+    for column, op, value in filters:
+        field = pc.field(column)
+        if op in ("==", "="):
+            term = field == value
+        elif op == "!=":
+            term = field != value
+        elif op == "<":
+            term = field < value
+        elif op == "<=":
+            term = field <= value
+        elif op == ">":
+            term = field > value
+        elif op == ">=":
+            term = field >= value
+        elif op == "in":
+            term = field.isin(value)
+        elif op == "not in":
+            term = ~field.isin(value)
+        elif op == "is null":
+            term = field.is_null()
+        else:  # "not null"
+            term = field.is_valid()
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def apply_filters(df: pd.DataFrame, filters: Sequence[RowFilter]) -> pd.DataFrame:
+    """
+    Applies filters to an in-memory frame.
+
+    Rows where a comparison is null are dropped, matching the Arrow readers.
+    """
+    if not filters:
+        return df
+
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        series = df[column]
+        if op in ("==", "="):
+            term = series == value
+        elif op == "!=":
+            term = (series != value) & series.notna()
+        elif op == "<":
+            term = series < value
+        elif op == "<=":
+            term = series <= value
+        elif op == ">":
+            term = series > value
+        elif op == ">=":
+            term = series >= value
+        elif op == "in":
+            term = series.isin(value)
+        elif op == "not in":
+            term = ~series.isin(value) & series.notna()
+        elif op == "is null":
+            term = series.isna()
+        else:  # "not null"
+            term = series.notna()
+        mask &= term.fillna(False).astype(bool)
+    return df[mask.to_numpy()].reset_index(drop=True)
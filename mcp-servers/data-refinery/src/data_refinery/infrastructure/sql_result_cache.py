@@ -0,0 +1,169 @@
+# region imports
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# model imports
+from data_refinery.domain.models.sql import SQLQueryResponse
+
+# infrastructure imports
+from data_refinery.infrastructure.fingerprint import source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Quoted SQL tokens: '...' string literals and "..." identifiers (doubled quotes escape)
+_QUOTED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+
+# Extensions that mark a string literal as a file reference
+_DATA_EXTENSIONS = (".csv", ".tsv", ".txt", ".parquet", ".json", ".jsonl", ".ndjson", ".gz", ".zst")
+
+# Queries whose result can change without the sources changing are never cached:
+# volatile functions and sampling (USING SAMPLE / TABLESAMPLE / reservoir, bernoulli)
+_NON_DETERMINISTIC = re.compile(
+    r"\b(random|uuid|gen_random_uuid|now|current_date|current_time|current_timestamp|today|setseed"
+    r"|using\s+sample|tablesample|reservoir|bernoulli)\b",
+    re.IGNORECASE,
+)
+
+
+# region SQL helpers
+def normalize_sql(sql_query: str) -> str:
+    """
+    Canonicalizes SQL text for cache keys.
+
+    Whitespace runs outside quoted tokens collapse to one space and trailing
+    semicolons are dropped. Case is preserved: DuckDB names output columns
+    after the expressions as written, so 'SELECT Name' and 'select name'
+    produce different results.
+    """
+    parts = []
+    last = 0
+    for match in _QUOTED.finditer(sql_query):
+        parts.append(re.sub(r"\s+", " ", sql_query[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(re.sub(r"\s+", " ", sql_query[last:]))
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def referenced_sources(sql_query: str) -> List[str]:
+    """Returns every string literal in the query that refers to a data file."""
+    sources = []
+    for match in _QUOTED.finditer(sql_query):
+        token = match.group(0)
+        if not token.startswith("'"):
+            continue
+        literal = token[1:-1].replace("''", "'")
+        if literal.startswith("s3://") or literal.lower().endswith(_DATA_EXTENSIONS) or os.path.isfile(literal):
+            sources.append(literal)
+    return sources
+
+
+# region SQL result cache
+class SQLResultCache:
+    """
+    Persistent index of SQL results keyed by normalized SQL and source fingerprints.
+
+    The index is a small SQLite database next to the artifacts, so hits
+    survive MCP server restarts. It is bounded by entry count with
+    least-recently-used eviction. Evicting an entry only forgets it; the
+    Parquet artifact stays on disk because earlier agent turns may still
+    reference its URI.
+    """
+
+    def __init__(self, index_path: Path, max_entries: int = 1000):
+        """
+        Args:
+            index_path: Location of the SQLite index file.
+            max_entries: Maximum number of cached results. 0 disables caching.
+        """
+        self.index_path = Path(index_path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.max_entries > 0:
+            with self._connect() as db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    " key TEXT PRIMARY KEY,"
+                    " result_uri TEXT NOT NULL,"
+                    " response TEXT NOT NULL,"
+                    " last_used REAL NOT NULL)"
+                )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens the index, commits on success and always closes the handle."""
+        db = sqlite3.connect(self.index_path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def key_for(self, sql_query: str) -> Optional[str]:
+        """
+        Builds the cache key for a query, or None if it must not be cached.
+
+        The key covers the normalized SQL plus the fingerprint of every file
+        it references, so editing a source file invalidates its results.
+        """
+        if self.max_entries <= 0 or _NON_DETERMINISTIC.search(sql_query):
+            return None
+
+        sources = referenced_sources(sql_query)
+        if not sources or any("*" in s or "?" in s for s in sources):
+            # Globs and table-less queries cannot be fingerprinted reliably
+            return None
+
+        fingerprints: Dict[str, str] = {}
+        for source in sources:
+            fingerprint = source_fingerprint(source)
+            if fingerprint is None:
+                return None
+            fingerprints[source] = fingerprint
+
+        payload = json.dumps({"sql": normalize_sql(sql_query), "sources": fingerprints}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[SQLQueryResponse]:
+        """Returns the cached response, or None if missing or its artifact is gone."""
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT result_uri, response FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            result_uri, response = row
+            if not result_uri.startswith("s3://") and not os.path.exists(result_uri):
+                db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            logger.debug(f"SQL result cache hit: {result_uri}")
+            return SQLQueryResponse.model_validate_json(response)
+
+    def put(self, key: str, response: SQLQueryResponse) -> None:
+        """Records a response and trims the index to `max_entries`."""
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO results (key, result_uri, response, last_used) VALUES (?, ?, ?, ?)",
+                (key, response.result_uri, response.model_dump_json(), time.time()),
+            )
+            db.execute(
+                "DELETE FROM results WHERE key NOT IN "
+                "(SELECT key FROM results ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
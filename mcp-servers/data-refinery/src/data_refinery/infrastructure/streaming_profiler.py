@@ -0,0 +1,284 @@
+# region imports
+import math
+import random
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Domain Imports
+from data_refinery.domain.models.dataset import DatasetOverview, ColumnProfile
+
+
+NUMERIC_DTYPES = {
+    "int8", "int16", "int32", "int64",
+    "uint8", "uint16", "uint32", "uint64",
+    "float16", "float32", "float64",
+}
+
+
+# region Welford moments
+class WelfordAccumulator:
+    """
+    Mergeable running count, mean, variance, min and max.
+
+    Each chunk is reduced with vectorized numpy and folded into the running
+    state with Chan et al.'s parallel update, which is numerically stable and
+    lets accumulators from different chunks (or workers) be merged.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """Folds a batch of non-null float values into the running state."""
+        n = len(values)
+        if n == 0:
+            return
+        other = WelfordAccumulator()
+        other.count = n
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other: "WelfordAccumulator") -> None:
+        """Combines another accumulator into this one."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation (ddof=1), matching pandas."""
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+# region KLL quantile sketch
+class KLLSketch:
+    """
+    Mergeable KLL quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Items live in a hierarchy of compactors; an item at level `h` stands for
+    2**h original values. When the sketch grows past its budget, a full
+    compactor is sorted and every other item (random offset) is promoted to
+    the next level. Memory is O(k log(n/k)) regardless of stream length, and
+    rank errors are roughly 1.7/k of n with high probability.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.compactors: List[List[float]] = []
+        self.size = 0
+        self.max_size = 0
+        self.count = 0
+        self._rng = random.Random(seed)
+        self._grow()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _grow(self) -> None:
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _compress(self) -> None:
+        level = 0
+        while self.size >= self.max_size and level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self._grow()
+                items.sort()
+                # An odd leftover stays behind so no weight is lost
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self._rng.randint(0, 1)
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = keep
+                self.size = sum(len(c) for c in self.compactors)
+            level += 1
+
+    def update(self, values: np.ndarray) -> None:
+        """Adds a batch of non-null float values."""
+        if len(values) == 0:
+            return
+        self.compactors[0].extend(values.tolist())
+        self.size += len(values)
+        self.count += len(values)
+        while self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Combines another sketch into this one."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.size = sum(len(c) for c in self.compactors)
+        self.count += other.count
+        while self.size >= self.max_size:
+            self._compress()
+
+    def _weighted(self):
+        values = np.concatenate([np.asarray(c, dtype=float) for c in self.compactors])
+        weights = np.concatenate([np.full(len(c), 2 ** h, dtype=float) for h, c in enumerate(self.compactors)])
+        return values, weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile `q` (0..1)."""
+        if self.count == 0:
+            return None
+        values, weights = self._weighted()
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        cumulative = np.cumsum(weights)
+        idx = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+        return float(values[min(idx, len(values) - 1)])
+
+    def count_below(self, x: float) -> float:
+        """Approximate number of values strictly less than `x`."""
+        values, weights = self._weighted()
+        return float(weights[values < x].sum())
+
+    def count_above(self, x: float) -> float:
+        """Approximate number of values strictly greater than `x`."""
+        values, weights = self._weighted()
+        return float(weights[values > x].sum())
+
+
+# region column accumulator
+class ColumnAccumulator:
+    """Per-column state: null counts, dtype agreement, moments and a quantile sketch."""
+
+    def __init__(self, name: str, sketch_k: int):
+        self.name = name
+        self.null_count = 0
+        self.dtypes: List[np.dtype] = []
+        self.moments = WelfordAccumulator()
+        self.sketch = KLLSketch(k=sketch_k)
+
+    def update(self, series: pd.Series) -> None:
+        nulls = int(series.isnull().sum())
+        self.null_count += nulls
+
+        # An all-null chunk carries no type information (pandas reads it as float64)
+        if nulls < len(series) and series.dtype not in self.dtypes:
+            self.dtypes.append(series.dtype)
+
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.dropna().to_numpy(dtype=float)
+            self.moments.update(values)
+            self.sketch.update(values)
+
+    @property
+    def dtype(self) -> str:
+        """The dtype pandas would infer for the whole column, given each chunk's dtype."""
+        if not self.dtypes:
+            return "float64"
+        if all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d) for d in self.dtypes):
+            return str(np.result_type(*self.dtypes))
+        unique = {str(d) for d in self.dtypes}
+        return unique.pop() if len(unique) == 1 else "object"
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.dtype in NUMERIC_DTYPES
+
+
+# region streaming profiler
+class StreamingProfiler:
+    """
+    Out-of-core dataset profiler.
+
+    Consumes a dataset as a stream of DataFrame chunks and folds each one into
+    mergeable per-column accumulators, so peak memory is bounded by the chunk
+    size rather than the file size.
+
+    Exact: row count, missing percentages, mean, std, min and max.
+    Approximate: IQR outlier counts, derived from a KLL quantile sketch
+    (reported in `DatasetOverview.approximate_stats`).
+    """
+
+    # Fields whose values come from the quantile sketch
+    APPROXIMATE_FIELDS = ["outlier_count"]
+
+    def __init__(self, sketch_k: int = 200):
+        """
+        Args:
+            sketch_k: KLL accuracy parameter; larger is more accurate and uses more memory.
+        """
+        self.sketch_k = sketch_k
+
+    def profile(self, chunks: Iterable[pd.DataFrame]) -> DatasetOverview:
+        """
+        Profiles a stream of DataFrame chunks that share the same columns.
+
+        Args:
+            chunks: e.g. `PandasDatasetClient.iter_chunks(file_uri, chunk_rows)`.
+
+        Returns:
+            DatasetOverview: Same shape as the in-memory engines, with
+            `approximate_stats` listing the estimated fields.
+        """
+        accumulators: List[ColumnAccumulator] = []
+        total_rows = 0
+        sample: List[dict] = []
+
+        for chunk in chunks:
+            if not accumulators:
+                accumulators = [ColumnAccumulator(str(c), self.sketch_k) for c in chunk.columns]
+
+            if len(sample) < 5:
+                head = chunk.head(5 - len(sample))
+                sample += head.astype(object).where(head.notna(), None).to_dict(orient="records")
+
+            total_rows += len(chunk)
+            for acc, col in zip(accumulators, chunk.columns):
+                acc.update(chunk[col])
+
+        columns = []
+        has_numeric = False
+        for acc in accumulators:
+            missing_pct = (acc.null_count / total_rows) * 100 if total_rows > 0 else 0.0
+            profile = ColumnProfile(
+                name=acc.name,
+                data_type=acc.dtype,
+                missing_percentage=round(missing_pct, 2),
+            )
+
+            if acc.is_numeric and acc.moments.count > 0:
+                has_numeric = True
+                profile.mean = acc.moments.mean
+                profile.std = acc.moments.std
+                profile.min = acc.moments.min
+                profile.max = acc.moments.max
+
+                q1 = acc.sketch.quantile(0.25)
+                q3 = acc.sketch.quantile(0.75)
+                iqr = q3 - q1
+                outliers = acc.sketch.count_below(q1 - 1.5 * iqr) + acc.sketch.count_above(q3 + 1.5 * iqr)
+                profile.outlier_count = int(round(outliers))
+
+            columns.append(profile)
+
+        return DatasetOverview(
+            total_rows=total_rows,
+            total_columns=len(accumulators),
+            columns=columns,
+            sample_data=sample,
+            approximate_stats=self.APPROXIMATE_FIELDS if has_numeric else []
+        )
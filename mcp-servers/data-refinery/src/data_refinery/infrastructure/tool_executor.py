@@ -0,0 +1,73 @@
+# region imports
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# region tool executor
+class ToolExecutor:
+    """
+    Runs blocking tool bodies off the MCP server's event loop.
+
+    The MCP session dispatches every request as its own task, but a
+    synchronous tool holds the loop until it returns: one long cleaning job
+    stalls every other request on the session. Tools instead await `run`,
+    which hands the work to a shared worker pool:
+
+    - "thread": a thread pool sharing the process-wide caches and DuckDB
+      connection pool; DuckDB and Arrow release the GIL while they work.
+    - "process": a process pool (spawned, so no forked DuckDB state) for
+      GIL-bound pandas work; each worker builds its own clients and caches,
+      so `fn` must be a picklable module-level function.
+
+    Each tool also gets its own semaphore (`limits`), so e.g. memory-hungry
+    cleaning jobs can be capped below the pool size while cheap inspections
+    keep flowing.
+    """
+
+    def __init__(self, mode: str = "thread", workers: int = 4, limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            mode: "thread" or "process".
+            workers: Size of the shared pool.
+            limits: Maximum concurrent calls per tool name (unlisted: `workers`).
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown tool executor mode '{mode}' (expected 'thread' or 'process')")
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.limits = dict(limits or {})
+        self._pool: Optional[Executor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _ensure_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tool")
+        return self._pool
+
+    def _semaphore(self, tool: str) -> asyncio.Semaphore:
+        if tool not in self._semaphores:
+            limit = self.limits.get(tool, self.workers)
+            self._semaphores[tool] = asyncio.Semaphore(max(1, limit))
+        return self._semaphores[tool]
+
+    async def run(self, tool: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs `fn(*args, **kwargs)` in the pool, within `tool`'s concurrency limit."""
+        async with self._semaphore(tool):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._ensure_pool(), partial(fn, *args, **kwargs))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,50 @@
+"""
+Benchmark: default pandas CSV parsing vs. Arrow-native ingestion.
+
+Scales test/data_sets/store_sales.csv up by repeating its rows and times
+`PandasDatasetClient.load_data` with each CSV engine (caching disabled).
+
+Usage (from mcp-servers/data-refinery/src):
+    PYTHONPATH=. python test/bench_csv_ingestion.py [scale]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from data_refinery.infrastructure.dataset_cache import DatasetCache
+from data_refinery.infrastructure.pandas_client import PandasDatasetClient
+
+SOURCE = Path(__file__).resolve().parents[4] / "test" / "data_sets" / "store_sales.csv"
+
+
+def scaled_copy(scale: int, directory: Path) -> Path:
+    base = pd.read_csv(SOURCE)
+    target = directory / f"store_sales_x{scale}.csv"
+    pd.concat([base] * scale, ignore_index=True).to_csv(target, index=False)
+    return target
+
+
+def bench(engine: str, path: Path, repeats: int = 3):
+    client = PandasDatasetClient(cache=DatasetCache(0), csv_engine=engine)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = client.load_data(str(path))
+        timings.append(time.perf_counter() - start)
+
+    frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    return min(timings), frame_mb
+
+
+if __name__ == "__main__":
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        path = scaled_copy(scale, Path(tmp))
+        size_mb = path.stat().st_size / 1e6
+        print(f"{path.name}: {size_mb:.1f} MB on disk")
+        for engine in ("pandas", "pyarrow"):
+            seconds, frame_mb = bench(engine, path)
+            print(f"{engine:>8}: {seconds:.3f}s  frame {frame_mb:.1f} MB")
@@ -0,0 +1,71 @@
+import pytest
+import pandas as pd
+from data_refinery.domain.models.cleaning import CleaningOptions
+from data_refinery.infrastructure.arrow_csv import ArrowCSVReader
+from data_refinery.infrastructure.dataset_cache import DatasetCache
+from data_refinery.infrastructure.pandas_client import PandasDatasetClient
+
+def test_arrow_engine_matches_default_parser(tmp_path):
+    """Arrow ingestion should read the same values and nulls as pd.read_csv."""
+    path = tmp_path / "data.csv"
+    path.write_text("id,name,score\n1,A,1.5\n2,,NA\n3,C,2.5\n")
+    client = PandasDatasetClient(cache=DatasetCache(0), csv_engine="pyarrow")
+
+    df = client.load_data(str(path))
+    expected = pd.read_csv(path)
+
+    assert df.dtypes.tolist() == expected.dtypes.tolist()
+    assert df.isna().sum().tolist() == expected.isna().sum().tolist()
+    assert df["score"].mean() == expected["score"].mean()
+
+def test_schema_is_cached_per_fingerprint(tmp_path):
+    """The sampled schema is inferred once per source version."""
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,x\n2,y\n")
+    reader = ArrowCSVReader()
+    calls = []
+    original = reader.infer_schema
+    reader.infer_schema = lambda *args: calls.append(args) or original(*args)
+
+    reader.read(str(path), fingerprint="v1")
+    reader.read(str(path), fingerprint="v1")
+    reader.read(str(path), fingerprint="v2")
+
+    assert len(calls) == 2
+
+def test_unrepresentative_sample_falls_back(tmp_path):
+    """If later rows break the sampled types, parsing still succeeds."""
+    path = tmp_path / "data.csv"
+    rows = "\n".join(str(i) for i in range(50_000))
+    path.write_text(f"a\n{rows}\n3.5\n")
+    reader = ArrowCSVReader(sample_bytes=1024)
+
+    df = reader.read(str(path), fingerprint="v1")
+
+    assert len(df) == 50_001
+    assert df["a"].iloc[-1] == 3.5
+
+@pytest.mark.parametrize("strategies", [
+    {"qty": "mean", "score": "mean"},
+    {"qty": "mode", "name": "mode", "active": "mode"},
+    {"qty": "unknown", "name": "unknown", "joined": "unknown"},
+])
+def test_cleaning_matches_across_engines(tmp_path, strategies):
+    """Fill values and reported data types must not depend on the CSV engine."""
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "qty,score,name,active,joined\n"
+        "1,1.5,b,true,2024-01-01\n"
+        ",,,,\n"
+        "2,2.5,a,false,2024-01-03\n"
+        "2,4.0,b,true,2024-01-04\n"
+    )
+    options = CleaningOptions(strategies=strategies)
+    results = []
+    for engine in ("pandas", "pyarrow"):
+        client = PandasDatasetClient(cache=DatasetCache(0), csv_engine=engine)
+        results.append(client.clean_dataset(client.load_data(str(path)), options))
+
+    (expected, expected_report), (actual, actual_report) = results
+    pd.testing.assert_frame_equal(actual, expected)
+    assert [c.data_type for c in actual_report.columns] == [c.data_type for c in expected_report.columns]
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_refinery.infrastructure.duckdb_client import DuckDBClient
+from data_refinery.infrastructure.chart_aggregator import ChartAggregator, lttb
+
+@pytest.fixture
+def charts(tmp_path):
+    return ChartAggregator(DuckDBClient(artifact_dir=str(tmp_path / "artifacts")), max_points=50, max_categories=5)
+
+@pytest.fixture
+def sales_file(tmp_path):
+    n = 5_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "day": pd.date_range("2024-01-01", periods=n, freq="h"),
+        "store": [f"s{i % 8}" for i in range(n)],
+        "sales": rng.normal(100, 5, n),
+        "units": rng.normal(10, 1, n),
+    })
+    df.loc[1234, "sales"] = 1_000.0  # a spike a downsampler must not lose
+    df.loc[4321, ["sales", "units"]] = [-500.0, 50.0]  # an isolated scatter outlier
+    path = tmp_path / "sales.parquet"
+    df.to_parquet(path)
+    return str(path), df
+
+def test_lttb_keeps_endpoints_and_target_size():
+    x = np.arange(1_000, dtype=float)
+    y = np.sin(x / 20)
+    kept = lttb(x, y, 100)
+
+    assert len(kept) == 100
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+
+def test_bar_aggregates_every_row(charts, sales_file):
+    """Bars are sums over the whole file, limited to the largest categories."""
+    path, df = sales_file
+    spec = charts.build(path, "bar", "store", "sales")
+
+    expected = df.groupby("store")["sales"].sum().sort_values(ascending=False).head(5)
+    assert len(spec["data"]) == 5
+    assert {p["store"]: round(p["sales"], 6) for p in spec["data"]} == {k: round(v, 6) for k, v in expected.items()}
+    assert spec["total_rows"] == len(df)
+
+def test_pie_counts_rows_and_folds_the_rest(charts, sales_file):
+    path, df = sales_file
+    spec = charts.build(path, "pie", "store")
+
+    assert spec["y_column"] == "count"
+    assert spec["data"][-1]["store"] == "Other"
+    assert sum(p["count"] for p in spec["data"]) == len(df)
+
+def test_line_downsampling_keeps_peaks(charts, sales_file):
+    path, df = sales_file
+    spec = charts.build(path, "line", "day", "sales")
+
+    values = [p["sales"] for p in spec["data"]]
+    days = [p["day"] for p in spec["data"]]
+    assert len(values) == 50
+    assert max(values) == df["sales"].max()
+    assert min(values) == df["sales"].min()
+    assert days == sorted(days)
+
+def test_scatter_sample_keeps_sparse_regions(charts, sales_file):
+    path, _ = sales_file
+    spec = charts.build(path, "scatter", "units", "sales")
+
+    assert spec["downsampling"]["method"] == "stratified_sample"
+    assert len(spec["data"]) <= 50
+    assert {"units": 50.0, "sales": -500.0} in spec["data"]
+
+def test_frame_source_matches_file_source(charts, sales_file):
+    path, df = sales_file
+    from_file = charts.build(path, "bar", "store", "sales")
+    from_frame = charts.build_from_frame(df, "bar", "store", "sales")
+
+    assert from_frame["data"] == from_file["data"]
+
+def test_invalid_requests_raise_value_error(charts, sales_file):
+    path, _ = sales_file
+    with pytest.raises(ValueError):
+        charts.build(path, "histogram", "store")
+    with pytest.raises(ValueError):
+        charts.build(path, "bar", "missing")
+    with pytest.raises(ValueError):
+        charts.build(path, "line", "day", "store")
@@ -0,0 +1,62 @@
+import os
+import pandas as pd
+from data_refinery.infrastructure.dataset_cache import DatasetCache
+from data_refinery.infrastructure.pandas_client import PandasDatasetClient
+
+def test_load_data_hits_cache_on_repeat(tmp_path):
+    """Repeat loads of an unchanged file should be served from the cache."""
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(path, index=False)
+    client = PandasDatasetClient(cache=DatasetCache(max_bytes=10 * 1024 * 1024))
+
+    first = client.load_data(str(path))
+    second = client.load_data(str(path))
+
+    assert first.equals(second)
+    assert client.cache.hits == 1
+    assert client.cache.misses == 1
+
+def test_load_data_misses_when_file_changes(tmp_path):
+    """A changed fingerprint (mtime/size) must invalidate the cached frame."""
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(path, index=False)
+    client = PandasDatasetClient(cache=DatasetCache(max_bytes=10 * 1024 * 1024))
+    client.load_data(str(path))
+
+    pd.DataFrame({"a": [1, 2, 3, 4]}).to_csv(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = client.load_data(str(path))
+    assert len(reloaded) == 4
+    assert client.cache.misses == 2
+
+def test_cached_frame_is_isolated_from_caller_mutations(tmp_path):
+    """Tools mutate loaded frames (e.g. header normalization); the cache must not see it."""
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"First Name": ["A", None]}).to_csv(path, index=False)
+    client = PandasDatasetClient(cache=DatasetCache(max_bytes=10 * 1024 * 1024))
+
+    df = client.load_data(str(path))
+    df.columns = ["first_name"]
+    df["first_name"] = df["first_name"].fillna("Unknown")
+
+    again = client.load_data(str(path))
+    assert list(again.columns) == ["First Name"]
+    assert again["First Name"].isna().sum() == 1
+
+def test_lru_eviction_respects_budget():
+    """Least-recently-used frames are evicted once the memory budget is exceeded."""
+    df = pd.DataFrame({"a": range(1000)})
+    size = int(df.memory_usage(deep=True).sum())
+    cache = DatasetCache(max_bytes=size * 2)
+
+    cache.put("one", "fp", df)
+    cache.put("two", "fp", df)
+    cache.get("one", "fp")          # 'one' is now most recently used
+    cache.put("three", "fp", df)    # evicts 'two'
+
+    assert cache.get("two", "fp") is None
+    assert cache.get("one", "fp") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.current_bytes <= cache.max_bytes
@@ -0,0 +1,107 @@
+import pytest
+from pathlib import Path
+import pandas as pd
+from data_refinery.domain.models.cleaning import CleaningOptions, DateColumnConfig
+from data_refinery.infrastructure.duckdb_client import DuckDBClient
+from data_refinery.infrastructure.duckdb_cleaner import DuckDBCleaningEngine, normalize_header
+from data_refinery.infrastructure.duckdb_profiler import DuckDBProfiler
+from data_refinery.infrastructure.pandas_client import PandasDatasetClient
+
+DATA_SETS = Path(__file__).resolve().parents[4] / "test" / "data_sets"
+
+@pytest.fixture
+def cleaner(tmp_path):
+    db = DuckDBClient(artifact_dir=str(tmp_path / "artifacts"))
+    return DuckDBCleaningEngine(db, DuckDBProfiler(db))
+
+def test_normalize_header_matches_pandas_rules():
+    assert normalize_header("  First Name ") == "first_name"
+    assert normalize_header("Salary ($)") == "salary_"
+
+def test_sql_engine_matches_pandas_engine(tmp_path, cleaner):
+    """The compiled query should produce the same frame as the pandas engine."""
+    source = tmp_path / "raw.csv"
+    pd.DataFrame({
+        "Full Name": ["A", None, "C", "D", "E"],
+        "Age": [30, None, 50, None, 20],
+        "Dept": ["x", "y", None, "y", None],
+        "Bonus": [1.5, None, 2.5, 3.0, None],
+        "Joined At": ["2023-01-15", "2023-02-01", None, "2023-03-05", "2023-04-12"],
+    }).to_csv(source, index=False)
+    options = CleaningOptions(
+        normalize_headers=True,
+        strategies={"full_name": "drop", "age": "mean", "dept": "mode", "bonus": "zero"},
+        date_columns=[DateColumnConfig(column_name="joined_at", output_format="%d/%m/%Y")],
+    )
+
+    expected, _ = PandasDatasetClient().clean_dataset(pd.read_csv(source), options)
+    output = tmp_path / "cleaned.parquet"
+    overview = cleaner.clean(str(source), options, str(output))
+    actual = pd.read_parquet(output)
+
+    assert list(actual.columns) == list(expected.columns)
+    assert overview.total_rows == len(expected) == 4
+    # mean is computed after the preceding 'drop', like pandas
+    assert actual["age"].tolist() == pytest.approx(expected["age"].tolist())
+    assert actual["dept"].tolist() == expected["dept"].tolist()
+    assert actual["bonus"].tolist() == expected["bonus"].tolist()
+    assert actual["joined_at"].tolist()[0] == "15/01/2023"
+    assert actual["joined_at"].isna().sum() == 1
+
+def test_unknown_strategy_fills_text(tmp_path, cleaner):
+    source = tmp_path / "raw.csv"
+    pd.DataFrame({"city": ["Paris", None], "n": [1, 2]}).to_csv(source, index=False)
+
+    output = tmp_path / "cleaned.parquet"
+    cleaner.clean(str(source), CleaningOptions(strategies={"city": "unknown"}), str(output))
+
+    assert pd.read_parquet(output)["city"].tolist() == ["Paris", "Unknown"]
+
+def test_mode_ties_match_pandas(tmp_path, cleaner):
+    """On a tie, mode picks the smallest value, like pandas' mode()[0]."""
+    source = tmp_path / "raw.csv"
+    pd.DataFrame({
+        "grade": ["b", "a", "b", "a", None, "c"],
+        "level": [3, 1, 3, 1, 2, None],
+    }).to_csv(source, index=False)
+    options = CleaningOptions(strategies={"grade": "mode", "level": "mode"})
+
+    expected, _ = PandasDatasetClient().clean_dataset(pd.read_csv(source), options)
+    output = tmp_path / "cleaned.parquet"
+    cleaner.clean(str(source), options, str(output))
+    actual = pd.read_parquet(output)
+
+    assert len(actual) == len(expected) == 6
+    assert actual["grade"].tolist()[4] == expected["grade"].tolist()[4] == "a"
+    assert actual["level"].tolist()[5] == expected["level"].tolist()[5] == 1
+    pd.testing.assert_frame_equal(actual, expected.reset_index(drop=True))
+
+def test_mode_only_fills_keep_row_count(tmp_path, cleaner):
+    """Mode fills alone must not multiply rows through the aggregate join."""
+    source = tmp_path / "raw.csv"
+    pd.DataFrame({"age": [30, None, 50], "dept": ["x", None, "x"]}).to_csv(source, index=False)
+    options = CleaningOptions(strategies={"age": "zero", "dept": "mode"})
+
+    expected, _ = PandasDatasetClient().clean_dataset(pd.read_csv(source), options)
+    output = tmp_path / "cleaned.parquet"
+    cleaner.clean(str(source), options, str(output))
+
+    pd.testing.assert_frame_equal(pd.read_parquet(output), expected.reset_index(drop=True))
+
+def test_engines_agree_on_unclean_data(tmp_path, cleaner):
+    """Mixed date formats, 'NULL' markers and drops clean the same under both engines."""
+    source = DATA_SETS / "unclean_data.csv"
+    options = CleaningOptions(
+        normalize_headers=True,
+        strategies={"full_name": "drop", "age": "mean", "department": "mode", "email": "unknown", "salary": "mode"},
+        date_columns=[DateColumnConfig(column_name="join_date", output_format="%d/%m/%Y")],
+    )
+
+    expected, _ = PandasDatasetClient().clean_dataset(pd.read_csv(source), options)
+    output = tmp_path / "cleaned.parquet"
+    cleaner.clean(str(source), options, str(output))
+    actual = pd.read_parquet(output)
+
+    # '01/16/2023' does not match the format guessed from '2023-01-15': NaT in both
+    assert actual["join_date"].isna().sum() == 2
+    pd.testing.assert_frame_equal(actual, expected.reset_index(drop=True))
@@ -0,0 +1,66 @@
+import pytest
+import pandas as pd
+from data_refinery.infrastructure.duckdb_client import DuckDBClient
+from data_refinery.infrastructure.duckdb_pool import DuckDBConnectionPool
+
+def test_pool_configures_root_once():
+    """Setup (extensions, S3, limits) should run once, not per checkout."""
+    calls = []
+    pool = DuckDBConnectionPool(size=2, threads=2, memory_limit="512MB", configure=calls.append)
+
+    for _ in range(5):
+        with pool.acquire() as cursor:
+            threads = cursor.sql("SELECT current_setting('threads')").fetchone()[0]
+
+    assert len(calls) == 1
+    assert threads == 2
+    pool.close()
+
+def test_pool_replaces_failed_cursors():
+    """A cursor that raised must not be handed out again."""
+    pool = DuckDBConnectionPool(size=1)
+
+    with pytest.raises(Exception):
+        with pool.acquire() as cursor:
+            failed = cursor
+            cursor.execute("SELECT * FROM missing_table")
+
+    with pool.acquire() as cursor:
+        assert cursor is not failed
+        assert cursor.sql("SELECT 1").fetchone()[0] == 1
+    pool.close()
+
+def test_execute_and_write_uses_pool(tmp_path):
+    """SQL tool calls should run on pooled cursors and still write artifacts."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}).to_csv(source, index=False)
+    db = DuckDBClient(artifact_dir=str(tmp_path / "artifacts"), pool=DuckDBConnectionPool(size=1))
+
+    first = db.execute_and_write(f"SELECT * FROM '{source}' WHERE a > 1")
+    second = db.execute_and_write(f"SELECT count(*) AS n FROM '{source}'")
+
+    assert first.total_rows == 2
+    assert first.sample_data[0] == {"a": 2, "b": "y"}
+    assert second.sample_data == [{"n": 3}]
+
+def test_execute_and_write_cannot_leak_state(tmp_path):
+    """A CREATE or SET in one SQL call must not be visible to the next."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(source, index=False)
+    db = DuckDBClient(artifact_dir=str(tmp_path / "artifacts"), pool=DuckDBConnectionPool(size=1))
+    with db.connection() as cursor:
+        memory_limit = cursor.sql("SELECT current_setting('memory_limit')").fetchone()[0]
+
+    for sql in (
+        f"CREATE TABLE leaked AS SELECT 42 AS x; SET memory_limit='10MB'; SELECT * FROM '{source}'",
+        "CREATE TABLE leaked AS SELECT 42 AS x",
+        "SET memory_limit='10MB'",
+        "INSTALL spatial",
+    ):
+        with pytest.raises(ValueError):
+            db.execute_and_write(sql)
+
+    with db.connection() as cursor:
+        assert cursor.sql("SELECT current_setting('memory_limit')").fetchone()[0] == memory_limit
+        assert cursor.sql("SELECT count(*) FROM duckdb_tables() WHERE table_name = 'leaked'").fetchone()[0] == 0
+    assert db.execute_and_write(f"SELECT * FROM '{source}'").total_rows == 3
@@ -0,0 +1,87 @@
+import pytest
+from pathlib import Path
+import pandas as pd
+from data_refinery.infrastructure.duckdb_client import DuckDBClient
+from data_refinery.infrastructure.duckdb_profiler import DuckDBProfiler, _pandas_dtype_name
+from data_refinery.infrastructure.pandas_client import PandasDatasetClient
+
+DATA_SETS = Path(__file__).resolve().parents[4] / "test" / "data_sets"
+
+@pytest.fixture
+def profiler(tmp_path):
+    return DuckDBProfiler(DuckDBClient(artifact_dir=str(tmp_path / "artifacts")))
+
+def test_profile_matches_pandas_analyze(tmp_path, profiler):
+    """The DuckDB profiler should report the same stats as the pandas engine."""
+    path = tmp_path / "data.csv"
+    pd.DataFrame({
+        "age": [10, 20, 30, 40, 1000],
+        "score": [1.5, None, 3.5, None, 2.0],
+        "name": ["A", "B", None, "D", "E"],
+    }).to_csv(path, index=False)
+
+    expected = PandasDatasetClient().analyze(pd.read_csv(path))
+    actual = profiler.profile(str(path))
+
+    assert actual.total_rows == expected.total_rows
+    assert actual.total_columns == expected.total_columns
+    for got, want in zip(actual.columns, expected.columns):
+        assert got.name == want.name
+        assert got.data_type == want.data_type
+        assert got.missing_percentage == want.missing_percentage
+        assert got.outlier_count == want.outlier_count
+        for stat in ("mean", "std", "min", "max"):
+            assert getattr(got, stat) == pytest.approx(getattr(want, stat))
+
+def test_profile_sample_is_json_safe(tmp_path, profiler):
+    """Sample rows should be limited to 5 and contain None instead of NaN."""
+    path = tmp_path / "data.parquet"
+    pd.DataFrame({"val": [float("nan")] + list(range(9))}).to_parquet(path)
+
+    overview = profiler.profile(str(path))
+
+    assert len(overview.sample_data) == 5
+    assert overview.sample_data[0]["val"] is None
+    assert overview.columns[0].missing_percentage == 10.0
+
+def test_profile_data_types_match_pandas(tmp_path, profiler):
+    """data_type should not depend on the engine: nullable ints, dates and booleans."""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text(
+        "id,joined,active,flag,name\n"
+        "1,2024-01-01,true,true,a\n"
+        ",2024-01-02,false,,b\n"
+        "3,2024-01-03,true,false,c\n"
+    )
+    parquet_path = tmp_path / "data.parquet"
+    pd.read_csv(csv_path).assign(
+        joined=lambda df: pd.to_datetime(df["joined"]),
+        big=[1, 2, 3],
+    ).to_parquet(parquet_path)
+
+    for path, read in ((csv_path, pd.read_csv), (parquet_path, pd.read_parquet)):
+        expected = {name: str(dtype) for name, dtype in read(path).dtypes.items()}
+        actual = {c.name: c.data_type for c in profiler.profile(str(path)).columns}
+        assert actual == expected
+
+    sample = profiler.profile(str(csv_path)).sample_data
+    assert [row["joined"] for row in sample] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+def test_hugeint_is_not_reported_as_int64():
+    """128-bit integers do not fit int64 and reach pandas as doubles."""
+    assert _pandas_dtype_name("HUGEINT", has_nulls=False, from_csv=False) == "float64"
+    assert _pandas_dtype_name("UHUGEINT", has_nulls=False, from_csv=False) == "float64"
+
+def test_profile_matches_pandas_on_unclean_data(profiler):
+    """NA markers such as 'NULL' count as missing, and CSV dates are sampled as text."""
+    path = DATA_SETS / "unclean_data.csv"
+
+    expected = PandasDatasetClient().analyze(pd.read_csv(path))
+    actual = profiler.profile(str(path))
+
+    assert actual.total_rows == expected.total_rows
+    for got, want in zip(actual.columns, expected.columns):
+        assert (got.name, got.data_type, got.missing_percentage) == (want.name, want.data_type, want.missing_percentage)
+        for stat in ("mean", "std", "min", "max"):
+            assert getattr(got, stat) == pytest.approx(getattr(want, stat))
+    assert actual.sample_data == expected.sample_data
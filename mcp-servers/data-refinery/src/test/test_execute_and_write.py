@@ -0,0 +1,27 @@
+import pandas as pd
+from data_refinery.infrastructure.duckdb_client import DuckDBClient
+
+def test_execute_and_write_reads_shape_from_artifact(tmp_path):
+    """Shape and sample are taken from the written Parquet file."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"store": [1, 1, 2, 2, 3, 3, 4], "sales": range(7)}).to_csv(source, index=False)
+    db = DuckDBClient(artifact_dir=str(tmp_path / "artifacts"))
+
+    response = db.execute_and_write(f"SELECT * FROM '{source}' ORDER BY sales DESC")
+
+    written = pd.read_parquet(response.result_uri)
+    assert response.total_rows == len(written) == 7
+    assert response.total_columns == 2
+    assert response.sample_data == written.head(5).to_dict(orient="records")
+
+def test_execute_and_write_handles_empty_result(tmp_path):
+    """A query with no rows still returns its column count and an empty sample."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1], "b": [2]}).to_csv(source, index=False)
+    db = DuckDBClient(artifact_dir=str(tmp_path / "artifacts"))
+
+    response = db.execute_and_write(f"SELECT * FROM '{source}' WHERE a > 100")
+
+    assert response.total_rows == 0
+    assert response.total_columns == 2
+    assert response.sample_data == []
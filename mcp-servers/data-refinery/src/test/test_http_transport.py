@@ -0,0 +1,24 @@
+from starlette.testclient import TestClient
+from data_refinery.application.server import create_http_app
+
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+
+def _rpc(client, method, params, request_id):
+    response = client.post("/mcp", headers=HEADERS, json={"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+    assert response.status_code == 200, response.text
+    return response.json()["result"]
+
+def test_http_app_serves_stateless_json_requests():
+    """Each request stands alone (no session id) and gets a plain JSON reply."""
+    with TestClient(create_http_app(), base_url="http://127.0.0.1:8050") as client:
+        init = _rpc(client, "initialize", {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": "test", "version": "0"},
+        }, 1)
+        tools = _rpc(client, "tools/list", {}, 2)["tools"]
+
+    assert init["serverInfo"]["name"] == "data-refinery"
+    annotations = {tool["name"]: (tool.get("annotations") or {}) for tool in tools}
+    assert annotations["inspect_dataset"]["readOnlyHint"] is True
+    assert "run_sql_query" in annotations
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+from data_refinery.infrastructure.dataset_cache import DatasetCache
+from data_refinery.infrastructure.pandas_client import PandasDatasetClient
+
+def _frame():
+    return pd.DataFrame({
+        "id": range(10),
+        "region": ["north", "south"] * 5,
+        "sales": [float(i) if i != 3 else None for i in range(10)],
+        "notes": ["x"] * 10,
+    })
+
+def test_parquet_projection_and_filters(tmp_path):
+    """Only requested columns are returned and filter columns need not be projected."""
+    path = tmp_path / "data.parquet"
+    _frame().to_parquet(path, row_group_size=2)
+    client = PandasDatasetClient(cache=DatasetCache(0))
+
+    df = client.load_data(str(path), columns=["id"], filters=[("sales", ">=", 6), ("region", "==", "north")])
+
+    assert list(df.columns) == ["id"]
+    assert df["id"].tolist() == [6, 8]
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_csv_projection_and_filters(tmp_path, engine):
+    """Both CSV engines honour projections, null checks and membership filters."""
+    path = tmp_path / "data.csv"
+    _frame().to_csv(path, index=False)
+    client = PandasDatasetClient(cache=DatasetCache(0), csv_engine=engine)
+
+    df = client.load_data(str(path), columns=["sales", "id"], filters=[("sales", "not null", None), ("id", "in", [1, 2, 3, 4])])
+
+    assert list(df.columns) == ["sales", "id"]
+    assert df["id"].tolist() == [1, 2, 4]
+
+def test_projection_served_from_cached_full_frame(tmp_path):
+    """A projected load reuses an already cached full frame instead of re-reading."""
+    path = tmp_path / "data.csv"
+    _frame().to_csv(path, index=False)
+    client = PandasDatasetClient(cache=DatasetCache(64 * 1024 * 1024))
+    client.load_data(str(path))
+
+    reads = []
+    original = client._read
+    client._read = lambda *args: reads.append(args) or original(*args)
+    df = client.load_data(str(path), columns=["region"], filters=[("id", "<", 2)])
+
+    assert reads == []
+    assert df["region"].tolist() == ["north", "south"]
+
+def test_list_columns_reads_header_only(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    parquet_path = tmp_path / "data.parquet"
+    _frame().to_csv(csv_path, index=False)
+    _frame().to_parquet(parquet_path)
+    client = PandasDatasetClient(cache=DatasetCache(0))
+
+    assert client.list_columns(str(csv_path)) == ["id", "region", "sales", "notes"]
+    assert client.list_columns(str(parquet_path)) == ["id", "region", "sales", "notes"]
+
+def test_unknown_filter_operator_is_rejected(tmp_path):
+    path = tmp_path / "data.csv"
+    _frame().to_csv(path, index=False)
+    client = PandasDatasetClient(cache=DatasetCache(0))
+
+    with pytest.raises(ValueError):
+        client.load_data(str(path), filters=[("id", "like", "1%")])
@@ -0,0 +1,60 @@
+import os
+import pandas as pd
+from data_refinery.domain.models.cleaning import CleaningResponse
+from data_refinery.infrastructure.pandas_client import PandasDatasetClient
+from data_refinery.infrastructure.profile_catalog import CATALOG_DIR, ProfileCatalog, SIDECAR_SUFFIX
+
+def _write(path, values):
+    pd.DataFrame({"a": values}).to_parquet(path)
+
+def test_sidecar_round_trip_across_instances(tmp_path):
+    """A recorded profile is served from the sidecar, even by a fresh catalog."""
+    path = tmp_path / "result.parquet"
+    _write(path, [1, 2, 3])
+    overview = PandasDatasetClient().analyze(pd.read_parquet(path))
+
+    ProfileCatalog(artifact_dir=str(tmp_path)).record(str(path), overview)
+
+    assert os.path.exists(str(path) + SIDECAR_SUFFIX)
+    restored = ProfileCatalog(artifact_dir=str(tmp_path)).lookup(str(path))
+    assert restored == overview
+
+def test_external_sources_get_no_sidecar(tmp_path):
+    """Inputs outside the artifact dir are profiled into the catalog dir, never written next to."""
+    source_dir, artifact_dir = tmp_path / "user", tmp_path / "artifacts"
+    source_dir.mkdir()
+    path = source_dir / "input.parquet"
+    _write(path, [1, 2, 3])
+    overview = PandasDatasetClient().analyze(pd.read_parquet(path))
+
+    ProfileCatalog(artifact_dir=str(artifact_dir)).record(str(path), overview)
+
+    assert os.listdir(source_dir) == ["input.parquet"]
+    assert len(os.listdir(artifact_dir / CATALOG_DIR)) == 1
+    assert ProfileCatalog(artifact_dir=str(artifact_dir)).lookup(str(path)) == overview
+
+def test_stale_sidecar_is_ignored(tmp_path):
+    """If the artifact changes after profiling, the sidecar must not be used."""
+    path = tmp_path / "result.parquet"
+    _write(path, [1, 2, 3])
+    catalog = ProfileCatalog(artifact_dir=str(tmp_path))
+    catalog.record(str(path), PandasDatasetClient().analyze(pd.read_parquet(path)))
+
+    _write(path, [1, 2, 3, 4])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert catalog.lookup(str(path)) is None
+    assert ProfileCatalog(artifact_dir=str(tmp_path)).lookup(str(path)) is None
+
+def test_record_strips_response_fields(tmp_path):
+    """Cleaning responses are stored as plain DatasetOverview profiles."""
+    path = tmp_path / "cleaned.parquet"
+    _write(path, [1.0, None])
+    overview = PandasDatasetClient().analyze(pd.read_parquet(path))
+    response = CleaningResponse(status=True, result_uri=str(path), **overview.model_dump())
+
+    catalog = ProfileCatalog()
+    catalog.record(str(path), response)
+
+    assert type(catalog.lookup(str(path))).__name__ == "DatasetOverview"
@@ -0,0 +1,79 @@
+import os
+import pandas as pd
+from data_refinery.infrastructure.duckdb_client import DuckDBClient
+from data_refinery.infrastructure.sql_result_cache import SQLResultCache, normalize_sql, referenced_sources
+
+def test_normalize_sql_collapses_whitespace_outside_literals():
+    """Whitespace-only differences normalize to the same text; literals are untouched."""
+    a = "SELECT  a,\n  b FROM 'my  file.csv'  WHERE c = 'x  y';"
+    b = "SELECT a, b FROM 'my  file.csv' WHERE c = 'x  y'"
+    assert normalize_sql(a) == normalize_sql(b) == b
+
+def test_referenced_sources_ignores_plain_literals(tmp_path):
+    """Only literals that look like data files count as sources."""
+    sql = "SELECT * FROM 's3://bucket/data.csv' WHERE d > '2023/01/01' AND name = 'x'"
+    assert referenced_sources(sql) == ["s3://bucket/data.csv"]
+
+def test_repeat_query_returns_cached_artifact(tmp_path):
+    """Re-issuing the same SQL should return the existing result_uri without a new file."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(source, index=False)
+    artifacts = tmp_path / "artifacts"
+    db = DuckDBClient(artifact_dir=str(artifacts))
+
+    first = db.execute_and_write(f"SELECT * FROM '{source}' WHERE a > 1")
+    second = db.execute_and_write(f"SELECT *\n  FROM '{source}'   WHERE a > 1;")
+
+    assert second == first
+    assert db.result_cache.hits == 1
+    assert len(list(artifacts.glob("result_*.parquet"))) == 1
+
+def test_cache_survives_restart_and_invalidates_on_change(tmp_path):
+    """The index persists across clients, and editing the source forces a recompute."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(source, index=False)
+    artifacts = tmp_path / "artifacts"
+    sql = f"SELECT count(*) AS n FROM '{source}'"
+
+    first = DuckDBClient(artifact_dir=str(artifacts)).execute_and_write(sql)
+    restarted = DuckDBClient(artifact_dir=str(artifacts))
+    assert restarted.execute_and_write(sql).result_uri == first.result_uri
+
+    pd.DataFrame({"a": [1, 2, 3, 4]}).to_csv(source, index=False)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    changed = restarted.execute_and_write(sql)
+    assert changed.result_uri != first.result_uri
+    assert changed.sample_data == [{"n": 4}]
+
+def test_index_is_bounded(tmp_path):
+    """Old entries are evicted once max_entries is exceeded."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(source, index=False)
+    cache = SQLResultCache(tmp_path / "index.sqlite", max_entries=2)
+    db = DuckDBClient(artifact_dir=str(tmp_path / "artifacts"), result_cache=cache)
+
+    for limit in (1, 2, 3):
+        db.execute_and_write(f"SELECT * FROM '{source}' LIMIT {limit}")
+
+    assert cache.get(cache.key_for(f"SELECT * FROM '{source}' LIMIT 1")) is None
+    assert cache.get(cache.key_for(f"SELECT * FROM '{source}' LIMIT 3")) is not None
+
+def test_sampled_queries_are_not_cached(tmp_path):
+    """Sampling returns different rows per run, so it must never replay a stored result."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"a": range(100)}).to_csv(source, index=False)
+    db = DuckDBClient(artifact_dir=str(tmp_path / "artifacts"))
+
+    for sql in (
+        f"SELECT * FROM '{source}' USING SAMPLE 10",
+        f"SELECT * FROM '{source}' USING SAMPLE 10% (bernoulli)",
+        f"SELECT * FROM '{source}' TABLESAMPLE reservoir(5 ROWS)",
+        f"SELECT * FROM '{source}' USING   SAMPLE reservoir(5 ROWS) REPEATABLE (42)",
+    ):
+        assert db.result_cache.key_for(sql) is None
+        db.execute_and_write(sql)
+        db.execute_and_write(sql)
+
+    assert db.result_cache.hits == 0
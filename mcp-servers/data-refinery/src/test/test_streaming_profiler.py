@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+import pandas as pd
+from data_refinery.infrastructure.pandas_client import PandasDatasetClient
+from data_refinery.infrastructure.streaming_profiler import KLLSketch, StreamingProfiler, WelfordAccumulator
+
+def test_welford_merge_matches_numpy():
+    """Merged chunk moments should equal the moments of the whole array."""
+    rng = np.random.default_rng(0)
+    data = rng.normal(50, 10, 10_000)
+
+    acc = WelfordAccumulator()
+    for chunk in np.array_split(data, 7):
+        acc.update(chunk)
+
+    assert acc.count == len(data)
+    assert acc.mean == pytest.approx(data.mean())
+    assert acc.std == pytest.approx(data.std(ddof=1))
+    assert acc.min == data.min()
+    assert acc.max == data.max()
+
+def test_kll_sketch_quantiles_are_close():
+    """Sketch quartiles should be within a small rank error of the exact ones."""
+    data = np.random.default_rng(1).uniform(0, 1, 200_000)
+    sketch = KLLSketch(k=200, seed=42)
+    for chunk in np.array_split(data, 20):
+        sketch.update(chunk)
+
+    assert sketch.size < 2_000  # memory stays bounded
+    assert sketch.quantile(0.25) == pytest.approx(0.25, abs=0.02)
+    assert sketch.quantile(0.75) == pytest.approx(0.75, abs=0.02)
+
+def test_streaming_profile_matches_in_memory(tmp_path):
+    """Chunked profiling should agree with analyze(); only outliers are approximate."""
+    path = tmp_path / "data.csv"
+    rng = np.random.default_rng(2)
+    values = rng.normal(0, 1, 5_000)
+    values[::500] = 50.0  # 10 obvious outliers
+    df = pd.DataFrame({
+        "value": values,
+        "count": rng.integers(0, 100, 5_000),
+        "label": ["x", None] * 2_500,
+    })
+    df.to_csv(path, index=False)
+
+    client = PandasDatasetClient()
+    expected = client.analyze(pd.read_csv(path))
+    actual = StreamingProfiler().profile(client.iter_chunks(str(path), chunk_rows=700))
+
+    assert actual.total_rows == expected.total_rows
+    assert actual.approximate_stats == ["outlier_count"]
+    assert actual.sample_data[1]["label"] is None
+    for got, want in zip(actual.columns, expected.columns):
+        assert got.data_type == want.data_type
+        assert got.missing_percentage == want.missing_percentage
+        for stat in ("mean", "std", "min", "max"):
+            assert getattr(got, stat) == pytest.approx(getattr(want, stat))
+
+    value_col = actual.columns[0]
+    assert value_col.outlier_count == pytest.approx(expected.columns[0].outlier_count, abs=25)
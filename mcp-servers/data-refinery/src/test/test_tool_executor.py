@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+import pytest
+from data_refinery.infrastructure.tool_executor import ToolExecutor
+
+def _square(x):
+    return x * x
+
+def _fail():
+    raise ValueError("bad input")
+
+class _Tracker:
+    """Counts how many calls run at once."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def work(self, seconds):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(seconds)
+        with self._lock:
+            self.active -= 1
+        return threading.current_thread().name
+
+def test_runs_off_the_event_loop():
+    executor = ToolExecutor("thread", workers=2)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        name = await executor.run("slow", _Tracker().work, 0.2)
+        task.cancel()
+        return name, ticks
+
+    name, ticks = asyncio.run(main())
+    assert name.startswith("tool")
+    assert ticks >= 5  # the loop kept serving while the tool slept
+    executor.shutdown()
+
+def test_per_tool_limits():
+    executor = ToolExecutor("thread", workers=4, limits={"clean": 1})
+    clean, inspect = _Tracker(), _Tracker()
+
+    async def main():
+        await asyncio.gather(
+            *(executor.run("clean", clean.work, 0.05) for _ in range(3)),
+            *(executor.run("inspect", inspect.work, 0.05) for _ in range(4)),
+        )
+
+    asyncio.run(main())
+    assert clean.peak == 1
+    assert inspect.peak > 1
+    executor.shutdown()
+
+def test_errors_propagate():
+    executor = ToolExecutor("thread", workers=1)
+    with pytest.raises(ValueError, match="bad input"):
+        asyncio.run(executor.run("t", _fail))
+    executor.shutdown()
+
+def test_process_mode():
+    executor = ToolExecutor("process", workers=1)
+    assert asyncio.run(executor.run("t", _square, 7)) == 49
+    executor.shutdown()
+
+def test_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        ToolExecutor("fibers")